@@ -0,0 +1,233 @@
+# adaptive_sampler.py
+import json
+import os
+import random
+import re
+import threading
+import time
+
+from data_loader import get_data_dir
+from question_bank import question_id
+
+# ================================================================
+#  ADAPTIVE SAMPLER - selecție ponderată (spaced repetition)
+#  Fiecare pereche (utilizator, întrebare) are o pondere din greșeli
+#  și din timpul scurs de la ultima afișare, raportat la intervalul
+#  de repetare al seriei de răspunsuri corecte.
+#
+#  Întrebările nevăzute au ponderea de bază 1.0 și NU sunt stocate:
+#  arborele Fenwick e rar (dict) și ține doar diferența față de bază,
+#  deci construcția costă O(s log n) cu s = întrebări deja văzute,
+#  nu O(n). Extragerea a k întrebări fără repetiție: O(k log n);
+#  actualizarea după check_answer: O(log n).
+#
+#  Profil persistat: data/adaptive/<utilizator>.json
+# ================================================================
+
+BASE_WEIGHT = 1.0
+# intervalul de repetare (secunde) după 0, 1, 2, ... răspunsuri corecte la rând
+INTERVALS = (10 * 60, 86400, 3 * 86400, 7 * 86400, 16 * 86400, 35 * 86400)
+MISTAKE_BOOST = 0.5     # +50% pondere pentru fiecare greșeală (plafonat)
+MAX_MISTAKES = 6
+MIN_FACTOR = 0.02       # întrebare stăpânită, văzută recent -> aproape exclusă
+MAX_FACTOR = 3.0        # cât de „restantă” poate deveni o întrebare
+
+
+def item_weight(item, now):
+    """Ponderea unei întrebări din starea ei (None = nevăzută)."""
+    if not item:
+        return BASE_WEIGHT
+    streak = item.get("streak", 0)
+    interval = INTERVALS[min(streak, len(INTERVALS) - 1)]
+    overdue = max(now - item.get("seen", 0), 0) / interval
+    factor = min(max(overdue, MIN_FACTOR), MAX_FACTOR)
+    mistakes = min(item.get("wrong", 0), MAX_MISTAKES)
+    return BASE_WEIGHT * factor * (1 + MISTAKE_BOOST * mistakes)
+
+
+# === 1. Arbore Fenwick rar peste diferențele față de bază ===
+class SparseFenwick:
+    """
+    Sume prefix peste n ponderi, unde ponderea implicită e `base`.
+    Nodurile stochează doar delta față de base -> memorie O(s log n).
+    """
+
+    def __init__(self, n, base=BASE_WEIGHT):
+        self.n = n
+        self.base = base
+        self.tree = {}
+        self.deltas = {}   # poziție -> delta curentă (pentru weight())
+        self._top = 1 << (n.bit_length() - 1) if n else 0
+
+    def weight(self, pos):
+        return self.base + self.deltas.get(pos, 0.0)
+
+    def add(self, pos, delta):
+        if not delta:
+            return
+        self.deltas[pos] = self.deltas.get(pos, 0.0) + delta
+        i = pos + 1
+        while i <= self.n:
+            self.tree[i] = self.tree.get(i, 0.0) + delta
+            i += i & -i
+
+    def set(self, pos, weight):
+        self.add(pos, weight - self.weight(pos))
+
+    def prefix(self, count):
+        """Suma ponderilor pozițiilor [0, count)."""
+        total = self.base * count
+        i = count
+        while i > 0:
+            total += self.tree.get(i, 0.0)
+            i -= i & -i
+        return total
+
+    def total(self):
+        return self.prefix(self.n)
+
+    def find(self, target):
+        """Cea mai mică poziție p cu prefix(p + 1) > target (coborâre în O(log n))."""
+        pos = 0
+        step = self._top
+        while step:
+            nxt = pos + step
+            if nxt <= self.n:
+                node = self.base * step + self.tree.get(nxt, 0.0)
+                if node <= target:
+                    pos = nxt
+                    target -= node
+            step >>= 1
+        return min(pos, self.n - 1)
+
+
+# === 2. Profil utilizator (persistat) ===
+def _safe_name(user):
+    name = re.sub(r"[^\w.-]+", "_", str(user or "Guest")).strip("._")
+    return name or "Guest"
+
+
+class AdaptiveProfile:
+    """Starea (greșeli, serie corectă, ultima afișare) per întrebare, indexată după question_id."""
+
+    def __init__(self, user="Guest", path=None):
+        self.user = user
+        self.path = path or os.path.join(get_data_dir(), "adaptive", f"{_safe_name(user)}.json")
+        self.items = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        if isinstance(data, dict) and isinstance(data.get("items"), dict):
+            self.items = data["items"]
+
+    def save(self):
+        with self._lock:
+            data = {"user": self.user, "items": self.items}
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+    def record(self, qid, correct, now=None):
+        """Actualizează starea după un răspuns; întoarce noua stare."""
+        now = time.time() if now is None else now
+        with self._lock:
+            item = self.items.setdefault(qid, {"seen": now, "streak": 0, "wrong": 0, "count": 0})
+            item["count"] = item.get("count", 0) + 1
+            item["seen"] = now
+            if correct:
+                item["streak"] = item.get("streak", 0) + 1
+            else:
+                item["streak"] = 0
+                item["wrong"] = item.get("wrong", 0) + 1
+            return dict(item)
+
+
+_profiles = {}
+_profiles_lock = threading.Lock()
+
+
+def get_profile(user="Guest"):
+    """Profilul partajat al utilizatorului în proces (încărcat o singură dată)."""
+    key = _safe_name(user)
+    profile = _profiles.get(key)
+    if profile is None:
+        with _profiles_lock:
+            profile = _profiles.get(key)
+            if profile is None:
+                profile = _profiles[key] = AdaptiveProfile(user)
+    return profile
+
+
+# === 3. Sampler pentru un domeniu al băncii ===
+class AdaptiveSampler:
+    """
+    Ponderi pentru întrebările unui domeniu, construite doar din
+    întrebările deja văzute de utilizator (restul rămân la bază).
+    """
+
+    def __init__(self, bank, domain="mix", profile=None, now=None):
+        self.bank = bank
+        self.domain = domain
+        self.profile = profile or get_profile()
+        self.population = bank.indices(domain)
+        self.tree = SparseFenwick(len(self.population))
+
+        now = time.time() if now is None else now
+        for qid, item in list(self.profile.items.items()):
+            pos = self._position(qid)
+            if pos is not None:
+                self.tree.set(pos, item_weight(item, now))
+
+    def _position(self, qid):
+        index = self.bank.by_id.get(qid)
+        if index is None:
+            return None
+        return self.bank.position(self.domain, index)
+
+    def sample_indices(self, count=10, rng=None):
+        """`count` indici distincți din bancă, proporțional cu ponderile, în O(count log n)."""
+        rng = rng or random
+        count = min(count, len(self.population))
+        picked = []
+        removed = []
+        try:
+            while len(picked) < count:
+                total = self.tree.total()
+                if total <= 0:
+                    break
+                pos = self.tree.find(rng.random() * total)
+                weight = self.tree.weight(pos)
+                if weight <= 1e-12:
+                    # eroare de rotunjire pe o poziție deja extrasă -> încă o tragere
+                    continue
+                removed.append((pos, weight))
+                self.tree.add(pos, -weight)
+                picked.append(self.population[pos])
+        finally:
+            for pos, weight in removed:
+                self.tree.add(pos, weight)
+        return picked
+
+    def sample(self, count=10, rng=None):
+        return [self.bank.questions[i] for i in self.sample_indices(count, rng)]
+
+    def record(self, q, correct, now=None):
+        """Actualizează profilul și ponderea întrebării în O(log n)."""
+        now = time.time() if now is None else now
+        qid = question_id(q)
+        item = self.profile.record(qid, correct, now)
+        pos = self._position(qid)
+        if pos is not None:
+            self.tree.set(pos, item_weight(item, now))
+
+    def save(self):
+        self.profile.save()
+
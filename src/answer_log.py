@@ -0,0 +1,203 @@
+# answer_log.py
+import os
+import threading
+import time
+from array import array
+
+from data_loader import get_data_dir
+from safe_writer import file_lock
+
+# ================================================================
+#  ANSWER LOG - jurnal append-only, pe coloane, cu fiecare răspuns
+#  data/answer_log/
+#    session.u32  user.u32  question.u32  choice.u8  correct.u8
+#    rt_ms.u32    ts.u32    (câte o valoare per răspuns, little-endian)
+#    users.txt    questions.txt   (dicționare: numărul liniei = id-ul)
+#  Coloanele se pot citi direct în NumPy (np.fromfile / memmap), fără
+#  parsare. O sesiune se scrie întreagă; după o întrerupere, coloanele
+#  mai lungi sunt tăiate la lungimea comună.
+#  Mai multe procese (UI-ul, quiz_server) pot scrie în același jurnal:
+#  fiecare adăugare ia lock-ul data/answer_log.lock (safe_writer) și
+#  recitește sub el dicționarele, lungimea coloanelor și ultima sesiune.
+# ================================================================
+
+COLUMNS = (
+    ("session", "I"),
+    ("user", "I"),
+    ("question", "I"),
+    ("choice", "B"),
+    ("correct", "B"),
+    ("rt_ms", "I"),
+    ("ts", "I"),
+)
+MAX_RT_MS = 0xFFFFFFFF
+
+
+def _file_name(name, typecode):
+    return f"{name}.{'u8' if typecode == 'B' else 'u32'}"
+
+
+class _Dictionary:
+    """Șiruri -> id-uri consecutive, persistate ca linii de text (append-only)."""
+
+    def __init__(self, path):
+        self.path = path
+        self.items = []
+        self.ids = {}
+        self._offset = 0   # octeții din fișier deja citiți
+
+    def _add(self, value):
+        self.ids[value] = len(self.items)
+        self.items.append(value)
+
+    def refresh(self):
+        """Citește liniile adăugate între timp (și de alte procese); apelat sub lock."""
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(self._offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].split(b"\n")[:-1]:
+            self._add(line.rstrip(b"\r").decode("utf-8"))
+        self._offset += end
+        if end < len(data):  # linie scrisă pe jumătate (întrerupere) -> tăiată
+            with open(self.path, "ab") as f:
+                f.truncate(self._offset)
+
+    def intern(self, value, pending):
+        """Id-ul valorii; valorile noi intră în `pending` și primesc id-uri după cele existente."""
+        value = str(value).replace("\r", " ").replace("\n", " ")
+        idx = self.ids.get(value)
+        if idx is None:
+            idx = pending.get(value)
+            if idx is None:
+                idx = pending[value] = len(self.items) + len(pending)
+        return idx
+
+    def write(self, pending):
+        if pending:
+            data = "".join(v + "\n" for v in pending).encode("utf-8")
+            with open(self.path, "ab") as f:
+                f.write(data)
+            for value in pending:
+                self._add(value)
+            self._offset += len(data)
+
+
+class AnswerLog:
+    def __init__(self, directory=None):
+        self.directory = directory or os.path.join(get_data_dir(), "answer_log")
+        os.makedirs(self.directory, exist_ok=True)
+        self.users = _Dictionary(os.path.join(self.directory, "users.txt"))
+        self.questions = _Dictionary(os.path.join(self.directory, "questions.txt"))
+        self._lock = threading.Lock()
+        self.file_lock = file_lock(self.directory)
+        self.count = 0
+        self.next_session = 0
+        with self._lock, self.file_lock:
+            self._sync_locked()
+
+    def path(self, column):
+        typecode = dict(COLUMNS)[column]
+        return os.path.join(self.directory, _file_name(column, typecode))
+
+    def _sync_locked(self):
+        """Starea de pe disc (alte procese pot fi scris între timp); sub lock-ul fișierului."""
+        self.users.refresh()
+        self.questions.refresh()
+        self.count = self._repair()
+        self.next_session = self._last_session() + 1
+
+    def _repair(self):
+        """Numărul de răspunsuri complete; taie coloanele rămase mai lungi după o întrerupere."""
+        lengths = {}
+        for name, typecode in COLUMNS:
+            path = self.path(name)
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            lengths[name] = size // array(typecode).itemsize
+        count = min(lengths.values())
+        for name, typecode in COLUMNS:
+            if lengths[name] != count or not os.path.exists(self.path(name)):
+                with open(self.path(name), "ab") as f:
+                    f.truncate(count * array(typecode).itemsize)
+        return count
+
+    def _last_session(self):
+        if not self.count:
+            return -1
+        with open(self.path("session"), "rb") as f:
+            f.seek((self.count - 1) * 4)
+            last = array("I")
+            last.frombytes(f.read(4))
+        return last[0]
+
+    def append_session(self, user, events, ts=None):
+        """
+        events: (question_id, choice, correct, rt_ms) pentru fiecare răspuns al sesiunii.
+        Întoarce numărul sesiunii în jurnal (None dacă nu e niciun răspuns).
+        """
+        if not events:
+            return None
+        ts = int(time.time() if ts is None else ts)
+        with self._lock, self.file_lock:
+            self._sync_locked()
+            new_users, new_questions = {}, {}
+            user_id = self.users.intern(user or "Guest", new_users)
+            session = self.next_session
+            cols = {name: array(typecode) for name, typecode in COLUMNS}
+            for qid, choice, correct, rt_ms in events:
+                cols["session"].append(session)
+                cols["user"].append(user_id)
+                cols["question"].append(self.questions.intern(qid, new_questions))
+                cols["choice"].append(min(int(choice), 255))
+                cols["correct"].append(1 if correct else 0)
+                cols["rt_ms"].append(min(int(rt_ms or 0), MAX_RT_MS))
+                cols["ts"].append(ts)
+
+            # dicționarele întâi: un id din coloane trebuie să existe mereu în .txt
+            self.users.write(new_users)
+            self.questions.write(new_questions)
+            for name, _ in COLUMNS:
+                with open(self.path(name), "ab") as f:
+                    f.write(cols[name].tobytes())
+            self.count += len(events)
+            self.next_session = session + 1
+            return session
+
+
+def quiz_events(qm):
+    """Evenimentele unei sesiuni QuizManagerModern (doar întrebările cu răspuns)."""
+    from question_bank import question_id
+
+    events = []
+    for i in range(qm.total_questions()):
+        choice = qm.selected_index(i)
+        if choice is None:
+            continue
+        q = qm.question_at(i)
+        events.append((question_id(q), choice, choice == q["correct_index"], qm.answer_time_ms(i)))
+    return events
+
+
+_log = None
+_log_lock = threading.Lock()
+
+
+def get_answer_log():
+    global _log
+    if _log is None:
+        with _log_lock:
+            if _log is None:
+                _log = AnswerLog()
+    return _log
+
+
+def log_quiz(qm, user):
+    """Adaugă răspunsurile sesiunii în jurnal; erorile de disc nu opresc aplicația."""
+    try:
+        return get_answer_log().append_session(user, quiz_events(qm))
+    except OSError as e:
+        print(f"[WARN] Jurnalul de răspunsuri nu a putut fi scris: {e}")
+        return None
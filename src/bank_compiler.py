@@ -0,0 +1,470 @@
+# bank_compiler.py
+import argparse
+import glob
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+
+from data_loader import get_data_dir
+
+# ================================================================
+#  BANK COMPILER - format binar pentru banca de întrebări + docs
+#
+#  Structură fișier (little endian):
+#    header | tabel secțiuni (offset, lungime) | secțiuni
+#  Secțiuni:
+#    STR_OFFS  u32[n_strings + 1]     -> offseturi în STR_BLOB
+#    STR_BLOB  utf-8
+#    RECORDS   RECORD[n_questions]    -> înregistrări fixe, sortate pe domeniu
+#    CHOICES   u32[]                  -> indici de string pentru variante
+#    DOMAINS   DOMAIN[n_domains]      -> (nume, start, count) în RECORDS
+#    ID_INDEX  u32[n_questions]       -> indici RECORDS sortați după id
+#    SOURCES   SOURCE[n_sources]      -> fișierele sursă (0 = banca)
+#    DOCS      DOC[n_docs]
+#    SECTIONS  SECTION[n_sections]
+#
+#  Artefactul e scris sub un nume versionat (fea_questions.<versiune>.bin);
+#  fea_questions.bin e doar un pointer mic (POINTER_MAGIC + numele), înlocuit
+#  atomic. Aplicația poate ține versiunea veche mapată cât timp se compilează
+#  una nouă (pe Windows os.replace peste un fișier mapat eșuează).
+#  Un fea_questions.bin vechi, cu artefactul complet, e citit în continuare.
+# ================================================================
+
+MAGIC = b"FEAB"
+POINTER_MAGIC = b"FEAP"
+VERSION = 1
+NONE = 0xFFFFFFFF
+
+HEADER = struct.Struct("<4sHH32s")
+SECTION_TABLE = struct.Struct("<" + "QQ" * 9)
+# id, domain, question, explanation, image, extra(json), choices_start, n_choices, correct_index
+RECORD = struct.Struct("<IIIIIIIHh")
+DOMAIN = struct.Struct("<III")
+SOURCE = struct.Struct("<IQq32s")
+DOC = struct.Struct("<IIIII")
+SECTION = struct.Struct("<III")
+U32 = struct.Struct("<I")
+
+(STR_OFFS, STR_BLOB, RECORDS, CHOICES, DOMAINS,
+ ID_INDEX, SOURCES, DOCS, SECTIONS) = range(9)
+
+KNOWN_KEYS = {"id", "domain", "question", "explanation", "image", "choices", "correct_index"}
+
+
+def default_artifact_path(bank_path):
+    return os.path.splitext(bank_path)[0] + ".bin"
+
+
+def _versions_pattern(out_path):
+    stem, ext = os.path.splitext(out_path)
+    return f"{glob.escape(stem)}.*{ext}"
+
+
+def _resolve_artifact(path):
+    """Calea fișierului cu date: ținta pointerului sau `path` însuși (format vechi)."""
+    with open(path, "rb") as f:
+        head = f.read(len(POINTER_MAGIC) + 1024)
+    if not head.startswith(POINTER_MAGIC):
+        return path
+    name = head[len(POINTER_MAGIC):].decode("utf-8")
+    return os.path.join(os.path.dirname(os.path.abspath(path)), os.path.basename(name))
+
+
+def _publish(out_path, write):
+    """Scrie artefactul sub un nume nou, comută pointerul, apoi șterge versiunile vechi."""
+    stem, ext = os.path.splitext(out_path)
+    data_path = f"{stem}.{time.time_ns():x}{ext}"
+    tmp_path = data_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        write(f)
+    os.replace(tmp_path, data_path)
+
+    tmp_path = f"{out_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(POINTER_MAGIC + os.path.basename(data_path).encode("utf-8"))
+    os.replace(tmp_path, out_path)
+
+    for old in glob.glob(_versions_pattern(out_path)):
+        if os.path.abspath(old) != os.path.abspath(data_path):
+            try:
+                os.remove(old)
+            except OSError:
+                pass  # încă mapat de un proces (Windows) -> șters la următoarea compilare
+    return data_path
+
+
+# === 1. Compilare ===
+class _StringTable:
+    def __init__(self):
+        self.index = {}
+        self.items = []
+
+    def add(self, text):
+        if text is None:
+            return NONE
+        text = str(text)
+        idx = self.index.get(text)
+        if idx is None:
+            idx = self.index[text] = len(self.items)
+            self.items.append(text)
+        return idx
+
+    def pack(self):
+        offsets = [0]
+        blob = bytearray()
+        for text in self.items:
+            blob += text.encode("utf-8")
+            offsets.append(len(blob))
+        return struct.pack(f"<{len(offsets)}I", *offsets), bytes(blob)
+
+
+def _read_source(path):
+    with open(path, "rb") as f:
+        raw = f.read()
+    st = os.stat(path)
+    return raw, st
+
+
+def _flatten_bank(data):
+    if isinstance(data, dict):
+        questions = []
+        for domain, qlist in data.items():
+            for q in qlist:
+                q["domain"] = domain
+                questions.append(q)
+        return questions
+    return data if isinstance(data, list) else []
+
+
+def compile_bank(bank_path=None, docs_dir=None, out_path=None, force=False):
+    """
+    Compilează banca JSON (+ data/docs/*.json) într-un artefact binar.
+    Returnează calea artefactului. Dacă artefactul e deja la zi, nu rescrie nimic.
+    """
+    from question_bank import question_id
+
+    bank_path = bank_path or os.path.join(get_data_dir(), "fea_questions.json")
+    docs_dir = docs_dir or os.path.join(get_data_dir(), "docs")
+    out_path = out_path or default_artifact_path(bank_path)
+    base_dir = os.path.dirname(os.path.abspath(bank_path))
+
+    sources = [bank_path] + sorted(glob.glob(os.path.join(docs_dir, "*.json")))
+    raws = [_read_source(p) for p in sources]
+
+    content_hash = hashlib.sha256()
+    for raw, _ in raws:
+        content_hash.update(hashlib.sha256(raw).digest())
+    content_hash = content_hash.digest()
+
+    if not force:
+        existing = CompiledBank.open(out_path, check_sources=False)
+        if existing is not None:
+            up_to_date = existing.content_hash == content_hash and not existing.is_stale()
+            existing.close()
+            if up_to_date:
+                print(f"[INFO] Artefact la zi: {out_path}")
+                return out_path
+
+    strings = _StringTable()
+
+    # --- întrebări, sortate stabil pe domeniu ---
+    questions = _flatten_bank(json.loads(raws[0][0].decode("utf-8")))
+    order = sorted(range(len(questions)), key=lambda i: questions[i].get("domain", "").lower())
+
+    records = bytearray()
+    choices = []
+    domains = []
+    ids = []
+    for pos, i in enumerate(order):
+        q = questions[i]
+        domain = q.get("domain", "").lower()
+        if not domains or domains[-1][0] != domain:
+            domains.append([domain, pos, 0])
+        domains[-1][2] += 1
+
+        extra = {k: v for k, v in q.items() if k not in KNOWN_KEYS}
+        qchoices = q.get("choices", [])
+        records += RECORD.pack(
+            strings.add(q.get("id")),
+            strings.add(q.get("domain")),
+            strings.add(q.get("question")),
+            strings.add(q.get("explanation")),
+            strings.add(q.get("image")),
+            strings.add(json.dumps(extra, ensure_ascii=False) if extra else None),
+            len(choices),
+            len(qchoices),
+            q.get("correct_index", -1),
+        )
+        choices.extend(strings.add(c) for c in qchoices)
+        ids.append((question_id(q), pos))
+
+    id_index = [pos for _, pos in sorted(ids)]
+    domain_blob = b"".join(DOMAIN.pack(strings.add(d), start, count) for d, start, count in domains)
+
+    # --- documente Learn Mode ---
+    docs = bytearray()
+    sections = bytearray()
+    n_sections = 0
+    for src_idx, (raw, _) in enumerate(raws[1:], start=1):
+        try:
+            doc = json.loads(raw.decode("utf-8"))
+        except json.JSONDecodeError:
+            print(f"[WARN] Document invalid, ignorat: {sources[src_idx]}")
+            continue
+        key = os.path.splitext(os.path.basename(sources[src_idx]))[0]
+        secs = doc.get("sections", [])
+        docs += DOC.pack(src_idx, strings.add(key), strings.add(doc.get("title")), n_sections, len(secs))
+        for sec in secs:
+            sections += SECTION.pack(
+                strings.add(sec.get("subtitle")),
+                strings.add(sec.get("content")),
+                strings.add(sec.get("image")),
+            )
+            n_sections += 1
+
+    source_blob = b"".join(
+        SOURCE.pack(
+            strings.add(os.path.relpath(os.path.abspath(p), base_dir).replace(os.sep, "/")),
+            st.st_size,
+            st.st_mtime_ns,
+            hashlib.sha256(raw).digest(),
+        )
+        for p, (raw, st) in zip(sources, raws)
+    )
+
+    str_offs, str_blob = strings.pack()
+    parts = [
+        str_offs,
+        str_blob,
+        bytes(records),
+        struct.pack(f"<{len(choices)}I", *choices),
+        domain_blob,
+        struct.pack(f"<{len(id_index)}I", *id_index),
+        source_blob,
+        bytes(docs),
+        bytes(sections),
+    ]
+
+    table = []
+    offset = HEADER.size + SECTION_TABLE.size
+    for part in parts:
+        table.extend((offset, len(part)))
+        offset += len(part)
+
+    def write(f):
+        f.write(HEADER.pack(MAGIC, VERSION, 0, content_hash))
+        f.write(SECTION_TABLE.pack(*table))
+        for part in parts:
+            f.write(part)
+
+    data_path = _publish(out_path, write)
+    print(f"[INFO] Bancă compilată: {len(questions)} întrebări, {len(docs) // DOC.size} documente -> {data_path}")
+    return out_path
+
+
+# === 2. Citire (mmap + decodare leneșă) ===
+class _IdIndex:
+    """Mapare id -> index înregistrare, prin căutare binară în ID_INDEX."""
+
+    def __init__(self, bank):
+        self._bank = bank
+
+    def get(self, qid, default=None):
+        bank = self._bank
+        lo, hi = 0, len(bank)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            pos = bank._u32(ID_INDEX, mid)
+            key = bank.record_id(pos)
+            if key < qid:
+                lo = mid + 1
+            elif key > qid:
+                hi = mid
+            else:
+                return pos
+        return default
+
+    def __contains__(self, qid):
+        return self.get(qid) is not None
+
+    def __len__(self):
+        return len(self._bank)
+
+
+class CompiledBank:
+    """
+    Secvență de întrebări citită dintr-un artefact compilat (mmap).
+    Întrebările sunt decodate doar la acces și păstrate apoi în cache.
+    """
+
+    def __init__(self, path, mm):
+        self.path = path
+        self._mm = mm
+        magic, version, _, self.content_hash = HEADER.unpack_from(mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("format necunoscut")
+        table = SECTION_TABLE.unpack_from(mm, HEADER.size)
+        self._sections = [(table[2 * i], table[2 * i + 1]) for i in range(9)]
+        self._n = self._sections[RECORDS][1] // RECORD.size
+        self._cache = {}
+        self._base_dir = os.path.dirname(os.path.abspath(path))
+
+    @classmethod
+    def open(cls, path, check_sources=True):
+        """Deschide artefactul (prin pointer); None dacă lipsește, e invalid sau (opțional) e învechit."""
+        try:
+            data_path = _resolve_artifact(path)
+            with open(data_path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        try:
+            bank = cls(data_path, mm)
+        except (ValueError, struct.error):
+            mm.close()
+            return None
+        if check_sources and bank.is_stale(0):
+            bank.close()
+            return None
+        return bank
+
+    def close(self):
+        """
+        Eliberează maparea și fișierul (ex. la reîncărcarea băncii). Cine mai
+        folosește întrebările vechi (un quiz în desfășurare) citește în continuare
+        dintr-o copie în memorie.
+        """
+        mm = self._mm
+        if isinstance(mm, mmap.mmap):
+            self._mm = mm[:]
+            mm.close()
+
+    # --- acces primitiv ---
+    def _u32(self, section, i):
+        return U32.unpack_from(self._mm, self._sections[section][0] + 4 * i)[0]
+
+    def string(self, idx):
+        if idx == NONE:
+            return None
+        start = self._u32(STR_OFFS, idx)
+        end = self._u32(STR_OFFS, idx + 1)
+        blob = self._sections[STR_BLOB][0]
+        return self._mm[blob + start:blob + end].decode("utf-8")
+
+    def _records(self, section, st):
+        offset, length = self._sections[section]
+        return [st.unpack_from(self._mm, offset + i * st.size) for i in range(length // st.size)]
+
+    # --- surse / prospețime ---
+    def sources(self):
+        return [(self.string(s), size, mtime) for s, size, mtime, _ in self._records(SOURCES, SOURCE)]
+
+    def is_stale(self, source_idx=None):
+        """True dacă fișierul sursă (sau oricare, dacă source_idx e None) s-a schimbat."""
+        sources = self.sources()
+        if source_idx is not None:
+            sources = sources[source_idx:source_idx + 1]
+        for rel, size, mtime in sources:
+            try:
+                st = os.stat(os.path.join(self._base_dir, rel))
+            except OSError:
+                continue  # sursa lipsește -> artefactul rămâne singura copie
+            if (st.st_size, st.st_mtime_ns) != (size, mtime):
+                return True
+        return False
+
+    # --- întrebări ---
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._n))]
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError(i)
+        q = self._cache.get(i)
+        if q is None:
+            q = self._cache[i] = self._decode(i)
+        return q
+
+    def __iter__(self):
+        for i in range(self._n):
+            yield self[i]
+
+    def record_id(self, i):
+        from question_bank import question_id
+        fields = RECORD.unpack_from(self._mm, self._sections[RECORDS][0] + i * RECORD.size)
+        if fields[0] != NONE:
+            return self.string(fields[0])
+        return question_id({"domain": self.string(fields[1]), "question": self.string(fields[2])})
+
+    def _decode(self, i):
+        (id_s, domain_s, question_s, expl_s, image_s, extra_s,
+         choices_start, n_choices, correct_index) = RECORD.unpack_from(
+            self._mm, self._sections[RECORDS][0] + i * RECORD.size)
+        q = {}
+        if id_s != NONE:
+            q["id"] = self.string(id_s)
+        q["domain"] = self.string(domain_s)
+        q["question"] = self.string(question_s)
+        q["choices"] = [self.string(self._u32(CHOICES, choices_start + c)) for c in range(n_choices)]
+        q["correct_index"] = correct_index
+        if expl_s != NONE:
+            q["explanation"] = self.string(expl_s)
+        if image_s != NONE:
+            q["image"] = self.string(image_s)
+        if extra_s != NONE:
+            q.update(json.loads(self.string(extra_s)))
+        return q
+
+    def domain_ranges(self):
+        return {self.string(name): range(start, start + count)
+                for name, start, count in self._records(DOMAINS, DOMAIN)}
+
+    def id_index(self):
+        return _IdIndex(self)
+
+    # --- documente Learn Mode ---
+    def load_doc(self, key):
+        """Întoarce documentul {"title", "sections"} sau None dacă lipsește / e învechit."""
+        for src_idx, key_s, title_s, start, count in self._records(DOCS, DOC):
+            if self.string(key_s) != key:
+                continue
+            if self.is_stale(src_idx):
+                return None
+            offset = self._sections[SECTIONS][0]
+            sections = []
+            for j in range(start, start + count):
+                sub_s, content_s, image_s = SECTION.unpack_from(self._mm, offset + j * SECTION.size)
+                sec = {}
+                for name, s in (("subtitle", sub_s), ("content", content_s), ("image", image_s)):
+                    if s != NONE:
+                        sec[name] = self.string(s)
+                sections.append(sec)
+            doc = {"sections": sections}
+            if title_s != NONE:
+                doc["title"] = self.string(title_s)
+            return doc
+        return None
+
+
+# === 3. Punct de intrare CLI ===
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compilează banca de întrebări în format binar.")
+    parser.add_argument("--bank", help="fișierul JSON al băncii (implicit data/fea_questions.json)")
+    parser.add_argument("--docs", help="folderul cu documente Learn Mode (implicit data/docs)")
+    parser.add_argument("--out", help="artefactul generat (implicit lângă bancă, .bin)")
+    parser.add_argument("--force", action="store_true", help="recompilează chiar dacă e la zi")
+    args = parser.parse_args(argv)
+    compile_bank(args.bank, args.docs, args.out, force=args.force)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+# batch_export.py
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from data_loader import get_data_dir
+
+# ================================================================
+#  BATCH EXPORT - rapoarte PDF pentru multe sesiuni, fără UI
+#  Sesiunile vin din backend-ul de stocare; randarea e împărțită pe
+#  un ProcessPoolExecutor (un ReportRenderer per proces).
+#
+#  python src/batch_export.py --jobs 8 --domain cfd --since 2025-01-01
+# ================================================================
+
+RENDERER_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pdf_exporter_modern.py")
+
+
+def session_key(session):
+    """Hash stabil al conținutului sesiunii (parte din numele fișierului)."""
+    raw = json.dumps(session, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()[:10]
+
+
+def report_name(session):
+    date = "".join(ch for ch in str(session.get("date", "")) if ch.isdigit()) or "nodate"
+    domain = session.get("domain", "mix") or "mix"
+    mode = session.get("mode", "") or "sesiune"
+    return f"report_{date}_{domain}_{mode}_{session_key(session)}.pdf"
+
+
+def filter_sessions(sessions, domain=None, mode=None, since=None, until=None):
+    """Filtrare după domeniu / mod / interval de date (format "YYYY-MM-DD[ HH:MM]")."""
+    for s in sessions:
+        date = str(s.get("date", ""))
+        if domain and (s.get("domain", "") or "").lower() != domain.lower():
+            continue
+        if mode and (s.get("mode", "") or "").lower() != mode.lower():
+            continue
+        if since and date < since:
+            continue
+        # until inclusiv pentru toată ziua: "2025-01-31" acoperă și "2025-01-31 23:59"
+        if until and date[:len(until)] > until:
+            continue
+        yield s
+
+
+def is_up_to_date(path, renderer_mtime):
+    """Raportul există și e mai nou decât șablonul de randare."""
+    try:
+        return os.path.getmtime(path) >= renderer_mtime
+    except OSError:
+        return False
+
+
+# === Worker (rulează în procesele din pool) ===
+def _render_one(job):
+    from pdf_exporter_modern import get_renderer
+
+    session, path = job
+    try:
+        return path, get_renderer().render(session, output_path=path) is not None
+    except Exception as e:
+        print(f"[EROARE PDF] {path}: {e}")
+        return path, False
+
+
+def export_batch(sessions, out_dir, jobs=None, force=False):
+    """
+    Randează câte un raport per sesiune în out_dir.
+    Returnează un dicționar cu rendered / skipped / failed / seconds.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    renderer_mtime = os.path.getmtime(RENDERER_SOURCE)
+
+    pending = []
+    skipped = 0
+    seen = set()
+    for s in sessions:
+        path = os.path.join(out_dir, report_name(s))
+        if path in seen:
+            continue  # sesiuni identice -> același raport
+        seen.add(path)
+        if not force and is_up_to_date(path, renderer_mtime):
+            skipped += 1
+        else:
+            pending.append((s, path))
+
+    jobs = jobs or os.cpu_count() or 1
+    start = time.perf_counter()
+    outcomes = []
+    if pending:
+        if jobs == 1:
+            outcomes = list(map(_render_one, pending))
+        else:
+            # bucăți mari -> puțin overhead de IPC, dar încă echilibrat între procese
+            chunksize = max(1, len(pending) // (jobs * 4))
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                outcomes = list(executor.map(_render_one, pending, chunksize=chunksize))
+    rendered = sum(1 for _, ok in outcomes if ok)
+    failed = len(outcomes) - rendered
+
+    return {
+        "rendered": rendered,
+        "skipped": skipped,
+        "failed": failed,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generează rapoarte PDF pentru mai multe sesiuni.")
+    parser.add_argument("--out-dir", default=os.path.join(get_data_dir(), "reports"),
+                        help="folderul rapoartelor (implicit data/reports)")
+    parser.add_argument("--jobs", type=int, default=None, help="procese de randare (implicit: nr. de nuclee)")
+    parser.add_argument("--domain", help="doar sesiunile din acest domeniu")
+    parser.add_argument("--mode", help="doar sesiunile din acest mod (train / exam)")
+    parser.add_argument("--since", help="data minimă, ex. 2025-01-01")
+    parser.add_argument("--until", help="data maximă (inclusiv), ex. 2025-01-31")
+    parser.add_argument("--force", action="store_true", help="regenerează și rapoartele la zi")
+    args = parser.parse_args(argv)
+
+    from stats_manager import load_stats
+
+    sessions = list(filter_sessions(load_stats(), args.domain, args.mode, args.since, args.until))
+    summary = export_batch(sessions, args.out_dir, args.jobs, args.force)
+    rate = summary["rendered"] / summary["seconds"] if summary["seconds"] else 0
+    print(f"[INFO] {len(sessions)} sesiuni: {summary['rendered']} generate, {summary['skipped']} la zi, "
+          f"{summary['failed']} eșuate în {summary['seconds']} s ({rate:.1f} rapoarte/s) -> {args.out_dir}")
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
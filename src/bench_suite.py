@@ -0,0 +1,337 @@
+# bench_suite.py
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+from quiz_simulator import percentile
+
+# ================================================================
+#  BENCH SUITE - măsurători pentru loader, motor, statistici,
+#  leaderboard, decodare imagini și export PDF
+#  Fiecare scară (1k / 100k / 1m întrebări + tot atâtea sesiuni în
+#  istoric) rulează într-un proces nou, pe date sintetice dintr-un
+#  folder temporar (FEA_DATA_DIR) -> singleton-urile pornesc de la zero.
+#
+#  python src/bench_suite.py run --scales 1k,100k --out bench.json
+#  python src/bench_suite.py compare baseline.json bench.json --threshold 0.15
+# ================================================================
+
+SCALES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+DOMAINS = ("structural", "cfd", "crash", "nvh", "thermal")
+IMAGE_REL = os.path.join("images", "bench", "source.png")
+IMAGE_SIZE = (1600, 1200)   # ordinul de mărime al capturilor din solver
+
+
+def parse_scale(text):
+    text = text.strip().lower()
+    if text in SCALES:
+        return text, SCALES[text]
+    return text, int(text)
+
+
+# === 1. Generatoare de date sintetice ===
+def gen_questions(n, seed=0):
+    """n întrebări în formatul fea_questions.json (5 domenii, 4 variante, ~5% cu imagine)."""
+    rng = random.Random(seed)
+    for i in range(n):
+        domain = DOMAINS[i % len(DOMAINS)]
+        q = {
+            "domain": domain,
+            "question": f"[{domain}] Întrebarea sintetică {i}: ce element finit se potrivește cazului {rng.randrange(10**6)}?",
+            "choices": [f"Varianta {c} pentru {i}" for c in "ABCD"],
+            "correct_index": rng.randrange(4),
+            "explanation": f"Explicație generată pentru întrebarea {i}.",
+        }
+        if i % 20 == 0:
+            q["image"] = IMAGE_REL
+        yield q
+
+
+def gen_sessions(n, seed=0):
+    """n sesiuni în formatul get_result_data (+ nume pentru cele de examen)."""
+    rng = random.Random(seed + 1)
+    start = datetime(2024, 1, 1)
+    for i in range(n):
+        total = rng.choice((10, 20, 30))
+        score = rng.randint(0, total)
+        mode = "exam" if rng.random() < 0.4 else "train"
+        session = {
+            "mode": mode,
+            "domain": rng.choice(DOMAINS + ("mix",)),
+            "score": score,
+            "total": total,
+            "percent": round(score / total * 100, 1),
+            "time_used": rng.randint(30, 1800),
+            "correct": score,
+            "incorrect": total - score,
+            "date": (start + timedelta(minutes=17 * i)).strftime("%Y-%m-%d %H:%M"),
+        }
+        if mode == "exam":
+            session["name"] = f"user{rng.randrange(500)}"
+        yield session
+
+
+def write_bank(path, n, seed=0):
+    """Scrie banca în flux (fără listă completă în memorie, relevant la 1m)."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[\n")
+        for i, q in enumerate(gen_questions(n, seed)):
+            if i:
+                f.write(",\n")
+            f.write(json.dumps(q, ensure_ascii=False))
+        f.write("\n]\n")
+
+
+def write_image(path, size=IMAGE_SIZE):
+    from PIL import Image
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    img = Image.linear_gradient("L").resize(size).convert("RGB")
+    img.save(path, "PNG")
+
+
+def prepare_data_dir(data_dir, n, backend, seed=0):
+    os.makedirs(data_dir, exist_ok=True)
+    with open(os.path.join(data_dir, "settings.json"), "w", encoding="utf-8") as f:
+        json.dump({"stats_backend": backend}, f)
+    write_bank(os.path.join(data_dir, "fea_questions.json"), n, seed)
+    write_image(os.path.join(data_dir, IMAGE_REL))
+
+
+# === 2. Măsurare ===
+def summarize(samples):
+    """Durate în ms -> statistici; mediana e valoarea comparată între rulări."""
+    samples = sorted(samples)
+    return {
+        "runs": len(samples),
+        "min_ms": round(samples[0], 4),
+        "median_ms": round(statistics.median(samples), 4),
+        "p90_ms": round(percentile(samples, 90), 4),
+        "mean_ms": round(statistics.fmean(samples), 4),
+    }
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def once(fn):
+    t0 = time.perf_counter()
+    value = fn()
+    return value, [(time.perf_counter() - t0) * 1000]
+
+
+# === 3. Benchmark-urile unei scări (rulează în procesul copil) ===
+def run_scale(label, n, work_dir, repeat, backend, seed=0):
+    data_dir = os.path.join(work_dir, label)
+    os.environ["FEA_DATA_DIR"] = data_dir
+    t0 = time.perf_counter()
+    prepare_data_dir(data_dir, n, backend, seed)
+    setup_s = time.perf_counter() - t0
+
+    # importurile după FEA_DATA_DIR: modulele citesc folderul la import / primul apel
+    from data_loader import get_random_questions, load_questions
+    from image_cache import ImageCache, decode_image
+    from leaderboard_index import get_leaderboard_index
+    from pdf_exporter_modern import export_pdf_modern
+    from question_bank import QuestionBank, get_question_bank
+    from quiz_engine_modern import QuizManagerModern
+    from stats_manager import add_session, get_leaderboard, get_summary
+    from storage import get_store
+
+    results = {}
+    cold_repeat = max(1, min(repeat, 3)) if n >= 100_000 else repeat
+    bank_path = os.path.join(data_dir, "fea_questions.json")
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        # --- loader ---
+        results["load_questions_cold"] = timed(lambda: QuestionBank(bank_path).refresh(), cold_repeat)
+        _, results["load_questions_first"] = once(load_questions)
+        results["load_questions_warm"] = timed(load_questions, repeat)
+        results["get_random_questions"] = timed(lambda: get_random_questions("mix", 10), repeat)
+        results["get_random_questions_domain"] = timed(lambda: get_random_questions("cfd", 10), repeat)
+
+        # --- motor ---
+        bank = get_question_bank()
+        results["quiz_construct"] = timed(lambda: QuizManagerModern(bank, "mix", 10), repeat)
+        results["quiz_construct_list"] = timed(
+            lambda: QuizManagerModern(load_questions(), "cfd", 10), cold_repeat
+        )
+        rng = random.Random(seed)
+        qm = QuizManagerModern(bank, "mix", repeat, rng=rng)
+        samples = []
+        while qm.get_current_question() is not None:
+            choice = rng.randrange(len(qm.get_current_question()["choices"]))
+            t0 = time.perf_counter()
+            qm.check_answer(choice)
+            samples.append((time.perf_counter() - t0) * 1000)
+            qm.advance()
+        results["check_answer"] = samples
+
+        # --- statistici + leaderboard (istoric de n sesiuni) ---
+        _, results["history_load"] = once(lambda: get_store().replace_sessions(gen_sessions(n, seed)))
+        _, results["leaderboard_index_build"] = once(get_leaderboard_index)
+        session_rng = random.Random(seed + 2)
+        new_sessions = list(gen_sessions(repeat, seed + 3))
+        for s in new_sessions:
+            s["domain"] = session_rng.choice(DOMAINS)
+        pending = iter(new_sessions)
+        results["add_session"] = timed(lambda: add_session(next(pending)), repeat)
+        results["get_summary"] = timed(get_summary, repeat)
+        results["get_leaderboard"] = timed(lambda: get_leaderboard(top_n=5), repeat)
+        results["get_leaderboard_filtered"] = timed(
+            lambda: get_leaderboard(top_n=5, domain="cfd", mode="exam"), repeat
+        )
+
+        # --- imagini (drumul lui load_ctk_image, fără CTkImage / display) ---
+        image_path = os.path.join(data_dir, IMAGE_REL)
+        results["image_decode_source"] = timed(lambda: _decode_source(image_path, (500, 300)), cold_repeat)
+        results["image_decode_thumb"] = timed(lambda: decode_image(image_path, (500, 300)), repeat)
+        cache = ImageCache()
+        cache.get(image_path, (500, 300))
+        results["image_cache_hit"] = timed(lambda: cache.get(image_path, (500, 300)), repeat)
+
+        # --- PDF ---
+        answers = list(qm.user_answers[:10])
+        result = qm.get_result_data("train", 300)
+        pdf_path = os.path.join(data_dir, "bench_report.pdf")
+        results["export_pdf_modern"] = timed(
+            lambda: export_pdf_modern(result, answers, pdf_path), cold_repeat
+        )
+
+    out = {name: summarize(samples) for name, samples in results.items()}
+    out["_setup_s"] = round(setup_s, 3)
+    return label, out
+
+
+def _decode_source(path, size):
+    """Decodarea completă a sursei (miss fără cache de thumbnail-uri)."""
+    from PIL import Image
+
+    with Image.open(path) as img:
+        img = img.convert("RGBA")
+        img.thumbnail(size)
+    return img
+
+
+def run_suite(scales, repeat=50, backend="sqlite", work_dir=None, keep=False, seed=0):
+    own_dir = work_dir is None
+    work_dir = work_dir or tempfile.mkdtemp(prefix="fea_bench_")
+    report = {
+        "meta": {
+            "date": datetime.now().strftime("%Y-%m-%d %H:%M"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "repeat": repeat,
+            "backend": backend,
+            "seed": seed,
+        },
+        "results": {},
+    }
+    # "spawn": fiecare scară pornește cu module neimportate (fără stare moștenită prin fork)
+    ctx = multiprocessing.get_context("spawn")
+    try:
+        for text in scales:
+            label, n = parse_scale(text)
+            print(f"[INFO] Benchmark {label} ({n} întrebări / sesiuni)...")
+            with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as executor:
+                label, out = executor.submit(run_scale, label, n, work_dir, repeat, backend, seed).result()
+            report["results"][label] = out
+            print(f"[INFO]   gata (date generate în {out['_setup_s']} s)")
+    finally:
+        if own_dir and not keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return report
+
+
+# === 4. Comparare cu baseline ===
+def compare(baseline, current, threshold=0.10, min_delta_ms=0.05):
+    """
+    Lista (scară, benchmark, mediană veche, mediană nouă, raport, regresie).
+    Regresie = mediana crește cu peste `threshold` și cu peste `min_delta_ms`
+    (sub acest prag diferențele sunt zgomot de măsurare).
+    """
+    rows = []
+    for label, benches in current.get("results", {}).items():
+        base_benches = baseline.get("results", {}).get(label, {})
+        for name, stats in benches.items():
+            base = base_benches.get(name)
+            if name.startswith("_") or not base:
+                continue
+            old, new = base["median_ms"], stats["median_ms"]
+            ratio = new / old if old else float("inf")
+            regressed = ratio > 1 + threshold and new - old > min_delta_ms
+            rows.append((label, name, old, new, ratio, regressed))
+    return rows
+
+
+def print_comparison(rows):
+    print(f"{'scară':<6} {'benchmark':<28} {'baseline ms':>12} {'curent ms':>12} {'raport':>8}")
+    for label, name, old, new, ratio, regressed in rows:
+        flag = "  << REGRESIE" if regressed else ""
+        print(f"{label:<6} {name:<28} {old:>12.4f} {new:>12.4f} {ratio:>7.2f}x{flag}")
+    regressions = sum(1 for row in rows if row[-1])
+    print(f"[INFO] {len(rows)} benchmark-uri comparate, {regressions} regresii")
+    return regressions
+
+
+def _load_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark-uri pentru FEA Quiz Trainer.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="rulează suita și scrie rezultatele JSON")
+    run.add_argument("--scales", default="1k,100k", help="ex. 1k,100k,1m (sau numere)")
+    run.add_argument("--repeat", type=int, default=50, help="repetări per benchmark")
+    run.add_argument("--backend", choices=("sqlite", "journal", "json"), default="sqlite")
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--out", default="bench_results.json")
+    run.add_argument("--work-dir", help="folder pentru datele sintetice (implicit unul temporar, șters la final)")
+    run.add_argument("--baseline", help="compară imediat cu un rezultat salvat")
+    run.add_argument("--threshold", type=float, default=0.10)
+
+    cmp_parser = sub.add_parser("compare", help="compară două fișiere de rezultate")
+    cmp_parser.add_argument("baseline")
+    cmp_parser.add_argument("current")
+    cmp_parser.add_argument("--threshold", type=float, default=0.10,
+                            help="creștere relativă a medianei considerată regresie (0.10 = 10%%)")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        scales = [s for s in args.scales.split(",") if s.strip()]
+        report = run_suite(scales, args.repeat, args.backend, args.work_dir, keep=bool(args.work_dir), seed=args.seed)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4, ensure_ascii=False)
+        print(f"[INFO] Rezultate salvate în {args.out}")
+        if args.baseline:
+            rows = compare(_load_json(args.baseline), report, args.threshold)
+            return 1 if print_comparison(rows) else 0
+        return 0
+
+    rows = compare(_load_json(args.baseline), _load_json(args.current), args.threshold)
+    return 1 if print_comparison(rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,5 @@
 import json
 import os
-import random
 
 # ================================================================
 #  DATA LOADER - Moment 2.2  (bază Moment 1 + Leaderboard Local)
@@ -9,107 +8,127 @@ import random
 
 # === 0. Detectare automată a folderului data ===
 def get_data_dir():
-    """Determină calea absolută către folderul 'data' indiferent de locul de rulare."""
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    data_dir = os.path.join(base_dir, "..", "data")
+    """
+    Determină calea absolută către folderul 'data' indiferent de locul de rulare.
+    Variabila de mediu FEA_DATA_DIR o poate înlocui (simulări, benchmark-uri).
+    """
+    data_dir = os.environ.get("FEA_DATA_DIR")
+    if not data_dir:
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        data_dir = os.path.join(base_dir, "..", "data")
     os.makedirs(data_dir, exist_ok=True)
     return data_dir
 
 
 # === 1. Încărcare întrebări ===
 def load_questions():
-    """Încarcă întrebările din fea_questions.json."""
-    path = os.path.join(get_data_dir(), "fea_questions.json")
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            if isinstance(data, dict):
-                questions = []
-                for domain, qlist in data.items():
-                    for q in qlist:
-                        q["domain"] = domain
-                        questions.append(q)
-                return questions
-            return data
-    except (FileNotFoundError, json.JSONDecodeError):
-        print("[WARN] Nu s-au putut încărca întrebările.")
-        return []
+    """
+    Întoarce întrebările din fea_questions.json, prin banca partajată a procesului.
+    Fișierul este parsat o singură dată și re-parsat doar dacă se modifică.
+    Lista este partajată - nu o modificați pe loc.
+    """
+    from metrics import span
+    from question_bank import get_question_bank
+    with span("load_questions"):
+        return get_question_bank().questions
 
 
 # === 2. Selectare aleatorie de întrebări ===
 def get_random_questions(domain="mix", count=10):
-    all_questions = load_questions()
-    if not all_questions:
-        return []
+    """
+    Alege `count` întrebări din indexul domeniului, în O(count).
+    Băncile prea mari pentru memorie (vezi question_stream.streaming_bank_path)
+    sunt eșantionate direct de pe disc, într-o singură trecere.
+    """
+    from question_stream import sample_questions, streaming_bank_path
+    path = streaming_bank_path()
+    if path:
+        return sample_questions(path, domain, count)
+
+    from question_bank import get_question_bank
+    return get_question_bank().sample(domain, count)
 
-    if domain.lower() != "mix":
-        filtered = [q for q in all_questions if q.get("domain", "").lower() == domain.lower()]
-    else:
-        filtered = all_questions
 
-    random.shuffle(filtered)
-    return filtered[:count]
+# === 2b. Documente Learn Mode ===
+def load_doc(domain_key):
+    """
+    Încarcă documentul data/docs/<domain_key>.json.
+    Folosește artefactul compilat dacă e la zi, altfel JSON-ul.
+    Returnează None dacă documentul nu există.
+    """
+    from bank_compiler import CompiledBank, default_artifact_path
+
+    compiled = CompiledBank.open(
+        default_artifact_path(os.path.join(get_data_dir(), "fea_questions.json")),
+        check_sources=False,
+    )
+    if compiled is not None:
+        try:
+            doc = compiled.load_doc(domain_key)
+        finally:
+            compiled.close()
+        if doc is not None:
+            return doc
+
+    path = os.path.join(get_data_dir(), "docs", f"{domain_key}.json")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
 
 
 # === 3. Gestionare statistici (Moment 1) ===
-def load_stats():
-    path = os.path.join(get_data_dir(), "results.json")
+#  Sesiunile trec prin backend-ul din storage.py (sqlite implicit).
+def load_settings():
+    """Citește data/settings.json (dicționar gol dacă lipsește sau e invalid)."""
+    path = os.path.join(get_data_dir(), "settings.json")
     try:
         with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+            data = json.load(f)
     except (FileNotFoundError, json.JSONDecodeError):
-        return []
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def load_stats():
+    from storage import get_store
+    return get_store().load_sessions()
 
 
 def save_stats(data):
-    path = os.path.join(get_data_dir(), "results.json")
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+    from storage import get_store
+    get_store().replace_sessions(data)
 
 
 def add_session(result):
-    stats = load_stats()
-    stats.append(result)
-    save_stats(stats)
+    from storage import get_store
+    get_store().add_session(result)
 
 
 # === 4. Leaderboard Local (Moment 2.2) ===
 def load_leaderboard():
-    """
-    Încarcă leaderboard-ul local.
-    Creează automat fișierul dacă lipsește sau este invalid.
-    """
-    path = os.path.join(get_data_dir(), "leaderboard.json")
-
-    if not os.path.exists(path):
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump([], f, indent=4)
-        return []
-
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            if isinstance(data, dict):
-                print("[WARN] Leaderboard invalid, resetat.")
-                data = []
-    except json.JSONDecodeError:
+    """Încarcă leaderboard-ul local din backend-ul de stocare."""
+    from storage import get_store
+    data = get_store().load_leaderboard()
+    if not isinstance(data, list):
+        print("[WARN] Leaderboard invalid, resetat.")
         data = []
-
     return data
 
 
 def save_leaderboard(data):
     """
-    Salvează leaderboard-ul local în fișierul JSON.
-    Detectează automat calea corectă și repară fișierul dacă e invalid.
+    Înlocuiește tot leaderboard-ul local.
+    Pentru o intrare nouă folosiți add_leaderboard_entry (nu rescrie istoricul).
     """
-    path = os.path.join(get_data_dir(), "leaderboard.json")
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-
+    from storage import get_store
     if not isinstance(data, list):
         data = []
+    get_store().replace_leaderboard(data)
 
-    print(f"[DEBUG] Leaderboard salvat în: {os.path.abspath(path)}")
 
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+def add_leaderboard_entry(entry):
+    """Adaugă o singură intrare în leaderboard."""
+    from storage import get_store
+    get_store().add_leaderboard_entry(entry)
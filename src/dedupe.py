@@ -0,0 +1,327 @@
+# dedupe.py
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+
+import numpy as np
+
+from data_loader import get_data_dir
+from question_stream import _looks_like_jsonl, iter_questions
+from search_index import normalize
+
+# ================================================================
+#  DEDUPE - întrebări duplicate / aproape duplicate în bancă
+#  - text = întrebare + variante (fără diacritice, doar cuvinte)
+#  - shingles = 5-grame de caractere (codificate exact pe 40 de biți)
+#  - MinHash cu NUM_PERM permutări (multiply-shift), vectorizat în NumPy
+#  - LSH: BANDS benzi x ROWS rânduri; perechile candidate sunt doar cele
+#    care coincid pe cel puțin o bandă -> sub-pătratic. Probabilitatea de
+#    a deveni candidat la similaritatea Jaccard s: 1 - (1 - s^ROWS)^BANDS
+#    (~95% la 0.8, ~99.9% la 0.9, practic 0 sub 0.5)
+#  - candidații sunt verificați pe semnătura completă (similaritate estimată)
+#    și grupați în clustere (union-find); se păstrează prima apariție
+#  Semnăturile sunt păstrate în data/dedupe_cache.npz după hash-ul
+#  conținutului -> o rulare nouă calculează doar întrebările noi / modificate;
+#  semnăturile întrebărilor care nu mai sunt în bancă sunt eliminate la salvare.
+#
+#  python src/dedupe.py scan --threshold 0.8
+#  python src/dedupe.py scan --clean data/fea_questions.dedup.json
+# ================================================================
+
+CACHE_VERSION = 1
+SHINGLE = 5
+NUM_PERM = 128
+BANDS, ROWS = 16, 8
+SEED = 1
+CHUNK = 20000            # întrebări per lot de calcul al semnăturilor
+MAX_BUCKET = 64          # peste atât, membrii unui bucket se leagă doar de primul (fără perechi O(k²))
+DEFAULT_THRESHOLD = 0.8
+
+_WORD = re.compile(r"[^\W_]+")
+_rng = np.random.default_rng(SEED)
+_PERM_A = _rng.integers(1, 2 ** 63, NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_PERM_B = _rng.integers(0, 2 ** 63, NUM_PERM, dtype=np.uint64)
+_BAND_MIX = _rng.integers(1, 2 ** 63, ROWS, dtype=np.uint64) | np.uint64(1)
+
+
+def default_cache_path():
+    return os.path.join(get_data_dir(), "dedupe_cache.npz")
+
+
+def default_bank_path():
+    return os.path.join(get_data_dir(), "fea_questions.json")
+
+
+def shingle_text(q):
+    """Textul comparat: întrebarea + variantele, normalizat (explicația nu contează)."""
+    text = normalize(" ".join([q.get("question", ""), *q.get("choices", [])]))
+    return " ".join(_WORD.findall(text))
+
+
+def content_key(text):
+    """Cheia din cache: primii 8 octeți din sha1(text normalizat)."""
+    return int.from_bytes(hashlib.sha1(text.encode("utf-8")).digest()[:8], "little")
+
+
+# === 1. Semnături MinHash (vectorizat, pe loturi) ===
+def minhash(texts):
+    """Semnăturile (len(texts) x NUM_PERM, uint32) pentru o listă de texte normalizate."""
+    encoded = [t.encode("utf-8").ljust(SHINGLE) for t in texts]
+    lengths = np.fromiter((len(e) for e in encoded), dtype=np.int64, count=len(encoded))
+    buf = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+
+    # fereastra de SHINGLE octeți de la fiecare poziție validă -> întreg pe 40 de biți
+    counts = lengths - SHINGLE + 1
+    seg_starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    starts = np.repeat(offsets - seg_starts, counts) + np.arange(counts.sum())
+    x = np.zeros(len(starts), dtype=np.uint64)
+    for j in range(SHINGLE):
+        x |= buf[starts + j].astype(np.uint64) << np.uint64(8 * j)
+
+    sigs = np.empty((len(texts), NUM_PERM), dtype=np.uint32)
+    shift = np.uint64(32)
+    for k in range(NUM_PERM):
+        h = (x * _PERM_A[k] + _PERM_B[k]) >> shift     # aritmetică modulo 2^64
+        sigs[:, k] = np.minimum.reduceat(h, seg_starts)
+    return sigs
+
+
+class SignatureCache:
+    """Semnături după cheia de conținut (chei sortate -> căutare cu searchsorted)."""
+
+    def __init__(self, path):
+        self.path = path
+        self.keys = np.empty(0, dtype=np.uint64)
+        self.sigs = np.empty((0, NUM_PERM), dtype=np.uint32)
+        try:
+            with np.load(path) as data:
+                stamp = (CACHE_VERSION, SHINGLE, NUM_PERM, SEED)
+                if tuple(int(v) for v in data["stamp"]) == stamp:
+                    self.keys, self.sigs = data["keys"], data["sigs"]
+        except (OSError, KeyError, ValueError):
+            pass
+
+    def lookup(self, keys):
+        """(poziții în cache, mască găsit) pentru un array de chei."""
+        pos = np.searchsorted(self.keys, keys)
+        pos = np.minimum(pos, max(len(self.keys) - 1, 0))
+        found = (self.keys[pos] == keys) if len(self.keys) else np.zeros(len(keys), bool)
+        return pos, found
+
+    def add(self, keys, sigs):
+        keys = np.concatenate([self.keys, keys])
+        sigs = np.concatenate([self.sigs, sigs])
+        keys, first = np.unique(keys, return_index=True)
+        self.keys, self.sigs = keys, sigs[first]
+
+    def stale(self, seen):
+        """Câte chei din cache nu mai apar în `seen` (întrebări șterse / modificate)."""
+        return int(np.count_nonzero(~np.isin(self.keys, seen)))
+
+    def save(self, seen=None):
+        """Scrie cache-ul atomic; cu `seen`, păstrează doar cheile scanării curente."""
+        if seen is not None:
+            used = np.isin(self.keys, seen)
+            self.keys, self.sigs = self.keys[used], self.sigs[used]
+        tmp_path = f"{self.path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp_path, stamp=np.array([CACHE_VERSION, SHINGLE, NUM_PERM, SEED]),
+                 keys=self.keys, sigs=self.sigs)
+        os.replace(tmp_path, self.path)
+
+
+def signatures(keys, texts, cache):
+    """Semnăturile pentru toată banca; calculează doar cheile lipsă din cache. Întoarce (sigs, noi)."""
+    unique_keys, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    _, found = cache.lookup(unique_keys)
+    missing = np.flatnonzero(~found)
+    for lo in range(0, len(missing), CHUNK):
+        batch = missing[lo:lo + CHUNK]
+        cache.add(unique_keys[batch], minhash([texts[first[i]] for i in batch]))
+    pos, _ = cache.lookup(unique_keys)
+    return cache.sigs[pos][inverse], len(missing)
+
+
+# === 2. LSH + verificare ===
+def candidate_pairs(sigs):
+    """Perechi (i < j) care coincid pe cel puțin o bandă, fără duplicate."""
+    pairs = []
+    for band in range(BANDS):
+        cols = sigs[:, band * ROWS:(band + 1) * ROWS].astype(np.uint64)
+        key = (cols * _BAND_MIX).sum(axis=1)          # hash al benzii (modulo 2^64)
+        order = np.argsort(key, kind="stable")
+        sorted_key = key[order]
+        bounds = np.flatnonzero(np.r_[True, sorted_key[1:] != sorted_key[:-1], True])
+        sizes = np.diff(bounds)
+        for b in np.flatnonzero(sizes > 1):
+            members = order[bounds[b]:bounds[b + 1]]
+            if len(members) > MAX_BUCKET:
+                pairs.append(np.column_stack([np.full(len(members) - 1, members[0]), members[1:]]))
+            else:
+                i, j = np.triu_indices(len(members), 1)
+                pairs.append(np.column_stack([members[i], members[j]]))
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64)
+    pairs = np.sort(np.concatenate(pairs), axis=1)
+    return np.unique(pairs, axis=0)
+
+
+def similarity(sigs, pairs):
+    """Similaritatea Jaccard estimată: fracția de permutări cu același minim."""
+    out = np.empty(len(pairs))
+    for lo in range(0, len(pairs), 100000):
+        p = pairs[lo:lo + 100000]
+        out[lo:lo + len(p)] = (sigs[p[:, 0]] == sigs[p[:, 1]]).mean(axis=1)
+    return out
+
+
+def clusters(n, pairs):
+    """Union-find peste perechi; întoarce {reprezentant (cel mai mic index): [membri]}."""
+    parent = list(range(n))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in pairs:
+        ri, rj = find(int(i)), find(int(j))
+        if ri != rj:
+            parent[max(ri, rj)] = min(ri, rj)
+    groups = {}
+    for i in {int(x) for x in pairs.ravel()}:
+        groups.setdefault(find(i), []).append(i)
+    return {root: sorted(members) for root, members in groups.items()}
+
+
+# === 3. Scanare + raport ===
+def scan(bank_path=None, threshold=DEFAULT_THRESHOLD, same_domain=False, cache_path=None):
+    """Întoarce raportul (dicționar) cu clusterele de duplicate din bancă."""
+    bank_path = bank_path or default_bank_path()
+    timings = {}
+    t0 = time.perf_counter()
+    texts, keys, meta = [], [], []
+    for q in iter_questions(bank_path):
+        text = shingle_text(q)
+        texts.append(text)
+        keys.append(content_key(text))
+        meta.append((q.get("id"), q.get("domain", ""), q.get("question", "")))
+    keys = np.array(keys, dtype=np.uint64)
+    timings["read_s"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    cache = SignatureCache(cache_path or default_cache_path())
+    sigs, computed = signatures(keys, texts, cache)
+    if computed or cache.stale(keys):
+        cache.save(keys)
+    timings["signatures_s"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    pairs = candidate_pairs(sigs)
+    sims = similarity(sigs, pairs)
+    keep = sims >= threshold
+    if same_domain and len(pairs):
+        domains = np.array([m[1].lower() for m in meta])
+        keep &= domains[pairs[:, 0]] == domains[pairs[:, 1]]
+    pairs, sims = pairs[keep], sims[keep]
+    groups = clusters(len(texts), pairs)
+    timings["lsh_s"] = time.perf_counter() - t0
+
+    pair_sim = {(int(i), int(j)): float(s) for (i, j), s in zip(pairs, sims)}
+    report_clusters = []
+    for root, members in sorted(groups.items()):
+        def entry(i):
+            qid, domain, question = meta[i]
+            item = {"index": i, "id": qid, "domain": domain, "question": question}
+            if i != root:
+                sim = pair_sim.get((root, i))
+                if sim is None:  # legat prin alt membru -> similaritatea directă, din semnături
+                    sim = float((sigs[root] == sigs[i]).mean())
+                item["similarity"] = round(sim, 3)
+            return item
+        report_clusters.append({"keep": entry(root), "duplicates": [entry(i) for i in members if i != root]})
+
+    return {
+        "bank": bank_path,
+        "questions": len(texts),
+        "threshold": threshold,
+        "same_domain": same_domain,
+        "signatures_computed": computed,
+        "candidate_pairs": int(keep.size),
+        "clusters": report_clusters,
+        "removed": sum(len(c["duplicates"]) for c in report_clusters),
+        "timings_s": {k: round(v, 2) for k, v in timings.items()},
+    }
+
+
+def write_clean(bank_path, out_path, removed):
+    """Banca fără întrebările din `removed` (indici), în același format ca sursa."""
+    tmp_path = f"{out_path}.{os.getpid()}.tmp"
+    if _looks_like_jsonl(bank_path):
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for i, q in enumerate(iter_questions(bank_path)):
+                if i not in removed:
+                    f.write(json.dumps(q, ensure_ascii=False) + "\n")
+    else:
+        with open(bank_path, "r", encoding="utf-8") as f:
+            by_domain = f.read(4096).lstrip().startswith("{")  # formatul {"domeniu": [...]}
+        if by_domain:
+            grouped = {}
+            for i, q in enumerate(iter_questions(bank_path)):
+                if i not in removed:
+                    domain = q.pop("domain", "")
+                    grouped.setdefault(domain, []).append(q)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(grouped, f, ensure_ascii=False, indent=2)
+        else:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write("[\n")
+                first = True
+                for i, q in enumerate(iter_questions(bank_path)):
+                    if i in removed:
+                        continue
+                    f.write(("" if first else ",\n") + json.dumps(q, ensure_ascii=False))
+                    first = False
+                f.write("\n]\n")
+    os.replace(tmp_path, out_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Întrebări duplicate / aproape duplicate (MinHash + LSH).")
+    sub = parser.add_subparsers(dest="command", required=True)
+    s = sub.add_parser("scan", help="raport cu clusterele de duplicate")
+    s.add_argument("--bank", help="fișierul băncii (implicit data/fea_questions.json)")
+    s.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="similaritatea Jaccard minimă")
+    s.add_argument("--same-domain", action="store_true", help="doar duplicate din același domeniu")
+    s.add_argument("--report", help="scrie raportul JSON complet aici")
+    s.add_argument("--clean", help="scrie banca fără duplicate aici (se păstrează prima apariție)")
+    s.add_argument("--show", type=int, default=10, help="câte clustere să afișeze")
+    args = parser.parse_args(argv)
+
+    report = scan(args.bank, args.threshold, args.same_domain)
+    for c in report["clusters"][:args.show]:
+        keep = c["keep"]
+        print(f"[{keep['domain']}] #{keep['index']} {keep['question'][:90]}")
+        for d in c["duplicates"]:
+            print(f"    ~{d['similarity']:.2f} [{d['domain']}] #{d['index']} {d['question'][:80]}")
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.clean:
+        removed = {d["index"] for c in report["clusters"] for d in c["duplicates"]}
+        write_clean(report["bank"], args.clean, removed)
+        print(f"[INFO] Banca curățată: {args.clean} ({report['questions'] - len(removed)} întrebări)")
+    t = report["timings_s"]
+    print(f"[INFO] {report['questions']} întrebări, {len(report['clusters'])} clustere, "
+          f"{report['removed']} duplicate; semnături noi: {report['signatures_computed']} "
+          f"(citire {t['read_s']} s, semnături {t['signatures_s']} s, LSH {t['lsh_s']} s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
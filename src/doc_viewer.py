@@ -0,0 +1,241 @@
+# doc_viewer.py
+from bisect import bisect_right
+from tkinter import Frame, Canvas, Scrollbar
+
+import customtkinter as ctk
+
+# ================================================================
+#  DOC VIEWER - afișare virtualizată pentru Learn Mode
+#  Doar secțiunile din jurul viewport-ului au widget-uri; la scroll
+#  widget-urile ieșite din zonă sunt refolosite pentru secțiunile noi.
+#  Înălțimile sunt estimate din text, apoi înlocuite cu cele măsurate.
+#  Imaginile se încarcă la intrarea în zonă și se eliberează la ieșire.
+# ================================================================
+
+CARD_BG = "#2a2a2a"
+CARD_PAD_Y = 8      # spațiu între carduri (sus + jos)
+WRAP = 650
+
+
+class _SectionWidget:
+    """Un card de secțiune (subtitlu + text + imagine), refolosit între secțiuni."""
+
+    def __init__(self, canvas):
+        self.frame = Frame(canvas, bg=CARD_BG, padx=12, pady=10)
+        self.subtitle = ctk.CTkLabel(
+            self.frame,
+            text="",
+            font=("Segoe UI", 15, "bold"),
+            text_color="#00ffff",
+            wraplength=WRAP,
+            justify="left"
+        )
+        self.content = ctk.CTkLabel(
+            self.frame,
+            text="",
+            font=("Segoe UI", 13),
+            text_color="#ffffff",
+            wraplength=WRAP,
+            justify="left"
+        )
+        self.image_label = None
+        self.image = None
+        self.window = canvas.create_window(5, 0, window=self.frame, anchor="nw")
+
+    def bind(self, sec, image):
+        sub = sec.get("subtitle", "")
+        txt = sec.get("content", "")
+
+        self.subtitle.pack_forget()
+        self.content.pack_forget()
+        if sub:
+            self.subtitle.configure(text=sub)
+            self.subtitle.pack(anchor="w")
+        if txt:
+            self.content.configure(text=txt)
+            self.content.pack(anchor="w", pady=(4, 8))
+
+        self.image = image
+        if image:
+            self.image_label = ctk.CTkLabel(self.frame, image=image, text="")
+            self.image_label.pack(anchor="w", pady=(0, 8))
+
+    def release(self):
+        # label-ul de imagine e distrus: altfel Tk păstrează PhotoImage-ul vechi în memorie
+        if self.image_label is not None:
+            self.image_label.destroy()
+            self.image_label = None
+        self.image = None
+
+
+class VirtualDocView(Frame):
+    """
+    Listă derulabilă de secțiuni, materializată doar în jurul viewport-ului.
+    load_image(rel_path) -> CTkImage sau None
+    prefetch_image(rel_path) -> pornește decodarea în fundal (opțional)
+    """
+
+    MARGIN = 600       # px deasupra / dedesubtul viewport-ului păstrați materializați
+    PREFETCH_AHEAD = 2  # secțiuni după zona vizibilă pentru care pregătim imaginea
+
+    def __init__(self, master, sections, load_image=None, prefetch_image=None, bg="#202020"):
+        super().__init__(master, bg=bg)
+        self.sections = sections
+        self.load_image = load_image
+        self.prefetch_image = prefetch_image
+
+        self.canvas = Canvas(self, bg=bg, highlightthickness=0, yscrollincrement=20)
+        self.scrollbar = Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self._heights = [self._estimate(sec) for sec in sections]
+        self._tops = []
+        self._total = 0
+        self._recompute()
+
+        self._active = {}  # index secțiune -> _SectionWidget
+        self._pool = []
+
+        self.canvas.bind("<Configure>", self._on_configure)
+        self.canvas.bind("<Enter>", self._bind_wheel)
+        self.canvas.bind("<Leave>", self._unbind_wheel)
+        self.after_idle(self._refresh)
+
+    # === 1. Geometrie ===
+    @staticmethod
+    def _estimate(sec):
+        height = 20 + 2 * CARD_PAD_Y
+        if sec.get("subtitle"):
+            height += 26
+        txt = sec.get("content", "")
+        if txt:
+            height += 20 * (len(txt) // 90 + 1) + 12
+        if sec.get("image"):
+            height += 408
+        return height
+
+    def _recompute(self):
+        tops = []
+        y = 0
+        for h in self._heights:
+            tops.append(y)
+            y += h
+        self._tops = tops
+        self._total = y
+        self.canvas.configure(scrollregion=(0, 0, self.canvas.winfo_width(), self._total))
+
+    def _reposition(self):
+        for idx, widget in self._active.items():
+            self.canvas.coords(widget.window, 5, self._tops[idx] + CARD_PAD_Y)
+
+    # === 2. Evenimente ===
+    def _on_scrollbar(self, *args):
+        self.canvas.yview(*args)
+        self._refresh()
+
+    def _on_configure(self, event):
+        width = max(event.width - 10, 1)
+        for widget in self._active.values():
+            self.canvas.itemconfigure(widget.window, width=width)
+        self.canvas.configure(scrollregion=(0, 0, event.width, self._total))
+        self._refresh()
+
+    def _on_wheel(self, event):
+        if getattr(event, "num", None) == 4:
+            step = -3
+        elif getattr(event, "num", None) == 5:
+            step = 3
+        else:
+            step = -3 if event.delta > 0 else 3
+        self.canvas.yview_scroll(step, "units")
+        self._refresh()
+
+    def _bind_wheel(self, _event=None):
+        self.canvas.bind_all("<MouseWheel>", self._on_wheel)
+        self.canvas.bind_all("<Button-4>", self._on_wheel)
+        self.canvas.bind_all("<Button-5>", self._on_wheel)
+
+    def _unbind_wheel(self, _event=None):
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.canvas.unbind_all(seq)
+
+    def destroy(self):
+        self._unbind_wheel()
+        for widget in self._active.values():
+            widget.release()
+        self._active = {}
+        self._pool = []
+        super().destroy()
+
+    def scroll_to(self, index):
+        """Derulează astfel încât secțiunea `index` să fie sus în viewport."""
+        if not 0 <= index < len(self.sections) or not self._total:
+            return
+        self.canvas.yview_moveto(self._tops[index] / self._total)
+        self._refresh()
+
+    # === 3. Materializare ===
+    def _visible_range(self):
+        top = self.canvas.canvasy(0)
+        bottom = top + max(self.canvas.winfo_height(), 1)
+        lo, hi = top - self.MARGIN, bottom + self.MARGIN
+        first = max(bisect_right(self._tops, lo) - 1, 0)
+        last = bisect_right(self._tops, hi)
+        return first, last
+
+    def _refresh(self):
+        if not self.sections or not self.winfo_exists():
+            return
+        first, last = self._visible_range()
+
+        for idx in [i for i in self._active if not first <= i < last]:
+            widget = self._active.pop(idx)
+            widget.release()
+            self.canvas.itemconfigure(widget.window, state="hidden")
+            self._pool.append(widget)
+
+        view_top = self.canvas.canvasy(0)
+        shift = 0
+        changed = False
+        for idx in range(first, last):
+            if idx in self._active:
+                continue
+            delta = self._materialize(idx)
+            if delta:
+                changed = True
+                if self._tops[idx] < view_top:
+                    shift += delta
+
+        if changed:
+            self._recompute()
+            self._reposition()
+            if shift and self._total:
+                # secțiuni de deasupra s-au redimensionat -> păstrăm conținutul vizibil pe loc
+                self.canvas.yview_moveto((view_top + shift) / self._total)
+            # înălțimile reale pot aduce alte secțiuni în zonă; a doua trecere e stabilă
+            self.after_idle(self._refresh)
+
+        if self.prefetch_image:
+            for idx in range(last, min(last + self.PREFETCH_AHEAD, len(self.sections))):
+                img_rel = self.sections[idx].get("image", "")
+                if img_rel:
+                    self.prefetch_image(img_rel)
+
+    def _materialize(self, idx):
+        """Atașează un widget secțiunii idx; întoarce diferența dintre înălțimea măsurată și cea estimată."""
+        widget = self._pool.pop() if self._pool else _SectionWidget(self.canvas)
+        sec = self.sections[idx]
+        image = self.load_image(sec.get("image", "")) if self.load_image else None
+        widget.bind(sec, image)
+
+        self.canvas.itemconfigure(widget.window, state="normal", width=max(self.canvas.winfo_width() - 10, 1))
+        self.canvas.coords(widget.window, 5, self._tops[idx] + CARD_PAD_Y)
+        self._active[idx] = widget
+
+        widget.frame.update_idletasks()
+        measured = widget.frame.winfo_reqheight() + 2 * CARD_PAD_Y
+        delta = measured - self._heights[idx]
+        self._heights[idx] = measured
+        return delta
@@ -0,0 +1,137 @@
+# image_cache.py
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+from data_loader import load_settings
+from metrics import gauge
+from thumbnail_cache import get_thumbnail_cache
+
+# ================================================================
+#  IMAGE CACHE - imagini decodate + redimensionate, în memorie (LRU)
+#  Cheie: (cale, dimensiune țintă, mtime) -> o imagine modificată pe
+#  disc nu mai e servită din cache. Limită pe bytes (w * h * 4, RGBA).
+#  prefetch() decodează în fundal imaginea următoarei întrebări.
+# ================================================================
+
+DEFAULT_MAX_MB = 64
+
+
+def decode_image(path, size):
+    """
+    Imaginea RGBA micșorată la `size`, păstrând raportul.
+    Citește varianta pre-scalată din data/.thumbs (generată la primul miss);
+    sursa la rezoluție completă e decodată doar dacă cache-ul de pe disc nu merge.
+    """
+    try:
+        thumb = get_thumbnail_cache().get(path, size)
+    except Exception as e:
+        print(f"[WARN] Cache thumbnail indisponibil pentru {path}: {e}")
+        thumb = None
+    pil_img = Image.open(thumb or path)
+    pil_img = pil_img.convert("RGBA")
+    pil_img.thumbnail(size)
+    return pil_img
+
+
+class ImageCache:
+    def __init__(self, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()  # cheie -> (imagine PIL, bytes)
+        self._bytes = 0
+        self._inflight = {}          # cheie -> Future (prefetch în curs)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="image-prefetch")
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(path, size):
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        return (os.path.abspath(path), tuple(size), mtime)
+
+    def _store(self, key, img):
+        nbytes = img.width * img.height * 4
+        with self._lock:
+            if key in self._items:
+                return
+            self._items[key] = (img, nbytes)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes and len(self._items) > 1:
+                _, (_, old_bytes) = self._items.popitem(last=False)
+                self._bytes -= old_bytes
+
+    def _load(self, key, path, size):
+        img = decode_image(path, size)
+        self._store(key, img)
+        return img
+
+    def get(self, path, size):
+        """Imaginea PIL redimensionată, din cache sau decodată acum. None dacă lipsește."""
+        key = self._key(path, size)
+        if key is None:
+            return None
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return item[0]
+            future = self._inflight.get(key)
+            self.misses += 1
+        if future is not None:
+            # prefetch-ul e deja pornit -> așteptăm rezultatul lui, nu decodăm de două ori
+            try:
+                return future.result()
+            except Exception:
+                pass
+        return self._load(key, path, size)
+
+    def prefetch(self, path, size):
+        """Pornește decodarea în fundal (dacă imaginea nu e deja în cache)."""
+        key = self._key(path, size)
+        if key is None:
+            return None
+        with self._lock:
+            if key in self._items or key in self._inflight:
+                return self._inflight.get(key)
+            future = self._executor.submit(self._load, key, path, size)
+            self._inflight[key] = future
+        future.add_done_callback(lambda _f: self._forget(key))
+        return future
+
+    def _forget(self, key):
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    @property
+    def size_bytes(self):
+        return self._bytes
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_image_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                max_mb = load_settings().get("image_cache_mb", DEFAULT_MAX_MB)
+                _cache = ImageCache(int(max_mb * 1024 * 1024))
+                gauge("image_cache_hits", lambda: _cache.hits)
+                gauge("image_cache_misses", lambda: _cache.misses)
+                gauge("image_cache_bytes", lambda: _cache.size_bytes)
+    return _cache
@@ -0,0 +1,378 @@
+# irt.py
+import argparse
+import math
+import os
+import random
+import sys
+import threading
+
+import numpy as np
+
+from answer_log import AnswerLog
+from data_loader import get_data_dir
+from item_analytics import read_columns
+
+# ================================================================
+#  IRT - calibrare 2PL din jurnalul de răspunsuri + examen adaptiv (CAT)
+#  P(corect | θ) = 1 / (1 + exp(-a (θ - b)))
+#  - calibrate: estimare MAP alternantă (abilitate θ per utilizator,
+#    apoi a, b per întrebare) cu pași Newton vectorizați peste coloanele
+#    jurnalului; pornește din parametrii salvați anterior (warm start),
+#    deci o recalibrare după câteva sesiuni noi converge în puțini pași
+#  - ItemIndex: pentru fiecare bin de abilitate, întrebările ordonate după
+#    informația Fisher la centrul binului -> următoarea întrebare = căutare
+#    binară a binului + primul element nefolosit (fără scanarea băncii)
+#  - AdaptiveTest: θ estimat EAP pe o grilă, oprire la eroarea standard țintă
+#  Parametri: data/irt_params.npz
+#
+#  python src/irt.py calibrate
+#  python src/irt.py simulate --sessions 500 --max-questions 30
+# ================================================================
+
+CACHE_VERSION = 1
+MIN_RESPONSES = 20      # sub atât, întrebarea nu intră în examenul adaptiv
+PRIOR_THETA_SD = 1.0
+PRIOR_LOG_A_SD = 0.5
+PRIOR_B_SD = 2.0
+MIN_A, MAX_A = 0.2, 4.0
+MAX_B = 5.0
+MAX_STEP = 1.0          # pas Newton maxim (stabilitate în primele iterații)
+
+BIN_CENTERS = np.linspace(-4.0, 4.0, 33)    # binuri de 0.25 pentru selecție
+QUADRATURE = np.linspace(-4.0, 4.0, 81)     # grila pentru estimarea EAP
+TOP_PER_BIN = 256       # > MAX_QUESTIONS din quiz_server: binul nu se epuizează
+RANDOMESQUE = 3         # se alege aleator dintre primele k (expunere mai uniformă)
+TARGET_SE = 0.30        # eroarea standard la care examenul se oprește
+MIN_QUESTIONS = 5
+
+
+def default_params_path():
+    return os.path.join(get_data_dir(), "irt_params.npz")
+
+
+def _sigmoid(z):
+    return 1.0 / (1.0 + np.exp(-z))
+
+
+def information(a, b, theta):
+    """Informația Fisher 2PL: a² p (1 - p)."""
+    p = _sigmoid(a * (theta - b))
+    return a * a * p * (1.0 - p)
+
+
+# === 1. Parametri (persistați după id-ul întrebării / numele utilizatorului) ===
+class IrtParams:
+    def __init__(self, qids=(), a=None, b=None, n=None, users=(), theta=None, processed=0):
+        self.qids = list(qids)
+        self.a = np.ones(len(self.qids)) if a is None else a
+        self.b = np.zeros(len(self.qids)) if b is None else b
+        self.n = np.zeros(len(self.qids), np.int64) if n is None else n
+        self.users = list(users)
+        self.theta = np.zeros(len(self.users)) if theta is None else theta
+        self.processed = processed
+
+    def save(self, path):
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp_path, version=CACHE_VERSION, processed=self.processed,
+                 qids=np.array(self.qids, dtype=str), a=self.a, b=self.b, n=self.n,
+                 users=np.array(self.users, dtype=str), theta=self.theta)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with np.load(path) as data:
+                if int(data["version"]) != CACHE_VERSION:
+                    return None
+                return cls(data["qids"].tolist(), data["a"], data["b"], data["n"],
+                           data["users"].tolist(), data["theta"], int(data["processed"]))
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def calibrated(self, min_responses=MIN_RESPONSES):
+        """Indicii întrebărilor cu destule răspunsuri pentru a fi folosite în CAT."""
+        return np.flatnonzero(self.n >= min_responses)
+
+
+def _warm_start(names, previous_names, previous_values, default):
+    """Valorile anterioare pentru numele cunoscute, `default` pentru cele noi."""
+    values = np.array(default, dtype=np.float64, copy=True)
+    known = {name: i for i, name in enumerate(previous_names)}
+    for i, name in enumerate(names):
+        j = known.get(name)
+        if j is not None:
+            values[i] = previous_values[j]
+    return values
+
+
+# === 2. Calibrare 2PL ===
+def calibrate(log=None, params_path=None, max_iter=100, tol=1e-3, warm=True, verbose=False):
+    """
+    Estimează (a, b) per întrebare și θ per utilizator din tot jurnalul.
+    warm=True pornește din parametrii salvați; întrebările noi pornesc de la
+    b = -logit(proporția de răspunsuri corecte). Întoarce (IrtParams, iterații).
+    """
+    log = log or AnswerLog()
+    params_path = params_path or default_params_path()
+    cols = read_columns(log)
+    q = cols["question"].astype(np.int64)
+    u = cols["user"].astype(np.int64)
+    c = cols["correct"].astype(np.float64)
+    n_items, n_users = len(log.questions.items), len(log.users.items)
+
+    n = np.bincount(q, minlength=n_items)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        p0 = np.clip(np.bincount(q, weights=c, minlength=n_items) / n, 0.02, 0.98)
+    b = np.where(n > 0, -np.log(p0 / (1.0 - p0)), 0.0)
+    log_a = np.zeros(n_items)
+    theta = np.zeros(n_users)
+
+    previous = IrtParams.load(params_path) if warm else None
+    if previous is not None:
+        b = _warm_start(log.questions.items, previous.qids, previous.b, b)
+        log_a = _warm_start(log.questions.items, previous.qids, np.log(previous.a), log_a)
+        theta = _warm_start(log.users.items, previous.users, previous.theta, theta)
+
+    iterations = 0
+    for iterations in range(1, max_iter + 1):
+        # θ per utilizator (a, b fixe)
+        a = np.exp(log_a)
+        aq = a[q]
+        p = _sigmoid(aq * (theta[u] - b[q]))
+        grad = np.bincount(u, weights=aq * (c - p), minlength=n_users) - theta / PRIOR_THETA_SD ** 2
+        info = np.bincount(u, weights=aq * aq * p * (1 - p), minlength=n_users) + 1 / PRIOR_THETA_SD ** 2
+        step_theta = np.clip(grad / info, -MAX_STEP, MAX_STEP)
+        theta += step_theta
+
+        # b per întrebare (θ, a fixe); dz/db = -a
+        d = theta[u] - b[q]
+        p = _sigmoid(aq * d)
+        w = p * (1 - p)
+        grad = -np.bincount(q, weights=aq * (c - p), minlength=n_items) - b / PRIOR_B_SD ** 2
+        info = np.bincount(q, weights=aq * aq * w, minlength=n_items) + 1 / PRIOR_B_SD ** 2
+        new_b = np.clip(b + np.clip(grad / info, -MAX_STEP, MAX_STEP), -MAX_B, MAX_B)
+        step_b, b = new_b - b, new_b
+
+        # log a per întrebare (θ, b fixe); dz/d(log a) = a (θ - b)
+        d = theta[u] - b[q]
+        z = aq * d
+        p = _sigmoid(z)
+        w = p * (1 - p)
+        grad = np.bincount(q, weights=z * (c - p), minlength=n_items) - log_a / PRIOR_LOG_A_SD ** 2
+        info = np.bincount(q, weights=z * z * w, minlength=n_items) + 1 / PRIOR_LOG_A_SD ** 2
+        new_log_a = np.clip(log_a + np.clip(grad / info, -MAX_STEP, MAX_STEP),
+                            math.log(MIN_A), math.log(MAX_A))
+        step_a, log_a = new_log_a - log_a, new_log_a
+
+        change = max(np.abs(step_theta).max(initial=0), np.abs(step_b).max(initial=0),
+                     np.abs(step_a).max(initial=0))
+        if verbose:
+            print(f"[INFO] iterația {iterations}: pas maxim {change:.5f}")
+        if change < tol:
+            break
+
+    params = IrtParams(log.questions.items, np.exp(log_a), b, n, log.users.items, theta, log.count)
+    params.save(params_path)
+    _invalidate_indexes()
+    return params, iterations
+
+
+# === 3. Index pe binuri de abilitate ===
+class ItemIndex:
+    """
+    Pentru fiecare centru de bin din BIN_CENTERS: primele TOP_PER_BIN întrebări
+    calibrate (indici în bancă), descrescător după informație. Parametrii
+    (a, b) sunt păstrați sortați după indicele din bancă (căutare binară).
+    """
+
+    def __init__(self, bank, params, domain="mix"):
+        positions, a, b = [], [], []
+        for i in params.calibrated():
+            pos = bank.by_id.get(params.qids[i])
+            if pos is not None:
+                positions.append(pos)
+                a.append(params.a[i])
+                b.append(params.b[i])
+        positions = np.asarray(positions, dtype=np.int64)
+        if domain and domain.lower() != "mix" and len(positions):
+            keep = np.isin(positions, np.asarray(bank.indices(domain), dtype=np.int64))
+            positions = positions[keep]
+            a, b = np.asarray(a)[keep], np.asarray(b)[keep]
+        order = np.argsort(positions)
+        self.positions = positions[order]
+        self.a = np.asarray(a, dtype=np.float64)[order]
+        self.b = np.asarray(b, dtype=np.float64)[order]
+
+        self.by_bin = []
+        k = min(TOP_PER_BIN, len(self.positions))
+        for center in BIN_CENTERS:
+            if not k:
+                self.by_bin.append(self.positions[:0])
+                continue
+            info = information(self.a, self.b, center)
+            top = np.argpartition(-info, k - 1)[:k]
+            top = top[np.argsort(-info[top], kind="stable")]
+            self.by_bin.append(self.positions[top])
+        self._edges = (BIN_CENTERS[1:] + BIN_CENTERS[:-1]) / 2
+
+    def __len__(self):
+        return len(self.positions)
+
+    def params_of(self, position):
+        i = int(np.searchsorted(self.positions, position))
+        return float(self.a[i]), float(self.b[i])
+
+    def candidates(self, theta, used, k=RANDOMESQUE):
+        """Primele k întrebări nefolosite din binul lui θ (O(log bins + |used|))."""
+        ranked = self.by_bin[int(np.searchsorted(self._edges, theta))]
+        found = []
+        for pos in ranked:
+            pos = int(pos)
+            if pos not in used:
+                found.append(pos)
+                if len(found) == k:
+                    break
+        return found
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def _invalidate_indexes():
+    with _indexes_lock:
+        _indexes.clear()
+
+
+def get_item_index(bank, domain="mix", params_path=None):
+    """
+    Indexul CAT pentru bancă + domeniu, sau None dacă nu există parametri calibrați.
+    Se reconstruiește când se schimbă banca (altă listă de întrebări) sau fișierul de parametri.
+    """
+    params_path = params_path or default_params_path()
+    try:
+        mtime = os.stat(params_path).st_mtime_ns
+    except OSError:
+        return None
+    key = (params_path, (domain or "mix").lower())
+    stamp = (id(bank.questions), mtime)
+    entry = _indexes.get(key)
+    if entry is None or entry[0] != stamp:
+        with _indexes_lock:
+            entry = _indexes.get(key)
+            if entry is None or entry[0] != stamp:
+                params = IrtParams.load(params_path)
+                index = ItemIndex(bank, params, domain) if params is not None else None
+                entry = _indexes[key] = (stamp, index)
+    index = entry[1]
+    return index if index is not None and len(index) else None
+
+
+# === 4. Sesiune adaptivă ===
+class AdaptiveTest:
+    """Abilitatea curentă (EAP pe QUADRATURE, prior N(0, 1)) și alegerea întrebării următoare."""
+
+    __slots__ = ("index", "max_questions", "target_se", "rng", "used", "answered",
+                 "_log_post", "theta", "se")
+
+    def __init__(self, index, max_questions=20, target_se=TARGET_SE, rng=None):
+        self.index = index
+        self.max_questions = max_questions
+        self.target_se = target_se
+        self.rng = rng or random
+        self.used = set()
+        self.answered = 0
+        self._log_post = -0.5 * (QUADRATURE / PRIOR_THETA_SD) ** 2
+        self.theta, self.se = 0.0, PRIOR_THETA_SD
+
+    def done(self):
+        if self.answered >= self.max_questions:
+            return True
+        return self.answered >= MIN_QUESTIONS and self.se <= self.target_se
+
+    def next_index(self):
+        """Indicele în bancă al următoarei întrebări, sau None (oprire / fără candidați)."""
+        if self.done():
+            return None
+        found = self.index.candidates(self.theta, self.used)
+        if not found:
+            return None
+        pos = self.rng.choice(found)
+        self.used.add(pos)
+        return pos
+
+    def record(self, position, correct):
+        a, b = self.index.params_of(position)
+        p = _sigmoid(a * (QUADRATURE - b))
+        self._log_post += np.log(p if correct else 1.0 - p)
+        w = np.exp(self._log_post - self._log_post.max())
+        w /= w.sum()
+        self.theta = float(w @ QUADRATURE)
+        self.se = float(math.sqrt(w @ (QUADRATURE - self.theta) ** 2))
+        self.answered += 1
+
+
+# === 5. Simulare: CAT vs. set fix aleator, pe parametrii calibrați ===
+def simulate(index, sessions=500, max_questions=30, target_se=TARGET_SE, seed=1):
+    """Câte întrebări îi trebuie CAT-ului până la target_se și ce SE obține un set fix de aceeași lungime."""
+    rng = random.Random(seed)
+    nrng = np.random.default_rng(seed)
+    lengths, cat_se, fixed_se, cat_err = [], [], [], []
+    for _ in range(sessions):
+        true_theta = nrng.normal()
+        test = AdaptiveTest(index, max_questions, target_se, rng)
+        while (pos := test.next_index()) is not None:
+            a, b = test.index.params_of(pos)
+            test.record(pos, rng.random() < 1 / (1 + math.exp(-a * (true_theta - b))))
+        lengths.append(test.answered)
+        cat_se.append(test.se)
+        cat_err.append(abs(test.theta - true_theta))
+
+        fixed = AdaptiveTest(index, test.answered, 0.0, rng)
+        for i in rng.sample(range(len(index)), min(test.answered, len(index))):
+            pos = int(index.positions[i])
+            a, b = index.params_of(pos)
+            fixed.record(pos, rng.random() < 1 / (1 + math.exp(-a * (true_theta - b))))
+        fixed_se.append(fixed.se)
+    return {
+        "sessions": sessions,
+        "cat_mean_questions": float(np.mean(lengths)),
+        "cat_mean_se": float(np.mean(cat_se)),
+        "cat_mean_abs_error": float(np.mean(cat_err)),
+        "fixed_mean_se_same_length": float(np.mean(fixed_se)),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calibrare IRT 2PL + examen adaptiv.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    cal = sub.add_parser("calibrate", help="estimează parametrii din jurnalul de răspunsuri")
+    cal.add_argument("--cold", action="store_true", help="ignoră parametrii anteriori (fără warm start)")
+    cal.add_argument("--max-iter", type=int, default=100)
+    cal.add_argument("--verbose", action="store_true")
+    sim = sub.add_parser("simulate", help="CAT vs. set fix, pe parametrii calibrați")
+    sim.add_argument("--sessions", type=int, default=500)
+    sim.add_argument("--max-questions", type=int, default=30)
+    sim.add_argument("--target-se", type=float, default=TARGET_SE)
+    sim.add_argument("--domain", default="mix")
+    sim.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    if args.command == "calibrate":
+        params, iterations = calibrate(max_iter=args.max_iter, warm=not args.cold, verbose=args.verbose)
+        print(f"[INFO] {params.processed} răspunsuri, {len(params.calibrated())} întrebări calibrate "
+              f"(n >= {MIN_RESPONSES}), {len(params.users)} utilizatori, {iterations} iterații")
+        return 0
+
+    from question_bank import get_question_bank
+    index = get_item_index(get_question_bank(), args.domain)
+    if index is None:
+        print("[WARN] Nu există parametri IRT pentru bancă; rulează întâi `calibrate`.")
+        return 1
+    for key, value in simulate(index, args.sessions, args.max_questions, args.target_se, args.seed).items():
+        print(f"{key:28} {value:.3f}" if isinstance(value, float) else f"{key:28} {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+# item_analytics.py
+import argparse
+import csv
+import os
+import sys
+
+import numpy as np
+
+from answer_log import AnswerLog, COLUMNS
+from data_loader import get_data_dir
+
+# ================================================================
+#  ITEM ANALYTICS - statistici per întrebare din jurnalul de răspunsuri
+#  - dificultate: proporția răspunsurilor corecte
+#  - frecvența fiecărei variante (distractori)
+#  - discriminare point-biserial: corelația dintre „a răspuns corect”
+#    și scorul restului sesiunii (fără întrebarea respectivă)
+#  - timpul median de răspuns
+#
+#  Sumele (n, Σc, Σr, Σr², Σc·r, variante) sunt aditive -> la o nouă
+#  rulare se procesează doar evenimentele noi. Mediana nu e aditivă:
+#  se recalculează exact doar pentru întrebările atinse de evenimente noi.
+#  Cache: data/item_analytics.npz
+#
+#  python src/item_analytics.py report --min-n 30
+# ================================================================
+
+MAX_CHOICES = 8
+CACHE_VERSION = 1
+TRIVIAL_P = 0.95     # aproape toată lumea răspunde corect
+HARD_P = 0.20        # sub nivelul ghicitului la 4-5 variante
+MIN_DISCRIMINATION = 0.0
+
+
+def _dtype(typecode):
+    return np.dtype("<u1") if typecode == "B" else np.dtype("<u4")
+
+
+def read_columns(log, start=0, stop=None):
+    """Coloanele jurnalului pentru evenimentele [start, stop), ca array-uri NumPy."""
+    stop = log.count if stop is None else stop
+    cols = {}
+    for name, typecode in COLUMNS:
+        dtype = _dtype(typecode)
+        if stop <= start:
+            cols[name] = np.empty(0, dtype=dtype)
+            continue
+        cols[name] = np.fromfile(log.path(name), dtype=dtype, count=stop - start,
+                                 offset=start * dtype.itemsize)
+    return cols
+
+
+def rest_scores(session, correct):
+    """
+    Pentru fiecare eveniment: proporția de răspunsuri corecte din restul sesiunii
+    (fără evenimentul curent). Sesiunile cu un singur răspuns primesc NaN.
+    """
+    if not len(session):
+        return np.empty(0)
+    _, inverse = np.unique(session, return_inverse=True)
+    totals = np.bincount(inverse, weights=correct)
+    sizes = np.bincount(inverse)
+    others = sizes[inverse] - 1
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(others > 0, (totals[inverse] - correct) / others, np.nan)
+
+
+class ItemStats:
+    """Statisticile cumulate; câmpurile sunt array-uri indexate după id-ul întrebării din jurnal."""
+
+    FIELDS = ("n", "n_r", "sum_c", "sum_r", "sum_r2", "sum_cr", "sum_c_r", "median_rt", "choices")
+
+    def __init__(self, processed=0, arrays=None):
+        self.processed = processed
+        arrays = arrays or {}
+        self.n = arrays.get("n", np.zeros(0, np.int64))
+        self.n_r = arrays.get("n_r", np.zeros(0, np.int64))           # evenimente cu scor rest definit
+        self.sum_c = arrays.get("sum_c", np.zeros(0))
+        self.sum_r = arrays.get("sum_r", np.zeros(0))
+        self.sum_r2 = arrays.get("sum_r2", np.zeros(0))
+        self.sum_cr = arrays.get("sum_cr", np.zeros(0))
+        self.sum_c_r = arrays.get("sum_c_r", np.zeros(0))             # Σc doar pe evenimentele cu rest
+        self.median_rt = arrays.get("median_rt", np.zeros(0))
+        self.choices = arrays.get("choices", np.zeros((0, MAX_CHOICES), np.int64))
+
+    def _grow(self, size):
+        extra = size - len(self.n)
+        if extra <= 0:
+            return
+        for name in self.FIELDS:
+            current = getattr(self, name)
+            pad = np.zeros((extra,) + current.shape[1:], dtype=current.dtype)
+            setattr(self, name, np.concatenate([current, pad]))
+        self.median_rt[-extra:] = np.nan
+
+    # === Actualizare incrementală ===
+    def update(self, log):
+        """Procesează evenimentele noi din jurnal. Întoarce numărul lor."""
+        start, stop = self.processed, log.count
+        if stop <= start:
+            return 0
+        self._grow(len(log.questions.items))
+        new = read_columns(log, start, stop)
+        q = new["question"].astype(np.int64)
+        c = new["correct"].astype(np.float64)
+        size = len(self.n)
+
+        self.n += np.bincount(q, minlength=size)
+        self.sum_c += np.bincount(q, weights=c, minlength=size)
+
+        r = rest_scores(new["session"], c)
+        ok = ~np.isnan(r)
+        qr, cr, rr = q[ok], c[ok], r[ok]
+        self.n_r += np.bincount(qr, minlength=size)
+        self.sum_c_r += np.bincount(qr, weights=cr, minlength=size)
+        self.sum_r += np.bincount(qr, weights=rr, minlength=size)
+        self.sum_r2 += np.bincount(qr, weights=rr * rr, minlength=size)
+        self.sum_cr += np.bincount(qr, weights=cr * rr, minlength=size)
+
+        choice = np.minimum(new["choice"].astype(np.int64), MAX_CHOICES - 1)
+        self.choices += np.bincount(q * MAX_CHOICES + choice,
+                                    minlength=size * MAX_CHOICES).reshape(size, MAX_CHOICES)
+
+        self._update_medians(log, np.unique(q))
+        self.processed = stop
+        return stop - start
+
+    def _update_medians(self, log, touched):
+        """Mediana exactă a timpului de răspuns, doar pentru întrebările atinse."""
+        q_all = np.memmap(log.path("question"), dtype="<u4", mode="r", shape=(log.count,))
+        mask = np.isin(q_all, touched)
+        q = q_all[mask].astype(np.int64)
+        rt = np.memmap(log.path("rt_ms"), dtype="<u4", mode="r", shape=(log.count,))[mask].astype(np.float64)
+        order = np.lexsort((rt, q))
+        q, rt = q[order], rt[order]
+        starts = np.flatnonzero(np.r_[True, q[1:] != q[:-1]])
+        ends = np.r_[starts[1:], len(q)]
+        lo = starts + (ends - starts - 1) // 2
+        hi = starts + (ends - starts) // 2
+        self.median_rt[q[starts]] = (rt[lo] + rt[hi]) / 2
+
+    # === Indicatori ===
+    def difficulty(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.sum_c / self.n
+
+    def distractor_frequencies(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.choices / self.n[:, None]
+
+    def point_biserial(self):
+        """Corelația Pearson c ~ r (echivalentă point-biserial pentru c binar), din sume."""
+        n = self.n_r.astype(np.float64)
+        sx, sy = self.sum_c_r, self.sum_r
+        cov = n * self.sum_cr - sx * sy
+        var_x = n * sx - sx * sx           # c² = c
+        var_y = n * self.sum_r2 - sy * sy
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return cov / np.sqrt(var_x * var_y)
+
+    # === Persistență ===
+    def save(self, path):
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp_path, version=CACHE_VERSION, processed=self.processed,
+                 **{name: getattr(self, name) for name in self.FIELDS})
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with np.load(path) as data:
+                if int(data["version"]) != CACHE_VERSION:
+                    return cls()
+                return cls(int(data["processed"]), {name: data[name] for name in cls.FIELDS})
+        except (OSError, KeyError, ValueError):
+            return cls()
+
+
+def default_cache_path():
+    return os.path.join(get_data_dir(), "item_analytics.npz")
+
+
+def compute(log=None, cache_path=None, full=False):
+    """Statisticile la zi: cache + doar evenimentele noi (full=True -> de la zero)."""
+    log = log or AnswerLog()
+    cache_path = cache_path or default_cache_path()
+    stats = ItemStats() if full else ItemStats.load(cache_path)
+    if stats.processed > log.count:
+        stats = ItemStats()  # jurnalul a fost șters / înlocuit
+    if stats.update(log):
+        stats.save(cache_path)
+    return stats, log
+
+
+def item_report(stats, log, min_n=30):
+    """O listă de dicționare (o întrebare per rând) cu indicatori și semnalări."""
+    from question_bank import get_question_bank
+
+    bank = get_question_bank()
+    p = stats.difficulty()
+    rpb = stats.point_biserial()
+    freq = stats.distractor_frequencies()
+    rows = []
+    for qi in np.flatnonzero(stats.n >= min_n):
+        qid = log.questions.items[qi]
+        q = bank.get(qid) or {}
+        correct_index = q.get("correct_index")
+        n_choices = len(q.get("choices", [])) or MAX_CHOICES
+        flags = []
+        if p[qi] >= TRIVIAL_P:
+            flags.append("trivială")
+        if p[qi] <= HARD_P:
+            flags.append("prea grea")
+        if not np.isnan(rpb[qi]) and rpb[qi] < MIN_DISCRIMINATION:
+            flags.append("discriminare negativă")
+        if correct_index is not None:
+            wrong = [freq[qi][j] for j in range(n_choices) if j != correct_index]
+            if wrong and max(wrong) > freq[qi][correct_index]:
+                flags.append("distractor mai ales decât cheia")
+        rows.append({
+            "question_id": qid,
+            "domain": q.get("domain", ""),
+            "n": int(stats.n[qi]),
+            "difficulty": round(float(p[qi]), 3),
+            "point_biserial": None if np.isnan(rpb[qi]) else round(float(rpb[qi]), 3),
+            "median_rt_ms": None if np.isnan(stats.median_rt[qi]) else round(float(stats.median_rt[qi])),
+            "choice_freq": [round(float(x), 3) for x in freq[qi][:n_choices]],
+            "flags": flags,
+            "question": q.get("question", "(nu mai există în bancă)"),
+        })
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analiza întrebărilor din jurnalul de răspunsuri.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    report = sub.add_parser("report", help="indicatori per întrebare + întrebări suspecte")
+    report.add_argument("--min-n", type=int, default=30, help="minimul de răspunsuri pentru o întrebare")
+    report.add_argument("--all", action="store_true", help="și întrebările fără semnalări")
+    report.add_argument("--csv", help="scrie toate rândurile într-un CSV")
+    report.add_argument("--full", action="store_true", help="ignoră cache-ul și recalculează")
+    args = parser.parse_args(argv)
+
+    stats, log = compute(full=args.full)
+    rows = item_report(stats, log, args.min_n)
+    if args.csv:
+        with open(args.csv, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else ["question_id"])
+            writer.writeheader()
+            for row in rows:
+                writer.writerow({**row, "choice_freq": " ".join(map(str, row["choice_freq"])),
+                                 "flags": "; ".join(row["flags"])})
+
+    shown = rows if args.all else [r for r in rows if r["flags"]]
+    for r in shown:
+        rpb = "-" if r["point_biserial"] is None else f"{r['point_biserial']:+.2f}"
+        print(f"{r['question_id']}  n={r['n']:<6} p={r['difficulty']:.2f}  rpb={rpb}  "
+              f"t50={r['median_rt_ms']}ms  {', '.join(r['flags']) or 'ok'}")
+        print(f"    [{r['domain']}] {r['question'][:90]}")
+    print(f"[INFO] {log.count} răspunsuri, {len(rows)} întrebări cu n >= {args.min_n}, "
+          f"{sum(1 for r in rows if r['flags'])} semnalate")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
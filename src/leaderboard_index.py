@@ -0,0 +1,205 @@
+# leaderboard_index.py
+import heapq
+import json
+import os
+import threading
+
+from data_loader import get_data_dir, load_settings
+from safe_writer import atomic_write_json, file_lock
+
+# ================================================================
+#  LEADERBOARD INDEX - clasament incremental pe (domeniu, mod)
+#  - top-K: min-heap mărginit (doar cele mai bune K sesiuni)
+#  - rang: arbore Fenwick peste scoruri (0.0 .. 100.0, pas 0.1)
+#    -> "pe ce loc e scorul X?" în O(log 1001)
+#  Fiecare sesiune actualizează cheile (d, m), (d, *), (*, m), (*, *).
+#  Fișierul persistat are mărime fixă, independentă de istoric.
+#  Mai multe procese pe același fișier: save() ia lock-ul fișierului și,
+#  dacă alt proces l-a modificat între timp, reîncarcă starea de pe disc și
+#  re-aplică doar sesiunile proprii nesalvate (fără pierderi de actualizări).
+# ================================================================
+
+BUCKETS = 1001  # 0.0 .. 100.0 cu pas 0.1
+ALL = "*"
+
+
+def _bucket(percent):
+    return min(max(int(round(float(percent or 0) * 10)), 0), BUCKETS - 1)
+
+
+def _key(domain, mode):
+    return f"{(domain or ALL).lower()}|{(mode or ALL).lower()}"
+
+
+class _Fenwick:
+    def __init__(self, tree=None):
+        self.tree = tree or [0] * (BUCKETS + 1)
+
+    def add(self, i, delta=1):
+        i += 1
+        while i <= BUCKETS:
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix(self, i):
+        """Numărul de scoruri în bucket-urile 0..i inclusiv."""
+        i += 1
+        total = 0
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+
+class LeaderboardIndex:
+    def __init__(self, path=None, k=10):
+        self.path = path or os.path.join(get_data_dir(), "leaderboard_index.json")
+        self.k = k
+        self._lock = threading.RLock()
+        self._seq = 0
+        self._keys = {}  # cheie -> {"top": heap, "tree": _Fenwick, "total": n}
+        self._unsaved = []        # sesiuni adăugate după ultimul save (re-aplicate la merge)
+        self._disk_signature = None
+        self.loaded = self._load()
+
+    # === 1. Persistență ===
+    def _signature(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _load(self):
+        self._disk_signature = self._signature()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+        self._seq = data.get("seq", 0)
+        for key, item in data.get("keys", {}).items():
+            top = [tuple(t) for t in item["top"]]
+            heapq.heapify(top)
+            self._keys[key] = {"top": top, "tree": _Fenwick(item["tree"]), "total": item["total"]}
+        return True
+
+    def save(self, merge=True):
+        """
+        Scrie indexul atomic. merge=True: dacă fișierul s-a schimbat de la ultima
+        citire / scriere (alt proces), pornește de la el + sesiunile proprii nesalvate.
+        """
+        with self._lock, file_lock(self.path):
+            if merge and self._signature() != self._disk_signature:
+                self._reload_locked()
+            data = {
+                "k": self.k,
+                "seq": self._seq,
+                "keys": {
+                    key: {"top": item["top"], "tree": item["tree"].tree, "total": item["total"]}
+                    for key, item in self._keys.items()
+                },
+            }
+            atomic_write_json(self.path, data, fsync=False)
+            self._disk_signature = self._signature()
+            self._unsaved = []
+
+    def _reload_locked(self):
+        unsaved = self._unsaved
+        self._seq, self._keys = 0, {}
+        self._load()
+        for entry in unsaved:
+            self._add_locked(entry)
+
+    def refresh(self):
+        """Recitește fișierul dacă l-a rescris alt proces (ex. quiz_server); sesiunile nesalvate rămân."""
+        with self._lock:
+            signature = self._signature()
+            if signature is not None and signature != self._disk_signature:
+                self._reload_locked()
+
+    # === 2. Actualizare ===
+    def _insert(self, key, entry, percent, seq):
+        item = self._keys.get(key)
+        if item is None:
+            item = self._keys[key] = {"top": [], "tree": _Fenwick(), "total": 0}
+        item["tree"].add(_bucket(percent))
+        item["total"] += 1
+
+        # (percent, -seq): la egalitate rămâne sesiunea mai veche
+        node = (float(percent or 0), -seq, entry)
+        if len(item["top"]) < self.k:
+            heapq.heappush(item["top"], node)
+        elif node[:2] > item["top"][0][:2]:
+            heapq.heapreplace(item["top"], node)
+
+    def _add_locked(self, entry):
+        domain = entry.get("domain", "mix")
+        mode = entry.get("mode", "")
+        self._seq += 1
+        for key in {_key(domain, mode), _key(domain, ALL), _key(ALL, mode), _key(ALL, ALL)}:
+            self._insert(key, entry, entry.get("percent", 0), self._seq)
+
+    def add(self, entry, save=True):
+        """Înregistrează o sesiune și returnează (loc, total) pentru (domeniu, mod)."""
+        with self._lock:
+            self._add_locked(entry)
+            self._unsaved.append(entry)
+            if save:
+                self.save()
+            return self._rank_locked(entry.get("percent", 0), entry.get("domain", "mix"), entry.get("mode", ""))
+
+    def rebuild(self, sessions):
+        """Reconstruiește indexul din istoricul complet."""
+        with self._lock:
+            self._seq = 0
+            self._keys = {}
+            for s in sessions:
+                self._add_locked(s)
+            self._unsaved = []
+            self.save(merge=False)
+
+    # === 3. Interogări ===
+    def top(self, domain=ALL, mode=ALL, n=5):
+        """Cele mai bune min(n, K) sesiuni, descrescător după scor."""
+        with self._lock:
+            self.refresh()
+            item = self._keys.get(_key(domain, mode))
+            if not item:
+                return []
+            return [entry for _, _, entry in heapq.nlargest(n, item["top"], key=lambda t: t[:2])]
+
+    def _rank_locked(self, percent, domain, mode):
+        item = self._keys.get(_key(domain, mode))
+        if not item:
+            return 1, 0
+        better = item["total"] - item["tree"].prefix(_bucket(percent))
+        return better + 1, item["total"]
+
+    def rank(self, percent, domain=ALL, mode=ALL):
+        """(loc, total) al unui scor: 1 + numărul de scoruri strict mai mari."""
+        with self._lock:
+            self.refresh()
+            return self._rank_locked(percent, domain, mode)
+
+
+# === 4. Instanța globală ===
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_leaderboard_index():
+    """Indexul procesului; la prima rulare este construit din istoricul existent."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                path = os.path.join(get_data_dir(), "leaderboard_index.json")
+                # sub lock-ul fișierului: un singur proces reconstruiește, celelalte îl citesc
+                with file_lock(path):
+                    index = LeaderboardIndex(path, k=load_settings().get("leaderboard_top_k", 10))
+                    if not index.loaded:
+                        from storage import get_store
+                        index.rebuild(get_store().load_sessions())
+                _index = index
+    return _index
@@ -0,0 +1,444 @@
+# metrics.py
+import argparse
+import atexit
+import functools
+import json
+import os
+import re
+import sys
+import threading
+import time
+from bisect import bisect_left
+
+from data_loader import get_data_dir, load_settings
+
+# ================================================================
+#  METRICS - contoare + histograme de latență pentru căile fierbinți
+#  - span("nume") / @timed("nume"): durata unei operații (histogramă)
+#  - inc("nume"): contor;  gauge("nume", fn): valoare citită la export
+#  - dezactivat (implicit): span() întoarce un context manager gol,
+#    inc() nu face nimic, iar @timed lasă funcția neschimbată
+#  - activat: la fiecare metrics_interval_s secunde (și la ieșire, inclusiv în
+#    procesele din pool-uri) fiecare proces scrie propriile fișiere
+#    data/metrics/metrics_<proces>_<pid>.json și fea_quiz_<proces>_<pid>.prom
+#    (format text Prometheus, etichete process / pid; metrics_dir poate fi
+#    directorul textfile al node_exporter). UI-ul, quiz_server și worker-ii
+#    batch_export pe același director nu se suprascriu unul pe altul.
+#    La ieșire procesul își șterge .prom-ul (seriile lui nu mai sunt exportate)
+#    și păstrează .json-ul pentru "show"; la pornire se șterg .prom-urile
+#    proceselor care nu mai rulează (ieșite brusc) și se păstrează doar
+#    ultimele KEEP_JSON exporturi .json.
+#
+#  settings.json: "metrics_enabled": true, "metrics_interval_s": 15, "metrics_dir": "..."
+#  FEA_METRICS=1 / 0 suprascrie "metrics_enabled"
+#
+#  python src/metrics.py show
+# ================================================================
+
+DEFAULT_INTERVAL_S = 15
+PREFIX = "fea_"
+JSON_PREFIX = "metrics_"
+PROM_PREFIX = "fea_quiz_"
+KEEP_JSON = 20
+# limitele bucket-urilor (secunde), ca în clientul Prometheus + capete pentru UI / PDF
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_NAME_RE = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def _metric_name(name):
+    return _NAME_RE.sub("_", name)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class NoopMetrics:
+    """Metricile dezactivate: fiecare apel e o singură funcție goală."""
+
+    enabled = False
+
+    def span(self, name):
+        return _NOOP_SPAN
+
+    def inc(self, name, value=1):
+        pass
+
+    def observe(self, name, seconds):
+        pass
+
+    def gauge(self, name, fn):
+        pass
+
+
+class _Span:
+    __slots__ = ("metrics", "name", "started")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.observe(self.name, time.perf_counter() - self.started)
+        if exc_type is not None:
+            self.metrics.inc(f"{self.name}_errors")
+        return False
+
+
+class Metrics:
+    enabled = True
+
+    def __init__(self, directory=None, interval=DEFAULT_INTERVAL_S):
+        self.directory = directory or os.path.join(get_data_dir(), "metrics")
+        self.interval = interval
+        self.process = _process_name()
+        self.started = time.time()
+        self.counters = {}
+        self.histograms = {}   # nume -> [numărători per bucket (+Inf la final), sumă, max]
+        self.gauges = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # === 1. Înregistrare (apelată din căile fierbinți) ===
+    def span(self, name):
+        return _Span(self, name)
+
+    def inc(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name, seconds):
+        with self._lock:
+            hist = self.histograms.get(name)
+            if hist is None:
+                hist = self.histograms[name] = [[0] * (len(BUCKETS) + 1), 0.0, 0.0]
+            hist[0][bisect_left(BUCKETS, seconds)] += 1
+            hist[1] += seconds
+            if seconds > hist[2]:
+                hist[2] = seconds
+
+    def gauge(self, name, fn):
+        """fn() e apelată doar la export (ex. dimensiunea unui cache)."""
+        with self._lock:
+            self.gauges[name] = fn
+
+    # === 2. Export ===
+    def snapshot(self):
+        with self._lock:
+            counters = dict(self.counters)
+            histograms = {name: (list(h[0]), h[1], h[2]) for name, h in self.histograms.items()}
+            gauges = dict(self.gauges)
+        values = {}
+        for name, fn in gauges.items():
+            try:
+                values[name] = float(fn())
+            except Exception:
+                continue
+        spans = {}
+        for name, (counts, total, peak) in sorted(histograms.items()):
+            n = sum(counts)
+            spans[name] = {
+                "count": n,
+                "sum_ms": round(total * 1000, 3),
+                "mean_ms": round(total * 1000 / n, 3) if n else 0.0,
+                "p50_ms": _quantile_ms(counts, 0.50, peak),
+                "p90_ms": _quantile_ms(counts, 0.90, peak),
+                "p99_ms": _quantile_ms(counts, 0.99, peak),
+                "max_ms": round(peak * 1000, 3),
+                "buckets": counts,
+            }
+        return {
+            "timestamp": time.time(),
+            "process": self.process,
+            "pid": os.getpid(),
+            "uptime_s": round(time.time() - self.started, 1),
+            "bucket_bounds_s": list(BUCKETS),
+            "counters": dict(sorted(counters.items())),
+            "gauges": dict(sorted(values.items())),
+            "spans": spans,
+        }
+
+    def prometheus_text(self, snap=None):
+        snap = snap or self.snapshot()
+        # etichetele procesului: fiecare proces e o serie separată (contoarele nu "scad")
+        instance = f'process="{snap["process"]}",pid="{snap["pid"]}"'
+        lines = []
+        for name, value in snap["counters"].items():
+            metric = f"{PREFIX}{_metric_name(name)}_total"
+            lines += [f"# TYPE {metric} counter", f"{metric}{{{instance}}} {value}"]
+        for name, value in snap["gauges"].items():
+            metric = f"{PREFIX}{_metric_name(name)}"
+            lines += [f"# TYPE {metric} gauge", f"{metric}{{{instance}}} {value}"]
+        if snap["spans"]:
+            metric = f"{PREFIX}span_seconds"
+            lines += [f"# HELP {metric} Durata operațiilor instrumentate.",
+                      f"# TYPE {metric} histogram"]
+            for name, span in snap["spans"].items():
+                label = f'{instance},span="{_metric_name(name)}"'
+                cumulative = 0
+                for bound, count in zip(BUCKETS + ("+Inf",), span["buckets"]):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{{label},le="{bound}"}} {cumulative}')
+                lines.append(f"{metric}_sum{{{label}}} {span['sum_ms'] / 1000}")
+                lines.append(f"{metric}_count{{{label}}} {span['count']}")
+        return "\n".join(lines) + "\n"
+
+    def _paths(self):
+        suffix = f"{self.process}_{os.getpid()}"
+        return (os.path.join(self.directory, f"{JSON_PREFIX}{suffix}.json"),
+                os.path.join(self.directory, f"{PROM_PREFIX}{suffix}.prom"))
+
+    def dump(self, prometheus=True):
+        """Scrie fișierele .json (+ .prom) ale procesului (atomic: fișier temporar + rename)."""
+        snap = self.snapshot()
+        os.makedirs(self.directory, exist_ok=True)
+        json_path, prom_path = self._paths()
+        files = [(json_path, json.dumps(snap, ensure_ascii=False, indent=2))]
+        if prometheus:
+            files.append((prom_path, self.prometheus_text(snap)))
+        for path, text in files:
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+
+    def _safe_dump(self):
+        try:
+            self.dump()
+        except OSError as e:
+            print(f"[WARN] Metricile nu au putut fi scrise: {e}")
+
+    def _final_dump(self):
+        """La ieșire: .json-ul final rămâne (pentru show), .prom-ul procesului dispare."""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        try:
+            self.dump(prometheus=False)
+            os.remove(self._paths()[1])
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"[WARN] Metricile nu au putut fi scrise: {e}")
+
+    def prune(self):
+        """Șterge .prom-urile proceselor oprite și exporturile .json mai vechi de ultimele KEEP_JSON."""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        stale = [n for n in names if n.startswith(PROM_PREFIX) and n.endswith(".prom")
+                 and not _pid_alive(_file_pid(n))]
+        exports = sorted((n for n in names if n.startswith(JSON_PREFIX) and n.endswith(".json")),
+                         key=lambda n: _mtime(os.path.join(self.directory, n)), reverse=True)
+        stale += [n for n in exports[KEEP_JSON:] if not _pid_alive(_file_pid(n))]
+        for name in stale:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+    def start(self):
+        """Pornește scrierea periodică (thread daemon) + o scriere finală la ieșire."""
+        if self._thread is not None:
+            return
+        self.prune()
+        self._thread = threading.Thread(target=self._run, name="metrics-dump", daemon=True)
+        self._thread.start()
+        atexit.register(self._final_dump)
+        mp = sys.modules.get("multiprocessing")
+        if mp is not None and mp.parent_process() is not None:
+            # procesele din pool-uri ies cu os._exit -> atexit nu rulează, finalizatorii da
+            from multiprocessing.util import Finalize
+            Finalize(None, self._final_dump, exitpriority=10)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._safe_dump()
+
+
+def _file_pid(name):
+    """Pid-ul din metrics_<proces>_<pid>.json / fea_quiz_<proces>_<pid>.prom (None dacă lipsește)."""
+    stem = os.path.splitext(name)[0]
+    pid = stem.rsplit("_", 1)[-1]
+    return int(pid) if pid.isdigit() else None
+
+
+def _mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0.0
+
+
+def _pid_alive(pid):
+    if pid is None:
+        return False
+    if pid == os.getpid():
+        return True
+    if os.name == "nt":
+        # os.kill(pid, 0) pe Windows ar termina procesul -> întrebăm kernel32
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)   # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        code = ctypes.c_ulong()
+        ok = kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+        kernel32.CloseHandle(handle)
+        return bool(ok) and code.value == 259               # STILL_ACTIVE
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True   # rulează, dar al altui utilizator
+    return True
+
+
+def _process_name():
+    """Numele scriptului (ui_modern, quiz_server, ...) pentru fișiere și etichete."""
+    main = sys.modules.get("__main__")
+    path = getattr(main, "__file__", None) or (sys.argv[0] if sys.argv else "")
+    name = os.path.splitext(os.path.basename(path))[0]
+    if name in ("", "-c", "__main__"):
+        name = "python"
+    return _metric_name(name)
+
+
+def _quantile_ms(counts, q, peak):
+    """Cuantila estimată din bucket-uri (interpolare liniară, ca histogram_quantile)."""
+    n = sum(counts)
+    if not n:
+        return 0.0
+    rank = q * n
+    seen = 0
+    for i, count in enumerate(counts):
+        if count and seen + count >= rank:
+            lower = BUCKETS[i - 1] if i else 0.0
+            upper = min(BUCKETS[i], peak) if i < len(BUCKETS) else peak
+            return round((lower + (upper - lower) * (rank - seen) / count) * 1000, 3)
+        seen += count
+    return round(peak * 1000, 3)
+
+
+# === 3. Instanța procesului ===
+_metrics = None
+_metrics_lock = threading.Lock()
+
+
+def _enabled(settings):
+    env = os.environ.get("FEA_METRICS")
+    if env is not None:
+        return env.strip().lower() not in ("", "0", "false", "no")
+    return bool(settings.get("metrics_enabled", False))
+
+
+def get_metrics():
+    """Metrics (activ, cu scriere periodică) sau NoopMetrics, decis la primul apel."""
+    global _metrics
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                settings = load_settings()
+                if _enabled(settings):
+                    metrics = Metrics(settings.get("metrics_dir"),
+                                      float(settings.get("metrics_interval_s", DEFAULT_INTERVAL_S)))
+                    metrics.start()
+                    _metrics = metrics
+                else:
+                    _metrics = NoopMetrics()
+    return _metrics
+
+
+def span(name):
+    return get_metrics().span(name)
+
+
+def inc(name, value=1):
+    get_metrics().inc(name, value)
+
+
+def gauge(name, fn):
+    get_metrics().gauge(name, fn)
+
+
+def timed(name):
+    """
+    Decorator: span pe toată funcția. Metricile sunt alese la primul apel, nu la
+    import (importul nu citește settings și nu pornește thread-ul de scriere);
+    dezactivate, costul e o verificare per apel.
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            metrics = _metrics or get_metrics()
+            if not metrics.enabled:
+                return fn(*args, **kwargs)
+            with metrics.span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _print_snapshot(snap):
+    age = time.time() - snap["timestamp"]
+    print(f"{snap.get('process', '?')} pid {snap['pid']}, uptime {snap['uptime_s']} s, export acum {age:.0f} s")
+    print(f"{'span':28} {'count':>8} {'mean':>9} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}  (ms)")
+    for name, s in snap["spans"].items():
+        print(f"{name:28} {s['count']:>8} {s['mean_ms']:>9.2f} {s['p50_ms']:>9.2f} "
+              f"{s['p90_ms']:>9.2f} {s['p99_ms']:>9.2f} {s['max_ms']:>9.2f}")
+    for name, value in {**snap["counters"], **snap["gauges"]}.items():
+        print(f"{name:28} {value}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Afișează ultimele exporturi de metrici (câte unul per proces).")
+    sub = parser.add_subparsers(dest="command", required=True)
+    show = sub.add_parser("show", help="tabel din metrics_<proces>_<pid>.json")
+    show.add_argument("--dir", help="directorul metricilor (implicit metrics_dir / data/metrics)")
+    show.add_argument("--pid", type=int, help="doar procesul cu acest pid")
+    show.add_argument("--last", type=int, default=5, help="câte procese (cele mai recente exporturi)")
+    args = parser.parse_args(argv)
+
+    directory = args.dir or load_settings().get("metrics_dir") or os.path.join(get_data_dir(), "metrics")
+    try:
+        names = [n for n in os.listdir(directory) if n.startswith(JSON_PREFIX) and n.endswith(".json")]
+    except OSError:
+        names = []
+    snaps = []
+    for file_name in names:
+        try:
+            with open(os.path.join(directory, file_name), "r", encoding="utf-8") as f:
+                snaps.append(json.load(f))
+        except (OSError, json.JSONDecodeError):
+            continue
+    if args.pid is not None:
+        snaps = [snap for snap in snaps if snap.get("pid") == args.pid]
+    if not snaps:
+        print(f"[WARN] Nu există un export de metrici în {directory}")
+        return 1
+    snaps.sort(key=lambda snap: snap["timestamp"], reverse=True)
+    for i, snap in enumerate(snaps[:args.last]):
+        if i:
+            print()
+        _print_snapshot(snap)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,129 +1,218 @@
-# pdf_exporter_modern.py — versiunea 5.1 FINAL (ReportLab + bar chart)
+# pdf_exporter_modern.py — versiunea 5.2 (ReportLab + bar chart + export în fundal)
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.lib.units import cm
-from reportlab.pdfgen import canvas
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
 from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.enums import TA_LEFT, TA_CENTER
+from reportlab.lib.fonts import addMapping
+from concurrent.futures import ThreadPoolExecutor
 import os
-
-def export_pdf_modern(result, answers=None):
-    """Generează raport PDF complet, cu diagramă de scor"""
-    os.makedirs("data", exist_ok=True)
-    output_path = os.path.join("data", "last_session_report.pdf")
-
-    doc = SimpleDocTemplate(
-        output_path,
-        pagesize=A4,
-        rightMargin=2 * cm,
-        leftMargin=2 * cm,
-        topMargin=2 * cm,
-        bottomMargin=2 * cm
-    )
-
-    story = []
-
-    # === Stiluri ===
-    title_style = ParagraphStyle(
-        name="Title",
-        fontName="Helvetica-Bold",
-        fontSize=18,
-        alignment=TA_CENTER,
-        textColor=colors.HexColor("#0066cc")
-    )
-
-    subtitle_style = ParagraphStyle(
-        name="Subtitle",
-        fontName="Helvetica-Bold",
-        fontSize=14,
-        spaceBefore=12,
-        textColor=colors.HexColor("#009999")
-    )
-
-    normal_style = ParagraphStyle(
-        name="Normal",
-        fontName="Helvetica",
-        fontSize=11,
-        alignment=TA_LEFT,
-        leading=15
-    )
-
-    # === Titlu ===
-    story.append(Paragraph("FEA Quiz Trainer - Raport sesiune", title_style))
-    story.append(Spacer(1, 20))
-
-    # === Rezumat ===
-    story.append(Paragraph(f"<b>Mod:</b> {result['mode'].capitalize()}", normal_style))
-    story.append(Paragraph(f"<b>Domeniu:</b> {result['domain']}", normal_style))
-    story.append(Paragraph(f"<b>Scor:</b> {result['score']} / {result['total']} ({result['percent']}%)", normal_style))
-    story.append(Paragraph(f"<b>Corecte:</b> {result['correct']} | <b>Greșite:</b> {result['incorrect']}", normal_style))
-    story.append(Paragraph(f"<b>Timp folosit:</b> {result['time_used']} secunde", normal_style))
-    story.append(Paragraph(f"<b>Data:</b> {result['date']}", normal_style))
-    story.append(Spacer(1, 25))
-
-    # === Inserăm grafic (bar chart) ===
-    def draw_chart(canv, width, height):
-        canv.saveState()
-
-        total = result['total']
-        correct = result['correct']
-        incorrect = result['incorrect']
-        if total == 0:
-            total = 1
-
-        correct_ratio = correct / total
-        incorrect_ratio = incorrect / total
-
-        x_start = 4 * cm
-        y_start = height - 6 * cm
-        bar_width = 10 * cm
-        bar_height = 1 * cm
-
-        # Fundal
-        canv.setFillColor(colors.grey)
-        canv.rect(x_start, y_start, bar_width, bar_height, fill=True, stroke=0)
-
-        # Corecte (verde)
-        canv.setFillColor(colors.green)
-        canv.rect(x_start, y_start, bar_width * correct_ratio, bar_height, fill=True, stroke=0)
-
-        # Greșite (roșu)
-        canv.setFillColor(colors.red)
-        canv.rect(x_start + bar_width * correct_ratio, y_start, bar_width * incorrect_ratio, bar_height, fill=True, stroke=0)
-
-        # Text
-        canv.setFont("Helvetica-Bold", 12)
-        canv.setFillColor(colors.black)
-        canv.drawCentredString(x_start + bar_width / 2, y_start - 10, f"Corecte: {correct}  |  Greșite: {incorrect}")
-        canv.restoreState()
-
-    # Salvăm funcția pentru pagină
-    def on_first_page(canv, doc):
-        draw_chart(canv, A4[0], A4[1])
-
-    # === Detalii întrebări (pentru Train Mode) ===
-    if answers:
-        story.append(Spacer(1, 100))
-        story.append(Paragraph("📘 <b>Detalii întrebări (Train Mode):</b>", subtitle_style))
-        story.append(Spacer(1, 12))
-
-        for i, ans in enumerate(answers, 1):
-            q = ans.get("question", "Întrebare lipsă")
-            correct = ans.get("correct", "-")
-            selected = ans.get("selected", "-")
-            expl = ans.get("explanation", "-")
-
-            story.append(Paragraph(f"<b>{i}. {q}</b>", normal_style))
-            story.append(Paragraph(f"✔ <b>Corect:</b> {correct}", normal_style))
-            story.append(Paragraph(f"✖ <b>Răspuns:</b> {selected}", normal_style))
-            story.append(Paragraph(f"💡 <b>Explicație:</b> {expl}", normal_style))
-            story.append(Spacer(1, 10))
-
-    try:
-        doc.build(story, onFirstPage=on_first_page)
-        print(f"[INFO] Raport PDF generat cu succes: {output_path}")
-        return output_path
-    except Exception as e:
-        print("[EROARE PDF]", e)
-        return None
+import threading
+
+from metrics import timed
+
+FONT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "DejaVuSans.ttf")
+BOLD_FONT_PATH = os.path.join(os.path.dirname(FONT_PATH), "DejaVuSans-Bold.ttf")
+DEFAULT_OUTPUT = os.path.join("data", "last_session_report.pdf")
+
+
+class ReportRenderer:
+    """
+    Generează rapoartele PDF.
+    Fonturile (DejaVuSans pentru diacritice) și stilurile se creează o singură
+    dată, la construcție, și sunt refolosite la fiecare export.
+    """
+
+    def __init__(self, font_path=FONT_PATH, bold_font_path=BOLD_FONT_PATH):
+        self.font, self.font_bold = self._register_fonts(font_path, bold_font_path)
+
+        # === Stiluri ===
+        self.title_style = ParagraphStyle(
+            name="Title",
+            fontName=self.font_bold,
+            fontSize=18,
+            alignment=TA_CENTER,
+            textColor=colors.HexColor("#0066cc")
+        )
+
+        self.subtitle_style = ParagraphStyle(
+            name="Subtitle",
+            fontName=self.font_bold,
+            fontSize=14,
+            spaceBefore=12,
+            textColor=colors.HexColor("#009999")
+        )
+
+        self.normal_style = ParagraphStyle(
+            name="Normal",
+            fontName=self.font,
+            fontSize=11,
+            alignment=TA_LEFT,
+            leading=15
+        )
+
+    @staticmethod
+    def _register_fonts(font_path, bold_font_path):
+        """
+        Înregistrează DejaVuSans + DejaVuSans-Bold (o singură dată per proces).
+        Fără varianta bold, titlurile și <b> folosesc Helvetica-Bold;
+        fără DejaVuSans, totul rămâne pe Helvetica.
+        """
+        registered = pdfmetrics.getRegisteredFontNames()
+        if "DejaVuSans" not in registered:
+            try:
+                pdfmetrics.registerFont(TTFont("DejaVuSans", font_path))
+            except Exception as e:
+                print(f"[WARN] Nu pot înregistra fontul {font_path}: {e}")
+                return "Helvetica", "Helvetica-Bold"
+        if "DejaVuSans-Bold" in registered:
+            bold = "DejaVuSans-Bold"
+        else:
+            try:
+                pdfmetrics.registerFont(TTFont("DejaVuSans-Bold", bold_font_path))
+                bold = "DejaVuSans-Bold"
+            except Exception as e:
+                print(f"[WARN] Nu pot înregistra fontul {bold_font_path}: {e} (bold -> Helvetica-Bold)")
+                bold = "Helvetica-Bold"
+        # <b> în Paragraph caută varianta bold a familiei; italic nu avem -> fața dreaptă
+        for italic in (0, 1):
+            addMapping("DejaVuSans", 0, italic, "DejaVuSans")
+            addMapping("DejaVuSans", 1, italic, bold)
+        return "DejaVuSans", bold
+
+    def render(self, result, answers=None, output_path=None):
+        """Generează raport PDF complet, cu diagramă de scor. Returnează calea sau None."""
+        output_path = output_path or DEFAULT_OUTPUT
+        out_dir = os.path.dirname(output_path)
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+
+        doc = SimpleDocTemplate(
+            output_path,
+            pagesize=A4,
+            rightMargin=2 * cm,
+            leftMargin=2 * cm,
+            topMargin=2 * cm,
+            bottomMargin=2 * cm
+        )
+
+        story = []
+        normal_style = self.normal_style
+        font_bold = self.font_bold
+
+        # === Titlu ===
+        story.append(Paragraph("FEA Quiz Trainer - Raport sesiune", self.title_style))
+        story.append(Spacer(1, 20))
+
+        # === Rezumat ===
+        story.append(Paragraph(f"<b>Mod:</b> {result['mode'].capitalize()}", normal_style))
+        story.append(Paragraph(f"<b>Domeniu:</b> {result['domain']}", normal_style))
+        story.append(Paragraph(f"<b>Scor:</b> {result['score']} / {result['total']} ({result['percent']}%)", normal_style))
+        story.append(Paragraph(f"<b>Corecte:</b> {result['correct']} | <b>Greșite:</b> {result['incorrect']}", normal_style))
+        story.append(Paragraph(f"<b>Timp folosit:</b> {result['time_used']} secunde", normal_style))
+        story.append(Paragraph(f"<b>Data:</b> {result['date']}", normal_style))
+        story.append(Spacer(1, 25))
+
+        # === Inserăm grafic (bar chart) ===
+        def draw_chart(canv, width, height):
+            canv.saveState()
+
+            total = result['total']
+            correct = result['correct']
+            incorrect = result['incorrect']
+            if total == 0:
+                total = 1
+
+            correct_ratio = correct / total
+            incorrect_ratio = incorrect / total
+
+            x_start = 4 * cm
+            y_start = height - 6 * cm
+            bar_width = 10 * cm
+            bar_height = 1 * cm
+
+            # Fundal
+            canv.setFillColor(colors.grey)
+            canv.rect(x_start, y_start, bar_width, bar_height, fill=True, stroke=0)
+
+            # Corecte (verde)
+            canv.setFillColor(colors.green)
+            canv.rect(x_start, y_start, bar_width * correct_ratio, bar_height, fill=True, stroke=0)
+
+            # Greșite (roșu)
+            canv.setFillColor(colors.red)
+            canv.rect(x_start + bar_width * correct_ratio, y_start, bar_width * incorrect_ratio, bar_height, fill=True, stroke=0)
+
+            # Text
+            canv.setFont(font_bold, 12)
+            canv.setFillColor(colors.black)
+            canv.drawCentredString(x_start + bar_width / 2, y_start - 10, f"Corecte: {correct}  |  Greșite: {incorrect}")
+            canv.restoreState()
+
+        # Salvăm funcția pentru pagină
+        def on_first_page(canv, doc):
+            draw_chart(canv, A4[0], A4[1])
+
+        # === Detalii întrebări (pentru Train Mode) ===
+        if answers:
+            story.append(Spacer(1, 100))
+            story.append(Paragraph("📘 <b>Detalii întrebări (Train Mode):</b>", self.subtitle_style))
+            story.append(Spacer(1, 12))
+
+            for i, ans in enumerate(answers, 1):
+                q = ans.get("question", "Întrebare lipsă")
+                correct = ans.get("correct", "-")
+                selected = ans.get("selected", "-")
+                expl = ans.get("explanation", "-")
+
+                story.append(Paragraph(f"<b>{i}. {q}</b>", normal_style))
+                story.append(Paragraph(f"✔ <b>Corect:</b> {correct}", normal_style))
+                story.append(Paragraph(f"✖ <b>Răspuns:</b> {selected}", normal_style))
+                story.append(Paragraph(f"💡 <b>Explicație:</b> {expl}", normal_style))
+                story.append(Spacer(1, 10))
+
+        try:
+            doc.build(story, onFirstPage=on_first_page)
+            print(f"[INFO] Raport PDF generat cu succes: {output_path}")
+            return output_path
+        except Exception as e:
+            print("[EROARE PDF]", e)
+            return None
+
+
+# === Renderer partajat + worker de fundal ===
+_renderer = None
+_renderer_lock = threading.Lock()
+_executor = None
+
+
+def get_renderer():
+    global _renderer
+    if _renderer is None:
+        with _renderer_lock:
+            if _renderer is None:
+                _renderer = ReportRenderer()
+    return _renderer
+
+
+@timed("export_pdf_modern")
+def export_pdf_modern(result, answers=None, output_path=None):
+    """Generează raport PDF complet, cu diagramă de scor (sincron)."""
+    return get_renderer().render(result, answers, output_path)
+
+
+def export_pdf_async(result, answers=None, output_path=None):
+    """
+    Trimite exportul către worker-ul de fundal și întoarce un Future
+    (rezultatul = calea PDF-ului sau None). Un singur worker -> exporturile
+    se execută în ordine și nu scriu simultan același fișier.
+    """
+    global _executor
+    with _renderer_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf-export")
+    answers = list(answers) if answers else None
+    return _executor.submit(export_pdf_modern, dict(result), answers, output_path)
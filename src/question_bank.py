@@ -0,0 +1,165 @@
+# question_bank.py
+import hashlib
+import json
+import os
+import random
+import threading
+from bisect import bisect_left
+
+from bank_compiler import CompiledBank, default_artifact_path
+from data_loader import get_data_dir
+from metrics import timed
+
+# ================================================================
+#  QUESTION BANK - banca de întrebări partajată în tot procesul
+#  (parsare o singură dată + indexuri pe domeniu + reîncărcare la mtime)
+# ================================================================
+
+
+def question_id(q):
+    """
+    Identificator stabil pentru o întrebare.
+    Folosește câmpul "id" dacă există, altfel un hash scurt din domeniu + text.
+    """
+    qid = q.get("id")
+    if qid is not None:
+        return str(qid)
+    key = f"{q.get('domain', '')}|{q.get('question', '')}".encode("utf-8")
+    return hashlib.sha1(key).hexdigest()[:12]
+
+
+class QuestionBank:
+    """
+    Păstrează întrebările parsate o singură dată (din JSON sau din artefactul
+    compilat fea_questions.bin, decodat leneș), plus:
+    - by_domain: domeniu -> lista de indici în self.questions
+    - by_id: id întrebare -> index în self.questions
+    Fișierul este re-parsat doar dacă se schimbă mtime/size.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(get_data_dir(), "fea_questions.json")
+        self.artifact_path = default_artifact_path(self.path)
+        self.questions = []
+        self.by_domain = {}
+        self.by_id = {}
+        self._signature = None
+        self._lock = threading.Lock()
+
+    # === 1. Reîncărcare condiționată ===
+    def _stat_signature(self):
+        signature = []
+        for path in (self.path, self.artifact_path):
+            try:
+                st = os.stat(path)
+                signature.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature) if any(signature) else None
+
+    def refresh(self):
+        """Re-parsează fișierul doar dacă s-a schimbat pe disc. Returnează self."""
+        signature = self._stat_signature()
+        if signature == self._signature:
+            return self
+        with self._lock:
+            if signature != self._signature:
+                self._load(signature)
+        return self
+
+    @timed("question_bank_load")
+    def _load(self, signature):
+        previous = self.questions
+        try:
+            self._load_questions(signature)
+        finally:
+            # artefactul vechi nu mai ține fișierul mapat (recompilarea îl poate șterge)
+            if isinstance(previous, CompiledBank) and previous is not self.questions:
+                previous.close()
+
+    def _load_questions(self, signature):
+        # artefactul compilat (bank_compiler.py) are prioritate dacă e la zi
+        compiled = CompiledBank.open(self.artifact_path)
+        if compiled is not None:
+            self.questions, self.by_domain, self.by_id = (
+                compiled, compiled.domain_ranges(), compiled.id_index())
+            self._signature = signature
+            return
+
+        questions = []
+        if signature is not None and signature[0] is not None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                print("[WARN] Nu s-au putut încărca întrebările.")
+                data = []
+
+            if isinstance(data, dict):
+                for domain, qlist in data.items():
+                    for q in qlist:
+                        q["domain"] = domain
+                        questions.append(q)
+            elif isinstance(data, list):
+                questions = data
+        self._set_questions(questions)
+        self._signature = signature
+
+    def _set_questions(self, questions):
+        by_domain = {}
+        by_id = {}
+        for i, q in enumerate(questions):
+            by_domain.setdefault(q.get("domain", "").lower(), []).append(i)
+            by_id[question_id(q)] = i
+        # atribuire la final -> cititorii văd fie starea veche, fie cea nouă
+        self.questions, self.by_domain, self.by_id = questions, by_domain, by_id
+
+    # === 2. Interogări ===
+    def __len__(self):
+        return len(self.questions)
+
+    def domains(self):
+        return sorted(self.by_domain)
+
+    def indices(self, domain="mix"):
+        """Indicii întrebărilor dintr-un domeniu ("mix" = toate), fără copiere."""
+        if not domain or domain.lower() == "mix":
+            return range(len(self.questions))
+        return self.by_domain.get(domain.lower(), [])
+
+    def position(self, domain, index):
+        """Poziția indexului global `index` în indices(domain), sau None (O(log n))."""
+        population = self.indices(domain)
+        if isinstance(population, range):
+            pos = index - population.start
+            return pos if 0 <= pos < len(population) else None
+        pos = bisect_left(population, index)
+        return pos if pos < len(population) and population[pos] == index else None
+
+    def get(self, qid, default=None):
+        idx = self.by_id.get(str(qid))
+        return default if idx is None else self.questions[idx]
+
+    def sample_indices(self, domain="mix", count=10, rng=None):
+        """Alege `count` indici distincți din domeniu în O(count)."""
+        population = self.indices(domain)
+        rng = rng or random
+        return rng.sample(population, min(count, len(population)))
+
+    def sample(self, domain="mix", count=10, rng=None):
+        return [self.questions[i] for i in self.sample_indices(domain, count, rng)]
+
+
+# === 3. Instanța globală (una per proces) ===
+_bank = None
+_bank_lock = threading.Lock()
+
+
+def get_question_bank():
+    """Returnează banca de întrebări a procesului, reîncărcată dacă fișierul s-a schimbat."""
+    global _bank
+    if _bank is None:
+        with _bank_lock:
+            if _bank is None:
+                _bank = QuestionBank()
+    return _bank.refresh()
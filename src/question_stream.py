@@ -0,0 +1,272 @@
+# question_stream.py
+import argparse
+import json
+import os
+import random
+import sys
+
+from data_loader import get_data_dir, load_settings
+
+# ================================================================
+#  QUESTION STREAM - citire incrementală a băncilor foarte mari
+#  Parcurge întrebările direct de pe disc, fără listă completă în
+#  memorie. Formate acceptate:
+#   - listă JSON:        [ {...}, {...} ]
+#   - dicționar JSON:    {"structural": [ {...} ], "cfd": [ ... ]}
+#   - JSONL / NDJSON:    câte un obiect pe linie
+#  Eșantionarea (reservoir sampling) face o singură trecere și ține
+#  în memorie doar cele k întrebări alese (+ bufferul de citire).
+#
+#  python src/question_stream.py sample --domain cfd --count 10
+#  python src/question_stream.py count
+# ================================================================
+
+CHUNK_SIZE = 1 << 20            # caractere citite odată
+DEFAULT_STREAM_THRESHOLD_MB = 256
+JSONL_EXTENSIONS = (".jsonl", ".ndjson")
+
+_decoder = json.JSONDecoder()
+_WS = " \t\r\n"
+
+
+# === 1. Cititor incremental ===
+class _Reader:
+    def __init__(self, f, chunk_size=CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        if self.pos:
+            # porțiunea consumată se aruncă -> bufferul rămâne de ordinul unui element
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        self.buf += chunk
+        return True
+
+    def peek(self):
+        """Primul caracter non-spațiu (fără a-l consuma), sau "" la final."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WS:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"JSON invalid: aștept '{char}' la poziția {self.pos}")
+        self.pos += 1
+
+    def value(self):
+        """Decodează următoarea valoare JSON, citind în plus cât e nevoie."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            if end == len(self.buf) and self._fill():
+                # un număr / literal tăiat la marginea bufferului -> îl decodăm din nou complet
+                continue
+            self.pos = end
+            return value
+
+
+def _iter_array(reader, domain=None):
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.pos += 1
+        return
+    while True:
+        item = reader.value()
+        if isinstance(item, dict):
+            if domain is not None:
+                item["domain"] = domain
+            yield item
+        sep = reader.peek()
+        reader.pos += 1
+        if sep == "]":
+            return
+        if sep != ",":
+            raise ValueError(f"JSON invalid: aștept ',' sau ']' la poziția {reader.pos - 1}")
+
+
+def _iter_domains(reader):
+    """Formatul {"domeniu": [întrebări]} - câte o listă per domeniu, tot în flux."""
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.pos += 1
+        return
+    while True:
+        domain = reader.value()
+        reader.expect(":")
+        if reader.peek() == "[":
+            yield from _iter_array(reader, domain)
+        else:
+            reader.value()  # valoare neașteptată -> ignorată
+        sep = reader.peek()
+        reader.pos += 1
+        if sep == "}":
+            return
+        if sep != ",":
+            raise ValueError(f"JSON invalid: aștept ',' sau '}}' la poziția {reader.pos - 1}")
+
+
+def _iter_jsonl(f):
+    for line_no, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError:
+            print(f"[WARN] Linie JSONL invalidă ignorată ({line_no})")
+            continue
+        if isinstance(item, dict):
+            yield item
+
+
+def _looks_like_jsonl(path):
+    if path.lower().endswith(JSONL_EXTENSIONS):
+        return True
+    with open(path, "r", encoding="utf-8") as f:
+        first = f.readline(CHUNK_SIZE).strip()  # limitat: o bancă minificată poate fi o singură linie
+    # un obiect complet pe prima linie, cu câmpurile unei întrebări
+    try:
+        item = json.loads(first)
+    except json.JSONDecodeError:
+        return False
+    return isinstance(item, dict) and "question" in item
+
+
+def iter_questions(path, chunk_size=CHUNK_SIZE):
+    """Generator peste întrebările din `path`, citite incremental."""
+    if _looks_like_jsonl(path):
+        with open(path, "r", encoding="utf-8") as f:
+            yield from _iter_jsonl(f)
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        reader = _Reader(f, chunk_size)
+        first = reader.peek()
+        if first == "[":
+            yield from _iter_array(reader)
+        elif first == "{":
+            yield from _iter_domains(reader)
+        elif first:
+            raise ValueError(f"Format de bancă necunoscut: {path}")
+
+
+# === 2. Reservoir sampling ===
+def _matches(q, domain):
+    return not domain or domain.lower() == "mix" or q.get("domain", "").lower() == domain.lower()
+
+
+def sample_questions(path, domain="mix", count=10, rng=None):
+    """`count` întrebări uniform aleatorii din domeniu, într-o singură trecere (memorie O(count))."""
+    rng = rng or random
+    reservoir = []
+    seen = 0
+    for q in iter_questions(path):
+        if not _matches(q, domain):
+            continue
+        seen += 1
+        if len(reservoir) < count:
+            reservoir.append(q)
+        else:
+            j = rng.randrange(seen)
+            if j < count:
+                reservoir[j] = q
+    rng.shuffle(reservoir)  # ordinea din rezervor urmează ordinea din fișier
+    return reservoir
+
+
+def sample_by_domain(path, count=10, rng=None):
+    """Câte un eșantion de `count` pentru fiecare domeniu, tot într-o singură trecere."""
+    rng = rng or random
+    reservoirs = {}
+    seen = {}
+    for q in iter_questions(path):
+        domain = q.get("domain", "").lower()
+        reservoir = reservoirs.setdefault(domain, [])
+        seen[domain] = seen.get(domain, 0) + 1
+        if len(reservoir) < count:
+            reservoir.append(q)
+        else:
+            j = rng.randrange(seen[domain])
+            if j < count:
+                reservoir[j] = q
+    for reservoir in reservoirs.values():
+        rng.shuffle(reservoir)
+    return reservoirs
+
+
+def count_by_domain(path):
+    counts = {}
+    for q in iter_questions(path):
+        domain = q.get("domain", "").lower()
+        counts[domain] = counts.get(domain, 0) + 1
+    return counts
+
+
+# === 3. Când folosim fluxul în locul băncii din memorie ===
+def streaming_bank_path():
+    """
+    Calea băncii de citit în flux, sau None dacă banca normală (QuestionBank) e potrivită:
+    - data/fea_questions.jsonl, dacă nu există fea_questions.json;
+    - fea_questions.json peste pragul "stream_threshold_mb" din setări,
+      fără artefact compilat (fea_questions.bin e deja citit leneș).
+    """
+    data_dir = get_data_dir()
+    json_path = os.path.join(data_dir, "fea_questions.json")
+    jsonl_path = os.path.join(data_dir, "fea_questions.jsonl")
+    if not os.path.exists(json_path):
+        return jsonl_path if os.path.exists(jsonl_path) else None
+
+    threshold_mb = load_settings().get("stream_threshold_mb", DEFAULT_STREAM_THRESHOLD_MB)
+    if os.path.getsize(json_path) < threshold_mb * 1024 * 1024:
+        return None
+    from bank_compiler import default_artifact_path
+    if os.path.exists(default_artifact_path(json_path)):
+        return None
+    return json_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Citire în flux a băncilor de întrebări foarte mari.")
+    parser.add_argument("--path", help="banca (implicit data/fea_questions.json sau .jsonl)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sample = sub.add_parser("sample", help="eșantion aleator într-o singură trecere")
+    sample.add_argument("--domain", default="mix")
+    sample.add_argument("--count", type=int, default=10)
+    sample.add_argument("--seed", type=int)
+    sub.add_parser("count", help="numărul de întrebări per domeniu")
+    args = parser.parse_args(argv)
+
+    path = args.path or streaming_bank_path() or os.path.join(get_data_dir(), "fea_questions.json")
+    if args.command == "count":
+        counts = count_by_domain(path)
+        for domain, n in sorted(counts.items()):
+            print(f"{domain or '-':<16} {n}")
+        print(f"[INFO] {sum(counts.values())} întrebări în {path}")
+        return 0
+
+    rng = random.Random(args.seed) if args.seed is not None else None
+    for q in sample_questions(path, args.domain, args.count, rng):
+        print(json.dumps(q, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
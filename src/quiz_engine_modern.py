@@ -1,6 +1,15 @@
 # quiz_engine_modern.py
 import random
 import datetime
+import time
+from array import array
+
+from metrics import inc, timed
+from question_bank import QuestionBank
+
+TOPIC_POOL = 100  # câte rezultate de căutare intră în selecția pe subiect
+UNANSWERED = 255  # valoare în `selected` pentru întrebările fără răspuns
+MAX_TIMING_MS = 0xFFFFFFFF
 
 class QuizManagerModern:
     """
@@ -8,38 +17,112 @@ class QuizManagerModern:
     - selecția întrebărilor
     - scorul
     - istoricul răspunsurilor (pt feedback și PDF)
+
+    Starea sesiunii e compactă (mii de sesiuni live într-un proces, ex. quiz_server):
+    indicii întrebărilor în banca partajată, varianta aleasă (1 byte) și timpul
+    de răspuns (ms, u32) per întrebare. Dicționarele de întrebare și înregistrările
+    pentru review / PDF se reconstruiesc doar la cerere.
     """
 
-    def __init__(self, data, domain="mix", num_questions=10):
-        # filtrează pe domeniu dacă nu e "mix"
-        if domain != "mix":
-            data = [q for q in data if q.get("domain", "").lower() == domain.lower()]
+    __slots__ = ("_source", "_indices", "_selected", "_timings", "_shown_at",
+                 "current_index", "score", "sampler", "cat")
 
-        # alege random întrebările
-        self.questions = random.sample(data, min(num_questions, len(data)))
+    @timed("quiz_manager_init")
+    def __init__(self, data, domain="mix", num_questions=10, rng=None,
+                 selection="uniform", user=None, topic=None):
+        """
+        data      = QuestionBank (selecție din indexul domeniului, O(num_questions))
+                    sau o listă simplă de întrebări (filtrare liniară, ca înainte)
+        rng       = random.Random opțional (selecție reproductibilă, ex. simulări)
+        selection = "uniform", "adaptive" (ponderi spaced repetition per
+                    utilizator, doar cu QuestionBank - vezi adaptive_sampler.py)
+                    sau "irt" (examen adaptiv: fiecare întrebare e aleasă după
+                    răspunsul anterior, num_questions e doar limita - vezi irt.py)
+        topic     = text liber ("practică întrebări despre X"): selecția se face
+                    din cele mai relevante TOPIC_POOL rezultate ale indexului de căutare
+        """
+        rng = rng or random
+        self.sampler = None
+        self.cat = None
+        if isinstance(data, QuestionBank) and topic and topic.strip():
+            from search_index import search_question_indices
+            pool = search_question_indices(topic, domain, max(TOPIC_POOL, num_questions), data)
+            indices = rng.sample(pool, min(num_questions, len(pool)))
+        elif isinstance(data, QuestionBank) and selection == "adaptive":
+            from adaptive_sampler import AdaptiveSampler, get_profile
+            self.sampler = AdaptiveSampler(data, domain, get_profile(user or "Guest"))
+            indices = self.sampler.sample_indices(num_questions, rng)
+        elif isinstance(data, QuestionBank) and selection == "irt" and self._start_cat(
+                data, domain, num_questions, rng):
+            indices = [self.cat.next_index()]
+        elif isinstance(data, QuestionBank):
+            indices = data.sample_indices(domain, num_questions, rng)
+        else:
+            # filtrează pe domeniu dacă nu e "mix"
+            population = range(len(data))
+            if domain != "mix":
+                population = [i for i, q in enumerate(data) if q.get("domain", "").lower() == domain.lower()]
+
+            # alege random întrebările
+            indices = rng.sample(population, min(num_questions, len(population)))
 
+        # referință la lista partajată (bancă sau lista primită), fără copii
+        self._source = data.questions if isinstance(data, QuestionBank) else data
+        self._indices = array("I", indices)
+        self._selected = bytearray([UNANSWERED]) * len(indices)
+        self._timings = array("I", bytes(4 * len(indices)))
+        self._shown_at = time.monotonic()
         self.current_index = 0
         self.score = 0
-        self.user_answers = []  # pentru feedback final + PDF
+
+    def _start_cat(self, bank, domain, num_questions, rng):
+        from irt import AdaptiveTest, get_item_index
+        index = get_item_index(bank, domain)
+        if index is None or not num_questions:
+            print("[WARN] Nu există parametri IRT calibrați; selecție aleatorie.")
+            return False
+        self.cat = AdaptiveTest(index, num_questions, rng=rng)
+        return True
+
+    # === Acces la întrebări (reconstruite din bancă la cerere) ===
+    def question_at(self, i):
+        return self._source[self._indices[i]]
+
+    @property
+    def questions(self):
+        return [self._source[i] for i in self._indices]
 
     def get_current_question(self):
-        if self.current_index < len(self.questions):
-            return self.questions[self.current_index]
+        if self.current_index < len(self._indices):
+            return self.question_at(self.current_index)
         return None
 
     def total_questions(self):
-        return len(self.questions)
+        """Întrebările sesiunii (în examenul adaptiv: cele alese până acum)."""
+        return len(self._indices)
+
+    def planned_questions(self):
+        """Numărul afișat în progres: în examenul adaptiv, limita maximă."""
+        return self.cat.max_questions if self.cat is not None else len(self._indices)
 
     def advance(self):
         self.current_index += 1
-        return self.current_index < len(self.questions)
+        self._shown_at = time.monotonic()
+        if self.cat is not None and self.current_index == len(self._indices):
+            nxt = self.cat.next_index()  # None = precizia țintă atinsă / limită
+            if nxt is not None:
+                self._indices.append(nxt)
+                self._selected.append(UNANSWERED)
+                self._timings.append(0)
+        return self.current_index < len(self._indices)
 
-    def check_answer(self, idx):
+    def check_answer(self, idx, elapsed_ms=None):
         """
         idx = indexul opțiunii alese de user în lista de choices
+        elapsed_ms = timpul de răspuns (implicit: de la afișarea întrebării)
         returnează (is_correct, correct_text, explanation)
         """
-        q = self.questions[self.current_index]
+        q = self.question_at(self.current_index)
 
         # structura întrebare:
         # {
@@ -57,23 +140,53 @@ class QuizManagerModern:
 
         if is_correct:
             self.score += 1
+        inc("answers_correct" if is_correct else "answers_wrong")
+        if self.sampler is not None:
+            self.sampler.record(q, is_correct)
+        if self.cat is not None:
+            self.cat.record(self._indices[self.current_index], is_correct)
 
-        # salvăm pentru feedback final
-        self.user_answers.append({
-            "question": q["question"],
-            "selected": selected_text,
-            "correct": correct_text,
-            "explanation": explanation
-        })
+        # salvăm doar varianta aleasă + timpul; textele se refac în user_answers
+        if elapsed_ms is None:
+            elapsed_ms = (time.monotonic() - self._shown_at) * 1000
+        self._selected[self.current_index] = idx
+        self._timings[self.current_index] = min(int(elapsed_ms), MAX_TIMING_MS)
 
         return is_correct, correct_text, explanation
 
+    # === Istoric răspunsuri (pentru feedback final + PDF) ===
+    def selected_index(self, i):
+        value = self._selected[i]
+        return None if value == UNANSWERED else value
+
+    def answer_time_ms(self, i):
+        return self._timings[i] if self._selected[i] != UNANSWERED else None
+
+    @property
+    def user_answers(self):
+        """Înregistrările citibile, în ordinea răspunsurilor (construite acum, nu stocate)."""
+        answers = []
+        for i in range(len(self._indices)):
+            selected = self._selected[i]
+            if selected == UNANSWERED:
+                continue
+            q = self.question_at(i)
+            answers.append({
+                "question": q["question"],
+                "selected": q["choices"][selected],
+                "correct": q["choices"][q["correct_index"]],
+                "explanation": q.get("explanation", "Nicio explicație disponibilă."),
+            })
+        return answers
+
     def get_result_data(self, mode, time_used):
-        total = len(self.questions)
+        if self.sampler is not None:
+            self.sampler.save()
+        total = len(self._indices)
         percent = round((self.score / total) * 100, 1) if total else 0
-        domain_used = "mix" if not self.questions else self.questions[0].get("domain", "mix")
+        domain_used = "mix" if not total else self.question_at(0).get("domain", "mix")
 
-        return {
+        result = {
             "mode": mode,
             "domain": domain_used,
             "score": self.score,
@@ -84,3 +197,7 @@ class QuizManagerModern:
             "incorrect": total - self.score,
             "date": datetime.datetime.now().strftime("%Y-%m-%d %H:%M"),
         }
+        if self.cat is not None:
+            result["ability"] = round(self.cat.theta, 2)
+            result["ability_se"] = round(self.cat.se, 2)
+        return result
@@ -0,0 +1,633 @@
+# quiz_server.py
+import argparse
+import asyncio
+import functools
+import heapq
+import json
+import math
+import os
+import random
+import secrets
+import subprocess
+import sys
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+# ================================================================
+#  QUIZ SERVER - serviciu HTTP/JSON (asyncio, doar stdlib) pentru
+#  examene în laborator: mulți utilizatori, o singură mașină.
+#  - sesiuni QuizManagerModern peste banca partajată (read-only)
+#  - timer pe server: termenul limită e verificat la fiecare răspuns,
+#    iar sesiunile expirate sunt închise de un task de fundal
+#  - rezultatele trec prin stats_manager + leaderboard + answer_log, pe un singur
+#    thread de scriere (event loop-ul nu așteaptă disc / sqlite)
+#  - construcția sesiunii (index de subiecte, profil adaptiv, index IRT) și
+#    calculul rezultatului (salvarea profilului) rulează pe un thread de lucru
+#
+#  python src/quiz_server.py serve --port 8765
+#  python src/quiz_server.py loadtest --sessions 2000 --concurrency 500 --spawn
+#
+#  POST /sessions                      {"name", "mode", "domain", "num_questions", "time_min"}
+#  GET  /sessions/<id>                 stare + rezultat (după final)
+#  GET  /sessions/<id>/question        întrebarea curentă (fără răspuns)
+#  POST /sessions/<id>/answer          {"choice": i}
+#  POST /sessions/<id>/finish          predare înainte de final
+#  GET  /leaderboard?domain=&mode=&n=  |  GET /health
+# ================================================================
+
+MAX_BODY = 64 * 1024
+RESULT_TTL = 15 * 60       # cât păstrăm o sesiune terminată (pentru GET rezultat)
+REAPER_INTERVAL = 0.5
+MAX_QUESTIONS = 200
+MAX_TIME_MIN = 24 * 60
+MAX_TEXT = 200             # domain / topic
+SELECTIONS = ("uniform", "adaptive", "irt")
+MAX_LEADERBOARD = 100
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 409: "Conflict", 410: "Gone",
+           413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+# === 1. Sesiune pe server ===
+class ServerSession:
+    def __init__(self, sid, name, mode, manager, time_limit):
+        self.id = sid
+        self.name = name
+        self.mode = mode
+        self.manager = manager
+        self.started = time.monotonic()
+        self.deadline = self.started + time_limit
+        self.time_limit = time_limit
+        self.finished = False
+        self.finished_at = None
+        self.reason = None
+        self.result = None
+        self.rank = None
+        self.persisted = None   # Future-ul salvării (alte cereri îl pot aștepta)
+
+    def remaining(self, now=None):
+        now = time.monotonic() if now is None else now
+        return max(0.0, self.deadline - now)
+
+    def question_payload(self):
+        q = self.manager.get_current_question()
+        if q is None:
+            return None
+        return {
+            "index": self.manager.current_index,
+            "total": self.manager.planned_questions(),
+            "question": q["question"],
+            "choices": q["choices"],
+            "image": q.get("image", ""),
+            "remaining_s": round(self.remaining(), 1),
+        }
+
+    def status_payload(self):
+        payload = {
+            "session_id": self.id,
+            "mode": self.mode,
+            "index": self.manager.current_index,
+            "total": self.manager.planned_questions(),
+            "remaining_s": round(self.remaining(), 1),
+            "finished": self.finished,
+        }
+        if self.finished:
+            payload["reason"] = self.reason
+            payload["result"] = self.result
+            if self.rank is not None:
+                payload["rank"], payload["rank_total"] = self.rank
+        return payload
+
+
+# === 2. Serviciul ===
+class QuizServer:
+    def __init__(self, max_sessions=10000, bank_path=None):
+        # importuri aici: FEA_DATA_DIR (--data-dir) trebuie setat înainte
+        from question_bank import QuestionBank, get_question_bank
+        from quiz_engine_modern import QuizManagerModern
+
+        self.bank = QuestionBank(bank_path).refresh() if bank_path else get_question_bank()
+        self.manager_cls = QuizManagerModern
+        self.max_sessions = max_sessions
+        self.sessions = {}
+        self._deadlines = []      # heap (deadline, id) -> sesiuni de închis la expirare
+        self._finished = deque()  # (finished_at, id) -> sesiuni de șters după RESULT_TTL
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="quiz-persist")
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="quiz-work")
+        self._pending = []        # (rezultat, Future) care așteaptă următorul lot de scriere
+        self._flushing = False
+        self._creating = 0        # sesiuni în construcție (locul e rezervat înainte de await)
+        self.stats = {"created": 0, "answers": 0, "finished": 0, "expired": 0}
+
+    # --- ciclul de viață al sesiunii ---
+    async def create(self, body):
+        active = len(self.sessions) - len(self._finished) + self._creating
+        if active >= self.max_sessions:
+            raise HttpError(503, "Prea multe sesiuni active")
+        mode = body.get("mode", "exam")
+        if mode not in ("train", "exam"):
+            raise HttpError(400, "mode trebuie să fie train sau exam")
+        try:
+            num = min(int(body.get("num_questions", 10)), MAX_QUESTIONS)
+            time_min = float(body.get("time_min", 10))
+        except (TypeError, ValueError, OverflowError):
+            raise HttpError(400, "num_questions / time_min invalide")
+        if num < 1:
+            raise HttpError(400, "num_questions trebuie să fie cel puțin 1")
+        # NaN / inf ar bloca heap-ul de termene (reaper-ul nu ar mai închide nicio sesiune)
+        if not (math.isfinite(time_min) and 0 < time_min <= MAX_TIME_MIN):
+            raise HttpError(400, f"time_min trebuie să fie între 0 și {MAX_TIME_MIN}")
+        domain = _text_field(body, "domain", "mix")
+        topic = _text_field(body, "topic", None)
+        selection = _text_field(body, "selection", "uniform")
+        if selection not in SELECTIONS:
+            raise HttpError(400, f"selection trebuie să fie una din: {', '.join(SELECTIONS)}")
+        name = str(body.get("name") or "Anonim")[:40]
+
+        self._creating += 1
+        try:
+            manager = await asyncio.get_running_loop().run_in_executor(
+                self._worker, functools.partial(
+                    self.manager_cls, self.bank, domain, num,
+                    selection=selection, user=name, topic=topic))
+        finally:
+            self._creating -= 1
+        if not manager.total_questions():
+            raise HttpError(400, "Nicio întrebare pentru domeniul / subiectul cerut")
+
+        sid = secrets.token_urlsafe(12)
+        session = ServerSession(sid, name, mode, manager, time_min * 60)
+        self.sessions[sid] = session
+        heapq.heappush(self._deadlines, (session.deadline, sid))
+        self.stats["created"] += 1
+        payload = session.status_payload()
+        payload["question"] = session.question_payload()
+        return payload
+
+    def get(self, sid):
+        session = self.sessions.get(sid)
+        if session is None:
+            raise HttpError(404, "Sesiune inexistentă")
+        return session
+
+    async def answer(self, session, body):
+        if session.finished:
+            raise HttpError(410, "Sesiunea s-a încheiat")
+        if session.remaining() <= 0:
+            await self.finish(session, "timeout")
+            raise HttpError(410, "Timpul a expirat")
+        q = session.manager.get_current_question()
+        try:
+            choice = int(body["choice"])
+        except (KeyError, TypeError, ValueError):
+            raise HttpError(400, "choice lipsă sau invalid")
+        if not 0 <= choice < len(q["choices"]):
+            raise HttpError(400, "choice în afara variantelor")
+
+        correct, correct_text, explanation = session.manager.check_answer(choice)
+        self.stats["answers"] += 1
+        payload = {"accepted": True}
+        if session.mode == "train":
+            payload.update(correct=correct, correct_text=correct_text, explanation=explanation)
+
+        if session.manager.advance():
+            payload["question"] = session.question_payload()
+        else:
+            await self.finish(session, "completed")
+            payload.update(session.status_payload())
+        return payload
+
+    async def finish(self, session, reason):
+        """Închide sesiunea o singură dată; cererile concurente așteaptă aceeași salvare."""
+        if not session.finished:
+            now = time.monotonic()
+            session.finished = True
+            session.finished_at = now
+            session.reason = reason
+            time_used = int(min(now - session.started, session.time_limit))
+            self._finished.append((now, session.id))
+            self.stats["finished"] += 1
+            session.persisted = asyncio.ensure_future(self._complete(session, time_used))
+        try:
+            session.rank = await session.persisted
+        except Exception as e:
+            print(f"[WARN] Nu am putut salva sesiunea {session.id}: {e}")
+
+    async def _complete(self, session, time_used):
+        """Rezultatul (pe thread-ul de lucru: profilul adaptiv e salvat pe disc), apoi salvarea."""
+        from answer_log import quiz_events
+
+        result = await asyncio.get_running_loop().run_in_executor(
+            self._worker, session.manager.get_result_data, session.mode, time_used)
+        if session.mode == "exam":
+            result["name"] = session.name
+        session.result = result
+        return await self._queue_persist(dict(result), session.name, quiz_events(session.manager))
+
+    def _queue_persist(self, result, user, events):
+        """
+        Pune rezultatul în lotul următor. Cât timp un lot se scrie, rezultatele
+        noi se adună și pleacă împreună (group commit), deci sub încărcare
+        numărul de scrieri pe disc crește cu loturile, nu cu sesiunile.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(((result, user, events), future))
+        if not self._flushing:
+            self._flushing = True
+            asyncio.ensure_future(self._flush())
+        return future
+
+    async def _flush(self):
+        loop = asyncio.get_running_loop()
+        try:
+            while self._pending:
+                batch, self._pending = self._pending, []
+                try:
+                    ranks = await loop.run_in_executor(self._writer, _persist_batch,
+                                                       [item for item, _ in batch])
+                except Exception as e:
+                    for _, future in batch:
+                        future.set_exception(e)
+                    continue
+                for (_, future), rank in zip(batch, ranks):
+                    future.set_result(rank)
+        finally:
+            self._flushing = False
+
+    async def reaper(self):
+        """Închide sesiunile expirate (heap după termen) și uită rezultatele vechi."""
+        while True:
+            await asyncio.sleep(REAPER_INTERVAL)
+            now = time.monotonic()
+            while self._deadlines and self._deadlines[0][0] <= now:
+                _, sid = heapq.heappop(self._deadlines)
+                session = self.sessions.get(sid)
+                if session is not None and not session.finished:
+                    self.stats["expired"] += 1
+                    asyncio.ensure_future(self.finish(session, "timeout"))
+            while self._finished and now - self._finished[0][0] > RESULT_TTL:
+                _, sid = self._finished.popleft()
+                self.sessions.pop(sid, None)
+
+    # --- rutare ---
+    async def dispatch(self, method, target, body):
+        url = urlsplit(target)
+        parts = [p for p in url.path.split("/") if p]
+
+        if parts == ["health"]:
+            return 200, {"ok": True, "sessions": len(self.sessions), **self.stats}
+        if parts == ["leaderboard"]:
+            from stats_manager import get_leaderboard
+            query = parse_qs(url.query)
+            try:
+                n = min(max(int(query.get("n", ["10"])[0]), 1), MAX_LEADERBOARD)
+            except ValueError:
+                raise HttpError(400, "n trebuie să fie un număr întreg")
+            return 200, {"entries": get_leaderboard(top_n=n, domain=query.get("domain", ["*"])[0],
+                                                    mode=query.get("mode", ["*"])[0])}
+        if parts == ["sessions"]:
+            if method != "POST":
+                raise HttpError(405, "Folosește POST")
+            return 201, await self.create(_json_body(body))
+        if len(parts) >= 2 and parts[0] == "sessions":
+            session = self.get(parts[1])
+            action = parts[2] if len(parts) > 2 else None
+            if action is None and method == "GET":
+                if session.finished and session.persisted is not None:
+                    await self.finish(session, session.reason)
+                return 200, session.status_payload()
+            if action == "question" and method == "GET":
+                if session.finished:
+                    raise HttpError(410, "Sesiunea s-a încheiat")
+                return 200, session.question_payload()
+            if action == "answer" and method == "POST":
+                return 200, await self.answer(session, _json_body(body))
+            if action == "finish" and method == "POST":
+                await self.finish(session, session.reason or "submitted")
+                return 200, session.status_payload()
+        raise HttpError(404, "Rută inexistentă")
+
+    # --- HTTP/1.1 minimal (keep-alive, Content-Length) ---
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+
+                length = _content_length(headers)
+                try:
+                    if length is None:
+                        raise HttpError(400, "Content-Length invalid")
+                    if length > MAX_BODY:
+                        raise HttpError(413, "Corp prea mare")
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = await self.dispatch(method.upper(), target, body)
+                except HttpError as e:
+                    status, payload = e.status, {"error": e.message}
+                except Exception as e:
+                    print(f"[ERROR] {method} {target}: {e!r}")
+                    status, payload = 500, {"error": "Eroare internă"}
+
+                # corp necitit (Content-Length invalid / prea mare) -> conexiunea nu mai poate continua
+                keep_alive = (version == "HTTP/1.1" and length is not None and length <= MAX_BODY
+                              and headers.get("connection", "").lower() != "close")
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8765):
+        server = await asyncio.start_server(self.handle, host, port, backlog=4096)
+        reaper = asyncio.ensure_future(self.reaper())
+        print(f"[INFO] Quiz server pe http://{host}:{port} ({len(self.bank)} întrebări)", flush=True)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            reaper.cancel()
+            self._worker.shutdown(wait=True)
+            self._writer.shutdown(wait=True)
+
+
+def _content_length(headers):
+    """Lungimea corpului sau None dacă header-ul nu e un întreg >= 0."""
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        return None
+    return length if length >= 0 else None
+
+
+def _text_field(body, key, default):
+    value = body.get(key, default)
+    if value is None or value == default:
+        return value
+    if not isinstance(value, str) or len(value) > MAX_TEXT:
+        raise HttpError(400, f"{key} trebuie să fie un text (cel mult {MAX_TEXT} caractere)")
+    return value
+
+
+def _json_body(body):
+    if not body:
+        return {}
+    try:
+        data = json.loads(body)
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        raise HttpError(400, "JSON invalid")
+    if not isinstance(data, dict):
+        raise HttpError(400, "Se așteaptă un obiect JSON")
+    return data
+
+
+def _persist_batch(items):
+    """
+    Pe thread-ul de scriere, pentru un lot de (rezultat, utilizator, evenimente):
+    statistici, jurnalul de răspunsuri și leaderboard (doar exam).
+    Întoarce (loc, total) pentru fiecare rezultat (None în train).
+    """
+    from answer_log import get_answer_log
+    from data_loader import add_leaderboard_entry
+    from stats_manager import add_sessions, get_rank
+
+    results = [result for result, _, _ in items]
+    add_sessions(results)
+    log = get_answer_log()
+    for _, user, events in items:
+        log.append_session(user, events)
+    ranks = []
+    for result in results:
+        if result["mode"] != "exam":
+            ranks.append(None)
+            continue
+        add_leaderboard_entry({
+            "name": result["name"],
+            "score": round(result["percent"], 1),
+            "mode": "exam",
+            "domain": result["domain"],
+            "date": result["date"],
+        })
+        ranks.append(get_rank(result["percent"], result["domain"], "exam"))
+    return ranks
+
+
+# === 3. Client de test de încărcare ===
+class _Client:
+    """Conexiune keep-alive cu cereri JSON secvențiale."""
+
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def request(self, method, path, payload=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+        )
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            if key.strip().lower() == "content-length":
+                length = int(value)
+        data = await self.reader.readexactly(length) if length else b"{}"
+        return status, json.loads(data)
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+async def _simulated_user(host, port, cfg, index, lat, errors):
+    rng = random.Random(cfg["seed"] * 1_000_003 + index)
+    client = _Client(host, port)
+    try:
+        t0 = time.perf_counter()
+        status, data = await client.request("POST", "/sessions", {
+            "name": f"load-{index}", "mode": cfg["mode"], "domain": cfg["domain"],
+            "num_questions": cfg["num_questions"], "time_min": cfg["time_min"],
+        })
+        lat["create"].append((time.perf_counter() - t0) * 1000)
+        if status != 201:
+            errors.append(status)
+            return
+        sid = data["session_id"]
+        question = data["question"]
+        while question is not None:
+            if cfg["think_ms"]:
+                await asyncio.sleep(rng.uniform(0, cfg["think_ms"]) / 1000)
+            t0 = time.perf_counter()
+            status, data = await client.request("POST", f"/sessions/{sid}/answer",
+                                                {"choice": rng.randrange(len(question["choices"]))})
+            lat["answer"].append((time.perf_counter() - t0) * 1000)
+            if status != 200:
+                errors.append(status)
+                return
+            question = data.get("question")
+    except (ConnectionError, asyncio.IncompleteReadError, OSError, IndexError, ValueError) as e:
+        errors.append(type(e).__name__)
+    finally:
+        await client.close()
+
+
+async def run_loadtest(host, port, cfg):
+    from quiz_simulator import summarize
+
+    lat = {"create": [], "answer": []}
+    errors = []
+    semaphore = asyncio.Semaphore(cfg["concurrency"])
+
+    async def one(i):
+        async with semaphore:
+            await _simulated_user(host, port, cfg, i, lat, errors)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(cfg["sessions"])))
+    elapsed = time.perf_counter() - start
+    requests = len(lat["create"]) + len(lat["answer"])
+    return {
+        "sessions": cfg["sessions"],
+        "concurrency": cfg["concurrency"],
+        "elapsed_s": round(elapsed, 3),
+        "sessions_per_s": round(cfg["sessions"] / elapsed, 1) if elapsed else 0.0,
+        "requests_per_s": round(requests / elapsed, 1) if elapsed else 0.0,
+        "errors": len(errors),
+        "error_kinds": sorted({str(e) for e in errors}),
+        "latency": {name: summarize(values) for name, values in lat.items()},
+    }
+
+
+async def _wait_healthy(host, port, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        client = _Client(host, port)
+        try:
+            status, _ = await client.request("GET", "/health")
+            if status == 200:
+                return True
+        except OSError:
+            await asyncio.sleep(0.2)
+        finally:
+            await client.close()
+    return False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serviciu HTTP pentru examene quiz în laborator.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve", help="pornește serverul")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--data-dir", help="folder pentru statistici / leaderboard")
+    serve.add_argument("--max-sessions", type=int, default=10000)
+
+    load = sub.add_parser("loadtest", help="test de încărcare cu clienți simulați")
+    load.add_argument("--host", default="127.0.0.1")
+    load.add_argument("--port", type=int, default=8765)
+    load.add_argument("--spawn", action="store_true",
+                      help="pornește un server separat, cu date într-un folder temporar")
+    load.add_argument("--sessions", type=int, default=1000)
+    load.add_argument("--concurrency", type=int, default=200)
+    load.add_argument("--num-questions", type=int, default=10)
+    load.add_argument("--mode", choices=("train", "exam"), default="exam")
+    load.add_argument("--domain", default="mix")
+    load.add_argument("--time-min", type=float, default=10)
+    load.add_argument("--think-ms", type=float, default=0, help="pauză aleatorie între răspunsuri")
+    load.add_argument("--seed", type=int, default=0)
+    load.add_argument("--json", help="scrie raportul și într-un fișier JSON")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        bank = None
+        if args.data_dir:
+            # banca rămâne cea reală; doar statisticile merg în --data-dir
+            from data_loader import get_data_dir
+            bank = os.path.abspath(os.path.join(get_data_dir(), "fea_questions.json"))
+            os.environ["FEA_DATA_DIR"] = os.path.abspath(args.data_dir)
+        try:
+            asyncio.run(QuizServer(args.max_sessions, bank).serve(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    cfg = {
+        "sessions": args.sessions,
+        "concurrency": args.concurrency,
+        "num_questions": args.num_questions,
+        "mode": args.mode,
+        "domain": args.domain,
+        "time_min": args.time_min,
+        "think_ms": args.think_ms,
+        "seed": args.seed,
+    }
+    server = None
+    data_dir = None
+    if args.spawn:
+        data_dir = tempfile.mkdtemp(prefix="fea_server_")
+        server = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "serve", "--host", args.host,
+             "--port", str(args.port), "--data-dir", data_dir],
+            stdout=subprocess.DEVNULL,
+        )
+    try:
+        if not asyncio.run(_wait_healthy(args.host, args.port)):
+            print("[ERROR] Serverul nu răspunde")
+            return 1
+        report = asyncio.run(run_loadtest(args.host, args.port, cfg))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    print(json.dumps(report, indent=4, ensure_ascii=False))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4, ensure_ascii=False)
+    if data_dir:
+        print(f"[INFO] Statisticile serverului de test: {data_dir}")
+    return 0 if not report["errors"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+# quiz_simulator.py
+import argparse
+import contextlib
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# ================================================================
+#  QUIZ SIMULATOR - driver fără UI pentru QuizManagerModern
+#  Rulează mii de sesiuni simulate pe motorul real + stocarea de
+#  statistici + leaderboard și raportează throughput și percentile
+#  de latență (start sesiune, check_answer, salvare rezultat).
+#
+#  python src/quiz_simulator.py --sessions 5000 --workers 8 \
+#      --policy accuracy:structural=0.9,cfd=0.5,default=0.7 --seed 42 \
+#      --data-dir /tmp/fea_sim
+#
+#  Modulele aplicației se importă după ce FEA_DATA_DIR e setat, ca
+#  simularea să nu scrie în data/ real.
+# ================================================================
+
+PHASES = ("start", "check_answer", "persist", "session")
+
+
+# === 1. Politici de răspuns ===
+class AnswerPolicy:
+    """
+    random   -> variantă aleatorie
+    correct  -> mereu varianta corectă
+    accuracy -> corect cu probabilitatea domeniului (ex. "structural=0.9,default=0.6")
+    """
+
+    def __init__(self, spec="random"):
+        name, _, params = spec.partition(":")
+        self.name = name
+        self.accuracy = {}
+        if name == "accuracy":
+            for part in filter(None, params.split(",")):
+                domain, _, value = part.partition("=")
+                self.accuracy[domain.strip().lower()] = float(value)
+            self.accuracy.setdefault("default", 0.5)
+        elif name not in ("random", "correct"):
+            raise ValueError(f"Politică necunoscută: {spec}")
+
+    def choose(self, q, rng):
+        n = len(q["choices"])
+        correct = q["correct_index"]
+        if self.name == "correct":
+            return correct
+        if self.name == "random" or n < 2:
+            return rng.randrange(n)
+        p = self.accuracy.get(q.get("domain", "").lower(), self.accuracy["default"])
+        if rng.random() < p:
+            return correct
+        wrong = rng.randrange(n - 1)
+        return wrong if wrong < correct else wrong + 1
+
+
+# === 2. O sesiune ===
+def run_session(bank, cfg, policy, index):
+    """Rulează sesiunea `index` (seed derivat -> reproductibil). Întoarce latențele în ms."""
+    from quiz_engine_modern import QuizManagerModern
+    from stats_manager import add_session, get_rank
+    from data_loader import add_leaderboard_entry
+
+    rng = random.Random(cfg["seed"] * 1_000_003 + index)
+    lat = {phase: [] for phase in PHASES}
+    t_session = time.perf_counter()
+
+    t0 = time.perf_counter()
+    qm = QuizManagerModern(bank, cfg["domain"], cfg["num_questions"], rng=rng)
+    lat["start"].append((time.perf_counter() - t0) * 1000)
+
+    time_used = 0
+    while True:
+        q = qm.get_current_question()
+        if q is None:
+            break
+        idx = policy.choose(q, rng)
+        t0 = time.perf_counter()
+        qm.check_answer(idx)
+        lat["check_answer"].append((time.perf_counter() - t0) * 1000)
+        time_used += rng.randint(3, 30)  # timp de gândire simulat, nu așteptat efectiv
+        if not qm.advance():
+            break
+
+    t0 = time.perf_counter()
+    result = qm.get_result_data(cfg["mode"], time_used)
+    if cfg["mode"] == "exam":
+        result["name"] = f"sim-{index}"
+    add_session(result)
+    if cfg["mode"] == "exam":
+        add_leaderboard_entry({
+            "name": result["name"],
+            "score": round(result["percent"], 1),
+            "mode": "exam",
+            "domain": result["domain"],
+            "date": result["date"],
+        })
+        get_rank(result["percent"], result["domain"], "exam")
+    lat["persist"].append((time.perf_counter() - t0) * 1000)
+
+    lat["session"].append((time.perf_counter() - t_session) * 1000)
+    return lat, qm.score
+
+
+def _merge(into, lat):
+    for phase, values in lat.items():
+        into[phase].extend(values)
+
+
+def run_chunk(cfg, indices):
+    """Rulează un set de sesiuni secvențial (unitatea de lucru pentru thread / proces)."""
+    from question_bank import QuestionBank, get_question_bank
+
+    bank = QuestionBank(cfg["bank"]).refresh() if cfg.get("bank") else get_question_bank()
+    policy = AnswerPolicy(cfg["policy"])
+    lat = {phase: [] for phase in PHASES}
+    correct = 0
+    for index in indices:
+        session_lat, score = run_session(bank, cfg, policy, index)
+        _merge(lat, session_lat)
+        correct += score
+    return lat, correct
+
+
+@contextlib.contextmanager
+def _quiet(cfg):
+    """Ascunde mesajele [INFO] ale aplicației (o dată per proces, nu per thread)."""
+    if not cfg["quiet"]:
+        yield
+        return
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def _chunk_process(args):
+    cfg, indices = args
+    os.environ["FEA_DATA_DIR"] = cfg["data_dir"]
+    with _quiet(cfg):
+        return run_chunk(cfg, indices)
+
+
+# === 3. Statistici ===
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * p / 100
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def summarize(values):
+    values = sorted(values)
+    return {
+        "count": len(values),
+        "p50_ms": round(percentile(values, 50), 4),
+        "p90_ms": round(percentile(values, 90), 4),
+        "p99_ms": round(percentile(values, 99), 4),
+        "max_ms": round(values[-1], 4) if values else 0.0,
+    }
+
+
+def simulate(cfg):
+    """Rulează cfg["sessions"] sesiuni pe cfg["workers"] thread-uri / procese."""
+    sessions = cfg["sessions"]
+    workers = max(1, cfg["workers"])
+    chunks = [list(range(w, sessions, workers)) for w in range(workers)]
+    chunks = [c for c in chunks if c]
+
+    lat = {phase: [] for phase in PHASES}
+    correct = 0
+    start = time.perf_counter()
+    if cfg["executor"] == "process" and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_chunk_process, [(cfg, c) for c in chunks]))
+    elif workers > 1:
+        with _quiet(cfg), ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(lambda c: run_chunk(cfg, c), chunks))
+    else:
+        with _quiet(cfg):
+            results = [run_chunk(cfg, chunks[0])] if chunks else []
+    elapsed = time.perf_counter() - start
+
+    for chunk_lat, chunk_correct in results:
+        _merge(lat, chunk_lat)
+        correct += chunk_correct
+
+    answered = len(lat["check_answer"])
+    return {
+        "sessions": sessions,
+        "workers": workers,
+        "executor": cfg["executor"],
+        "policy": cfg["policy"],
+        "seed": cfg["seed"],
+        "elapsed_s": round(elapsed, 3),
+        "sessions_per_s": round(sessions / elapsed, 1) if elapsed else 0.0,
+        "answers_per_s": round(answered / elapsed, 1) if elapsed else 0.0,
+        "accuracy": round(correct / answered, 4) if answered else 0.0,
+        "latency": {phase: summarize(values) for phase, values in lat.items()},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulare headless de sesiuni quiz.")
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--executor", choices=("thread", "process"), default="thread")
+    parser.add_argument("--policy", default="random",
+                        help="random | correct | accuracy:structural=0.9,default=0.6")
+    parser.add_argument("--domain", default="mix")
+    parser.add_argument("--num-questions", type=int, default=10)
+    parser.add_argument("--mode", choices=("train", "exam"), default="exam")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--bank", help="banca de întrebări (implicit data/fea_questions.json)")
+    parser.add_argument("--data-dir", help="folder pentru statistici / leaderboard (recomandat: unul temporar)")
+    parser.add_argument("--json", help="scrie raportul și într-un fișier JSON")
+    parser.add_argument("--verbose", action="store_true", help="nu ascunde mesajele [INFO] ale aplicației")
+    args = parser.parse_args(argv)
+
+    bank = args.bank
+    if args.data_dir:
+        # banca rămâne cea reală, doar scrierile merg în folderul de simulare
+        if not bank:
+            from data_loader import get_data_dir
+            bank = os.path.abspath(os.path.join(get_data_dir(), "fea_questions.json"))
+        os.environ["FEA_DATA_DIR"] = os.path.abspath(args.data_dir)
+
+    from data_loader import get_data_dir
+
+    cfg = {
+        "sessions": args.sessions,
+        "workers": args.workers,
+        "executor": args.executor,
+        "policy": args.policy,
+        "domain": args.domain,
+        "num_questions": args.num_questions,
+        "mode": args.mode,
+        "seed": args.seed,
+        "bank": bank,
+        "data_dir": get_data_dir(),
+        "quiet": not args.verbose,
+    }
+    AnswerPolicy(cfg["policy"])  # validare înainte de pornire
+
+    report = simulate(cfg)
+    print(json.dumps(report, indent=4, ensure_ascii=False))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
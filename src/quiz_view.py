@@ -0,0 +1,121 @@
+# quiz_view.py
+import customtkinter as ctk
+
+# ================================================================
+#  QUIZ VIEW - ecranul de întrebare construit o singură dată per sesiune
+#  Întrebare + slot imagine + pool de butoane pentru variante, plus
+#  panoul de feedback (Train Mode). Trecerea la următoarea întrebare
+#  doar reconfigurează text / imagine / vizibilitate, fără destroy.
+# ================================================================
+
+
+class QuizView(ctk.CTkFrame):
+    def __init__(self, master, on_answer, on_next, on_finish):
+        super().__init__(master, fg_color="transparent")
+        self.on_answer = on_answer
+        self.on_next = on_next
+        self.on_finish = on_finish
+        self._is_last = False
+
+        # === Panou întrebare ===
+        self.question_panel = ctk.CTkFrame(self, fg_color="transparent")
+        self.question_label = ctk.CTkLabel(
+            self.question_panel,
+            text="",
+            wraplength=700,
+            font=("Segoe UI", 18, "bold"),
+            text_color="white"
+        )
+        self.question_label.pack(pady=(15, 10))
+
+        self.question_image = ctk.CTkLabel(self.question_panel, text="")
+        self.choices_frame = ctk.CTkFrame(self.question_panel, fg_color="transparent")
+        self.choices_frame.pack()
+        self.choice_buttons = []
+
+        # === Panou feedback (Train Mode) ===
+        self.feedback_panel = ctk.CTkFrame(self, fg_color="transparent")
+        self.feedback_msg = ctk.CTkLabel(self.feedback_panel, text="", font=("Segoe UI", 22, "bold"))
+        self.feedback_msg.pack(pady=15)
+        self.feedback_correct = ctk.CTkLabel(self.feedback_panel, text="", text_color="white")
+        self.feedback_correct.pack(pady=5)
+        self.feedback_explanation = ctk.CTkLabel(
+            self.feedback_panel,
+            text="",
+            text_color="#cccccc",
+            wraplength=700
+        )
+        self.feedback_explanation.pack(pady=10)
+        self.feedback_image = ctk.CTkLabel(self.feedback_panel, text="")
+        self.feedback_button = ctk.CTkButton(
+            self.feedback_panel,
+            text="Continuă ➜",
+            command=self._on_continue,
+            fg_color="#1E5BA6"
+        )
+        self.feedback_button.pack(pady=15)
+
+    # === Pool butoane ===
+    def _ensure_buttons(self, count):
+        while len(self.choice_buttons) < count:
+            idx = len(self.choice_buttons)
+            self.choice_buttons.append(ctk.CTkButton(
+                self.choices_frame,
+                text="",
+                font=("Segoe UI", 14),
+                fg_color="#1E5BA6",
+                hover_color="#297BE6",
+                width=600,
+                command=lambda i=idx: self.on_answer(i)
+            ))
+
+    @staticmethod
+    def _set_image(label, image, before, pady=(5, 15)):
+        if image:
+            label.configure(image=image)
+            if not label.winfo_manager():
+                label.pack(pady=pady, before=before)
+        else:
+            label.pack_forget()
+
+    # === API ===
+    def show_question(self, q, image=None):
+        self.feedback_panel.pack_forget()
+        self.question_label.configure(text=q["question"])
+        self._set_image(self.question_image, image, before=self.choices_frame)
+
+        choices = q["choices"]
+        self._ensure_buttons(len(choices))
+        for i, btn in enumerate(self.choice_buttons):
+            if i < len(choices):
+                btn.configure(text=choices[i], state="normal")
+                if not btn.winfo_manager():
+                    btn.pack(pady=6)
+            else:
+                btn.pack_forget()
+        # ordinea de pack e păstrată: butoanele ascunse sunt doar cele de la final
+
+        if not self.question_panel.winfo_manager():
+            self.question_panel.pack(fill="both", expand=True)
+
+    def show_feedback(self, correct, correct_text, explanation, image=None, is_last=False):
+        self.question_panel.pack_forget()
+        self._is_last = is_last
+
+        self.feedback_msg.configure(
+            text="✅ Corect!" if correct else "❌ Greșit!",
+            text_color="#00ff99" if correct else "#ff4444"
+        )
+        self.feedback_correct.configure(text=f"Răspuns corect: {correct_text}")
+        self.feedback_explanation.configure(text=f"Explicație: {explanation}")
+        self._set_image(self.feedback_image, image, before=self.feedback_button, pady=(10, 15))
+        self.feedback_button.configure(text="Finalizare ➜" if is_last else "Continuă ➜")
+
+        if not self.feedback_panel.winfo_manager():
+            self.feedback_panel.pack(fill="both", expand=True)
+
+    def _on_continue(self):
+        if self._is_last:
+            self.on_finish()
+        else:
+            self.on_next()
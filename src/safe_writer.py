@@ -0,0 +1,344 @@
+# safe_writer.py
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:          # Windows
+    fcntl = None
+    import msvcrt
+
+# ================================================================
+#  SAFE WRITER - scrieri sigure când mai multe procese (ex. două instanțe
+#  ale aplicației pe un share de laborator) folosesc același director data/
+#  - FileLock: lock advisory pe <fișier>.lock (fcntl.lockf / msvcrt.locking)
+#    + lock de thread în proces (lockf e per proces, nu per thread)
+#  - atomic_write_*: fișier temporar în același director, fsync, os.replace
+#    -> cititorii văd fie versiunea veche, fie cea nouă, niciodată jumătăți
+#  - GroupCommitFile: append cu group commit între procese. Fiecare lot de
+#    înregistrări (submit / submit_many) e scris ca fișier mic în
+#    <fișier>.spool/ (rename atomic, fără lock); cine obține lock-ul aplică
+#    TOATE loturile din spool într-o singură rescriere. Procesele ale căror
+#    loturi au fost deja preluate nu mai scriu nimic.
+#    Un marker (<fișier>.commit: înregistrări + sha1 al conținutului nou)
+#    permite recuperarea după o întrerupere în mijlocul unui commit.
+#
+#  python src/safe_writer.py stress --procs 8 --records 200 --batch 10
+#  python src/safe_writer.py stress --procs 8 --records 200 --naive   (vechiul read-modify-write)
+# ================================================================
+
+RECORD_SUFFIX = ".rec"
+_HOST = socket.gethostname().replace("-", "_")
+_sequence = itertools.count()
+
+
+# === 1. Lock advisory între procese ===
+class FileLock:
+    def __init__(self, path):
+        self.path = f"{path}.lock"
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fh = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        self._depth += 1
+        if self._depth == 1:
+            try:
+                fh = open(self.path, "a+b")
+                _lock_file(fh)
+            except BaseException:
+                self._depth -= 1
+                self._thread_lock.release()
+                raise
+            self._fh = fh
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._depth -= 1
+        if self._depth == 0:
+            fh, self._fh = self._fh, None
+            try:
+                _unlock_file(fh)
+            finally:
+                fh.close()
+        self._thread_lock.release()
+        return False
+
+
+def _lock_file(fh):
+    if fcntl is not None:
+        fcntl.lockf(fh, fcntl.LOCK_EX)   # lockf (POSIX) funcționează și pe NFS
+        return
+    fh.seek(0)
+    while True:
+        try:
+            msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:  # LK_LOCK renunță după ~10 s -> mai încercăm
+            continue
+
+
+def _unlock_file(fh):
+    if fcntl is not None:
+        fcntl.lockf(fh, fcntl.LOCK_UN)
+    else:
+        fh.seek(0)
+        msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+_locks = {}
+_locks_lock = threading.Lock()
+
+
+def file_lock(path):
+    """Lock-ul (unic în proces) pentru un fișier de date."""
+    key = os.path.abspath(path)
+    with _locks_lock:
+        lock = _locks.get(key)
+        if lock is None:
+            lock = _locks[key] = FileLock(key)
+        return lock
+
+
+# === 2. Scriere atomică ===
+def atomic_write_text(path, text, fsync=True):
+    tmp_path = f"{path}.{_HOST}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def atomic_write_json(path, data, indent=None, fsync=True):
+    atomic_write_text(path, json.dumps(data, indent=indent, ensure_ascii=False), fsync)
+
+
+def _sha1_file(path):
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+# === 3. Group commit ===
+class GroupCommitFile:
+    """
+    Fișier JSON la care mai multe procese adaugă înregistrări.
+    load(path) -> datele curente; apply(data, records) -> datele noi;
+    on_commit(data, records) e apelat sub lock, după ce fișierul a fost înlocuit.
+    """
+
+    def __init__(self, path, apply, load, on_commit=None, indent=None, fsync=True):
+        self.path = path
+        self.spool_dir = f"{path}.spool"
+        self.marker_path = f"{path}.commit"
+        self.apply = apply
+        self.load = load
+        self.on_commit = on_commit
+        self.indent = indent
+        self.fsync = fsync
+        self.lock = file_lock(path)
+        self.commits = 0        # rescrieri făcute de acest proces
+        self.committed = 0      # înregistrări aplicate de acest proces (inclusiv ale altora)
+
+    def _spool(self, records):
+        os.makedirs(self.spool_dir, exist_ok=True)
+        name = f"{time.time_ns():020d}-{_HOST}-{os.getpid()}-{next(_sequence)}{RECORD_SUFFIX}"
+        path = os.path.join(self.spool_dir, name)
+        atomic_write_json(path, records, fsync=self.fsync)   # temporarul nu are sufixul .rec
+        return path
+
+    def submit(self, record):
+        """Adaugă o înregistrare; la întoarcere e în fișier (scrisă de noi sau de alt proces)."""
+        self.submit_many([record])
+
+    def submit_many(self, records):
+        """Adaugă un lot: un singur fișier în spool și cel mult o rescriere."""
+        records = list(records)
+        if not records:
+            return
+        path = self._spool(records)
+        with self.lock:
+            if os.path.exists(path):
+                self._commit_locked()
+
+    def update(self, fn):
+        """Read-modify-write exclusiv (ex. înlocuirea întregului conținut); golește întâi spool-ul."""
+        with self.lock:
+            self._commit_locked()
+            data = fn(self.load(self.path))
+            atomic_write_json(self.path, data, self.indent, self.fsync)
+            return data
+
+    def _recover_locked(self):
+        """Un commit întrerupt: dacă fișierul are deja conținutul nou, înregistrările lui se șterg."""
+        try:
+            with open(self.marker_path, "r", encoding="utf-8") as f:
+                marker = json.load(f)
+        except FileNotFoundError:
+            return
+        except json.JSONDecodeError:
+            marker = {}
+        if marker.get("sha1") and marker.get("sha1") == _sha1_file(self.path):
+            for name in marker.get("records", []):
+                try:
+                    os.remove(os.path.join(self.spool_dir, name))
+                except FileNotFoundError:
+                    pass
+        os.remove(self.marker_path)
+
+    def _commit_locked(self):
+        self._recover_locked()
+        try:
+            names = sorted(n for n in os.listdir(self.spool_dir) if n.endswith(RECORD_SUFFIX))
+        except FileNotFoundError:
+            return
+        if not names:
+            return
+        records = []
+        for name in names:
+            with open(os.path.join(self.spool_dir, name), "r", encoding="utf-8") as f:
+                records.extend(json.load(f))
+
+        data = self.apply(self.load(self.path), records)
+        text = json.dumps(data, indent=self.indent, ensure_ascii=False)
+        digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        atomic_write_json(self.marker_path, {"records": names, "sha1": digest}, fsync=self.fsync)
+        atomic_write_text(self.path, text, self.fsync)
+        for name in names:
+            os.remove(os.path.join(self.spool_dir, name))
+        os.remove(self.marker_path)
+        self.commits += 1
+        self.committed += len(records)
+        if self.on_commit is not None:
+            self.on_commit(data, records)
+
+
+# === 4. Test de stres: N procese scriu concurent ===
+def _naive_add(path, record):
+    """Vechiul JsonStore: citește, adaugă, rescrie (fără lock) - pentru comparație."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        data = []
+    data.append(record)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=4, ensure_ascii=False)
+
+
+def _stress_worker(data_dir, worker, records, batch, start_at, naive):
+    os.environ["FEA_DATA_DIR"] = data_dir
+    import contextlib
+    import io
+
+    import stats_manager
+    from leaderboard_index import LeaderboardIndex
+    from storage import get_store
+
+    store = get_store()
+    sessions = [{"uid": f"{worker}-{i}", "mode": "exam", "domain": f"d{i % 5}",
+                 "percent": (worker * 7 + i) % 101, "time_used": 1} for i in range(records)]
+    time.sleep(max(0.0, start_at - time.time()))
+    started = time.perf_counter()
+    if naive:
+        index = LeaderboardIndex(os.path.join(data_dir, "leaderboard_index.json"))
+        for session in sessions:
+            _naive_add(store.stats_path, session)
+            _naive_add(store.leaderboard_path, session)
+            index.add(session, save=False)
+            index.save(merge=False)
+    else:
+        # calea aplicației: stats_manager (store + index din get_leaderboard_index)
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i in range(0, records, batch):
+                chunk = sessions[i:i + batch]
+                stats_manager.add_sessions(chunk)
+                for session in chunk:
+                    store.add_leaderboard_entry(session)
+    elapsed = time.perf_counter() - started
+    return {"elapsed": elapsed, "commits": store.sessions_file.commits}
+
+
+def stress(procs=8, records=200, naive=False, data_dir=None, batch=1):
+    from concurrent.futures import ProcessPoolExecutor
+    import multiprocessing
+
+    batch = max(1, batch)
+    with tempfile.TemporaryDirectory(dir=data_dir) as tmp:
+        atomic_write_json(os.path.join(tmp, "settings.json"), {"stats_backend": "json"})
+        start_at = time.time() + 1.0 + 0.05 * procs
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(procs, mp_context=ctx) as pool:
+            futures = [pool.submit(_stress_worker, tmp, w, records, batch, start_at, naive)
+                       for w in range(procs)]
+            results = [f.result() for f in futures]
+
+        from leaderboard_index import LeaderboardIndex
+        from storage import JsonStore
+        store = JsonStore(tmp)
+        sessions = store.load_sessions()
+        expected = procs * records
+        wall = max(r["elapsed"] for r in results)
+        writes = sum(r["commits"] for r in results) if not naive else expected
+        return {
+            "mode": "naive" if naive else "group_commit",
+            "procs": procs,
+            "batch": 1 if naive else batch,
+            "expected": expected,
+            "sessions": len(sessions),
+            "unique_sessions": len({s["uid"] for s in sessions}),
+            "summary_total": store.load_summary().summary()["total_sessions"],
+            "leaderboard": len(store.load_leaderboard()),
+            "index_total": LeaderboardIndex(os.path.join(tmp, "leaderboard_index.json")).rank(0)[1],
+            "wall_s": round(wall, 2),
+            "records_per_s": round(expected / wall, 1) if wall else None,
+            "stats_writes": writes,
+            "records_per_write": round(expected / writes, 2) if writes else None,
+        }
+
+
+COUNT_FIELDS = ("sessions", "unique_sessions", "summary_total", "leaderboard", "index_total")
+
+
+def mismatched_counts(report):
+    """Câmpurile care nu au exact numărul așteptat de înregistrări (pierderi sau duplicate)."""
+    return [name for name in COUNT_FIELDS if report[name] != report["expected"]]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scrieri sigure între procese: test de stres.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    s = sub.add_parser("stress", help="N procese adaugă sesiuni concurent; verifică numărătorile exacte")
+    s.add_argument("--procs", type=int, default=8)
+    s.add_argument("--records", type=int, default=200, help="sesiuni per proces")
+    s.add_argument("--batch", type=int, default=1, help="sesiuni per add_sessions (ca lotul din quiz_server)")
+    s.add_argument("--naive", action="store_true", help="vechiul read-modify-write fără lock (comparație)")
+    s.add_argument("--dir", help="directorul în care se creează datele de test (ex. un share de rețea)")
+    args = parser.parse_args(argv)
+
+    report = stress(args.procs, args.records, args.naive, args.dir, args.batch)
+    for key, value in report.items():
+        print(f"{key:18} {value}")
+    wrong = mismatched_counts(report)
+    if wrong:
+        print(f"[WARN] Înregistrări pierdute sau duplicate în: {', '.join(wrong)}")
+        return 1
+    print("[INFO] Nicio înregistrare pierdută sau duplicată")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
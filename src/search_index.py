@@ -0,0 +1,415 @@
+# search_index.py
+import argparse
+import hashlib
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+import unicodedata
+from array import array
+
+from data_loader import get_data_dir
+from question_bank import get_question_bank, question_id
+from safe_writer import file_lock
+
+# ================================================================
+#  SEARCH INDEX - index inversat + BM25 peste întrebări și Learn Mode
+#  Câmpuri indexate: question, choices, explanation (bancă) și
+#  subtitle / content pentru secțiunile din data/docs/*.json.
+#
+#  Un segment per fișier sursă (data/search_index/<hash>.<generație>.seg):
+#    MAGIC | u32 lungime antet | antet JSON | doc ids u32[] | impact f32[]
+#  Listele de postări sunt ordonate descrescător după contribuția
+#  BM25 (fără idf) -> pentru termenii foarte frecvenți citim doar
+#  primele MAX_POSTINGS intrări. idf se calculează la interogare din
+#  toate segmentele, deci un fișier modificat reconstruiește doar
+#  segmentul lui. Segmentul nou primește o generație nouă (alt nume de
+#  fișier) și e comutat în manifest: fișierul vechi, încă mapat (de acest
+#  proces sau de altul), nu e niciodată suprascris - pe Windows os.replace
+#  peste un fișier mapat eșuează.
+#
+#  python src/search_index.py build
+#  python src/search_index.py query "tensiune von mises" --kind doc
+# ================================================================
+
+MAGIC = b"FEASIX01"
+K1 = 1.2
+B = 0.75
+MAX_POSTINGS = 5000
+MIN_TOKEN_LEN = 2
+
+STOPWORDS = frozenset("""
+a ai al ale am ar as asa au ca cand care ce cel cea cei cele cu
+da dar de din dintre doar ea ei el este eu fi fie fost iar il in
+intr intre isi la le lor mai ne nu o or ori pe pentru prin sa se si
+sub sunt te tot un una unei unor unui va voi
+an and are as at be by for from in is it of on or that the this to with
+""".split())
+
+_COMBINING = re.compile(r"[\u0300-\u036f]")
+_TOKEN = re.compile(r"[^\W_]+")
+
+
+# === 1. Tokenizare (fără diacritice) ===
+def normalize(text):
+    """Literă mică, fără diacritice: "Tensiune în oțel" -> "tensiune in otel"."""
+    return _COMBINING.sub("", unicodedata.normalize("NFKD", text)).lower()
+
+
+def tokenize(text):
+    return [t for t in _TOKEN.findall(normalize(text))
+            if len(t) >= MIN_TOKEN_LEN and t not in STOPWORDS]
+
+
+def question_text(q):
+    return " ".join([q.get("question", ""), *q.get("choices", []), q.get("explanation", "")])
+
+
+# === 2. Construcția unui segment ===
+def build_segment(out_path, docs, meta):
+    """
+    docs: iterabil (cheie, domeniu, etichetă sau None, text).
+    Scrie segmentul atomic și întoarce numărul de documente.
+    """
+    keys, domains, labels = [], [], []
+    domain_ids = {}
+    postings = {}
+    lengths = []
+    for key, domain, label, text in docs:
+        doc = len(keys)
+        keys.append(key)
+        domains.append(domain_ids.setdefault(domain, len(domain_ids)))
+        labels.append(label)
+        tokens = tokenize(text)
+        lengths.append(len(tokens))
+        counts = {}
+        for t in tokens:
+            counts[t] = counts.get(t, 0) + 1
+        for t, tf in counts.items():
+            postings.setdefault(t, []).append((doc, tf))
+
+    avgdl = (sum(lengths) / len(lengths)) if lengths else 0.0
+    doc_ids = array("I")
+    impacts = array("f")
+    terms = {}
+    for term in sorted(postings):
+        scored = []
+        for doc, tf in postings[term]:
+            norm = K1 * (1 - B + B * lengths[doc] / avgdl) if avgdl else K1
+            scored.append((tf * (K1 + 1) / (tf + norm), doc))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        terms[term] = [len(doc_ids), len(scored)]
+        doc_ids.extend(doc for _, doc in scored)
+        impacts.extend(impact for impact, _ in scored)
+
+    header = {
+        "meta": meta,
+        "n_docs": len(keys),
+        "keys": keys,
+        "domains": list(domain_ids),
+        "doc_domains": domains,
+        "labels": labels if any(label is not None for label in labels) else None,
+        "terms": terms,
+    }
+    blob = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    blob += b" " * (-(len(MAGIC) + 4 + len(blob)) % 4)  # array-urile încep aliniat la 4 bytes
+
+    tmp_path = f"{out_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(blob)))
+        f.write(blob)
+        f.write(doc_ids.tobytes())
+        f.write(impacts.tobytes())
+    os.replace(tmp_path, out_path)
+    return len(keys)
+
+
+class _Segment:
+    """Segment deschis prin mmap; postările sunt citite doar pentru termenii căutați."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            self._mm.close()
+            raise ValueError(f"Segment invalid: {path}")
+        (header_len,) = struct.unpack_from("<I", self._mm, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(self._mm[start:start + header_len].decode("utf-8"))
+        self.meta = header["meta"]
+        self.n_docs = header["n_docs"]
+        self.keys = header["keys"]
+        self.domains = header["domains"]
+        self.doc_domains = header["doc_domains"]
+        self.labels = header["labels"]
+        self.terms = header["terms"]
+
+        body = start + header_len
+        total = sum(count for _, count in self.terms.values())
+        self._view = memoryview(self._mm)
+        self._doc_ids = self._view[body:body + 4 * total].cast("I")
+        self._impacts = self._view[body + 4 * total:body + 8 * total].cast("f")
+
+    def close(self):
+        """Eliberează maparea (vederile întâi: mmap nu se închide cât timp sunt exportate)."""
+        for view in (self._doc_ids, self._impacts, self._view):
+            view.release()
+        self._mm.close()
+
+    def df(self, term):
+        entry = self.terms.get(term)
+        return entry[1] if entry else 0
+
+    def postings(self, term, limit=MAX_POSTINGS):
+        offset, count = self.terms[term]
+        end = offset + min(count, limit)
+        return self._doc_ids[offset:end], self._impacts[offset:end]
+
+    def domain(self, doc):
+        return self.domains[self.doc_domains[doc]]
+
+
+# === 3. Indexul (toate sursele) ===
+def _signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+class SearchIndex:
+    def __init__(self, directory=None, docs_dir=None, bank=None):
+        self.directory = directory or os.path.join(get_data_dir(), "search_index")
+        self.docs_dir = docs_dir or os.path.join(get_data_dir(), "docs")
+        self.bank = bank
+        self.manifest_path = os.path.join(self.directory, "manifest.json")
+        self.segments = {}   # sursă -> _Segment
+        self._state = None
+        self._lock = threading.Lock()
+
+    # --- surse ---
+    def _bank(self):
+        return self.bank.refresh() if self.bank is not None else get_question_bank()
+
+    def _sources(self, bank):
+        """sursă -> (semnătură, tip). Semnătura băncii include și artefactul compilat."""
+        sources = {
+            os.path.abspath(bank.path): ([_signature(bank.path), _signature(bank.artifact_path)], "question"),
+        }
+        if os.path.isdir(self.docs_dir):
+            for name in sorted(os.listdir(self.docs_dir)):
+                if name.endswith(".json"):
+                    path = os.path.abspath(os.path.join(self.docs_dir, name))
+                    sources[path] = (_signature(path), "doc")
+        return sources
+
+    def _segment_path(self, source, generation):
+        digest = hashlib.sha1(source.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.directory, f"{digest}.{generation}.seg")
+
+    def _close_segment(self, source):
+        segment = self.segments.pop(source, None)
+        if segment is not None:
+            segment.close()
+
+    def _remove_unreferenced(self, manifest):
+        """Șterge segmentele vechi; cele încă mapate de alt proces (Windows) rămân pentru data viitoare."""
+        referenced = {entry["file"] for entry in manifest.values()}
+        for name in os.listdir(self.directory):
+            if name.endswith(".seg") and name not in referenced:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _save_manifest(self, manifest):
+        tmp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.manifest_path)
+
+    # --- construcție incrementală ---
+    def _docs_for(self, source, kind, bank):
+        if kind == "question":
+            for q in bank.questions:
+                yield question_id(q), q.get("domain", "").lower(), None, question_text(q)
+            return
+        domain_key = os.path.splitext(os.path.basename(source))[0]
+        try:
+            with open(source, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            print(f"[WARN] Document Learn Mode invalid: {source}")
+            return
+        for i, sec in enumerate(data.get("sections", [])):
+            subtitle = sec.get("subtitle", "")
+            content = sec.get("content", "")
+            label = subtitle or content[:80]
+            yield f"{domain_key}#{i}", domain_key, label, f"{subtitle} {content}"
+
+    def refresh(self):
+        """Reconstruiește doar segmentele surselor modificate. Returnează self."""
+        bank = self._bank()
+        sources = self._sources(bank)
+        state = {src: sig for src, (sig, _) in sources.items()}
+        if state == self._state:
+            return self
+        with self._lock:
+            if state == self._state:
+                return self
+            os.makedirs(self.directory, exist_ok=True)
+            with file_lock(self.manifest_path):   # alt proces poate actualiza același index
+                manifest = self._load_manifest()
+                changed = False
+                for source, (signature, kind) in sources.items():
+                    entry = manifest.get(source)
+                    if (entry is None or entry["signature"] != signature
+                            or not os.path.exists(os.path.join(self.directory, entry["file"]))):
+                        seg_path = self._segment_path(source, (entry or {}).get("generation", 0) + 1)
+                        n = build_segment(seg_path, self._docs_for(source, kind, bank),
+                                          {"source": source, "kind": kind})
+                        manifest[source] = {"signature": signature, "kind": kind, "docs": n,
+                                            "file": os.path.basename(seg_path),
+                                            "generation": (entry or {}).get("generation", 0) + 1}
+                        changed = True
+                        print(f"[INFO] Index de căutare actualizat: {os.path.basename(source)} ({n} intrări)")
+                for source in [s for s in manifest if s not in sources]:
+                    del manifest[source]
+                    changed = True
+                if changed:
+                    self._save_manifest(manifest)
+
+                # segmentele deschise care nu mai sunt cele din manifest se închid înainte de ștergere
+                for source in list(self.segments):
+                    entry = manifest.get(source)
+                    if entry is None or self.segments[source].path != os.path.join(self.directory, entry["file"]):
+                        self._close_segment(source)
+                if changed:
+                    self._remove_unreferenced(manifest)
+                for source in sources:
+                    if source not in self.segments:
+                        self.segments[source] = _Segment(os.path.join(self.directory, manifest[source]["file"]))
+            self._state = state
+        return self
+
+    # --- interogare ---
+    def search(self, query, kind=None, domain=None, limit=20):
+        """
+        Cele mai relevante `limit` rezultate (BM25), ca dicționare:
+        {"kind", "key", "domain", "label", "score"}.
+        kind: None / "question" / "doc"; domain: None / "mix" sau un domeniu.
+        """
+        with self._lock:  # refresh() poate închide segmentele înlocuite
+            return self._search_locked(query, kind, domain, limit)
+
+    def _search_locked(self, query, kind, domain, limit):
+        terms = list(dict.fromkeys(tokenize(query)))
+        segments = [s for s in self.segments.values() if kind is None or s.meta["kind"] == kind]
+        if not terms or not segments:
+            return []
+        domain = None if not domain or domain.lower() == "mix" else domain.lower()
+
+        n_docs = sum(s.n_docs for s in segments)
+        scores = {}
+        for term in terms:
+            df = sum(s.df(term) for s in segments)
+            if not df:
+                continue
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            for seg_no, seg in enumerate(segments):
+                if not seg.df(term):
+                    continue
+                doc_ids, impacts = seg.postings(term)
+                for doc, impact in zip(doc_ids, impacts):
+                    key = (seg_no, doc)
+                    scores[key] = scores.get(key, 0.0) + idf * impact
+
+        results = []
+        for (seg_no, doc), score in sorted(scores.items(), key=lambda item: item[1], reverse=True):
+            seg = segments[seg_no]
+            doc_domain = seg.domain(doc)
+            if domain is not None and doc_domain != domain:
+                continue
+            results.append({
+                "kind": seg.meta["kind"],
+                "key": seg.keys[doc],
+                "domain": doc_domain,
+                "label": seg.labels[doc] if seg.labels else None,
+                "score": round(score, 4),
+            })
+            if len(results) >= limit:
+                break
+        return results
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_search_index():
+    """Indexul procesului, reconstruit incremental dacă sursele s-au schimbat."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = SearchIndex()
+    return _index.refresh()
+
+
+def search_question_indices(query, domain="mix", limit=200, bank=None):
+    """Indicii (în `bank`) ai întrebărilor potrivite cu `query`, în ordinea relevanței."""
+    bank = bank or get_question_bank()
+    indices = []
+    for hit in get_search_index().search(query, kind="question", domain=domain, limit=limit):
+        index = bank.by_id.get(hit["key"])
+        if index is not None:
+            indices.append(index)
+    return indices
+
+
+def search_questions(query, domain="mix", limit=200):
+    """Întrebările din bancă potrivite cu `query`, în ordinea relevanței."""
+    bank = get_question_bank()
+    return [bank.questions[i] for i in search_question_indices(query, domain, limit, bank)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Index de căutare pentru întrebări și Learn Mode.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help="construiește / actualizează indexul")
+    query = sub.add_parser("query", help="caută în index")
+    query.add_argument("text")
+    query.add_argument("--kind", choices=("question", "doc"))
+    query.add_argument("--domain")
+    query.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    index = get_search_index()
+    if args.command == "build":
+        print(f"[INFO] {sum(s.n_docs for s in index.segments.values())} intrări în {index.directory}")
+        return 0
+    for hit in index.search(args.text, args.kind, args.domain, args.limit):
+        label = hit["label"]
+        if label is None and hit["kind"] == "question":
+            label = (get_question_bank().get(hit["key"]) or {}).get("question", "")
+        print(f"{hit['score']:>8.3f}  [{hit['kind']}/{hit['domain']}] {hit['key']}  {label}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+# session_journal.py
+import atexit
+import json
+import os
+import re
+import threading
+
+from data_loader import get_data_dir
+from stats_aggregates import StatsAggregate
+
+# ================================================================
+#  SESSION JOURNAL - backend "journal" pentru stats_manager
+#
+#  stats_snapshot.<gen>.json  -> starea compactată (tot ce e înainte de gen)
+#  stats_journal.<gen>.jsonl  -> o linie JSON per înregistrare nouă
+#  stats_aggregate.<gen>.json -> agregatul statisticilor la momentul snapshot-ului
+#
+#  add_session = o linie adăugată la final (+ fsync după politică).
+#  La fiecare `snapshot_every` linii se scrie snapshot-ul gen+1 și se
+#  începe un jurnal nou; încărcarea = snapshot + cel mult N linii.
+# ================================================================
+
+FSYNC_POLICIES = ("always", "every_n", "exit")
+_SNAPSHOT_RE = re.compile(r"^stats_snapshot\.(\d+)\.json$")
+
+
+class JournalStore:
+    def __init__(self, data_dir=None, snapshot_every=1000, fsync="every_n", fsync_every=100):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Politică fsync necunoscută: {fsync}")
+        self.data_dir = data_dir or get_data_dir()
+        self.snapshot_every = max(1, int(snapshot_every))
+        self.fsync = fsync
+        self.fsync_every = max(1, int(fsync_every))
+
+        self._lock = threading.RLock()
+        self._gen = self._find_generation()
+        self._state = None        # {"sessions": [...], "leaderboard": [...]} după prima încărcare
+        self._tail_count = None   # linii în jurnalul generației curente
+        self._agg = None          # StatsAggregate curent (snapshot + jurnal)
+        self._fh = None
+        self._unsynced = 0
+        atexit.register(self.close)
+
+    # === 1. Fișiere ===
+    def _snapshot_path(self, gen):
+        return os.path.join(self.data_dir, f"stats_snapshot.{gen}.json")
+
+    def _aggregate_path(self, gen):
+        return os.path.join(self.data_dir, f"stats_aggregate.{gen}.json")
+
+    def _journal_path(self, gen):
+        return os.path.join(self.data_dir, f"stats_journal.{gen}.jsonl")
+
+    def _find_generation(self):
+        gens = [int(m.group(1)) for m in map(_SNAPSHOT_RE.match, os.listdir(self.data_dir)) if m]
+        return max(gens, default=0)
+
+    def _open_journal(self):
+        if self._fh is None:
+            path = self._journal_path(self._gen)
+            torn = False
+            if os.path.exists(path) and os.path.getsize(path) > 0:
+                with open(path, "rb") as f:
+                    f.seek(-1, os.SEEK_END)
+                    torn = f.read(1) != b"\n"
+            self._fh = open(path, "a", encoding="utf-8")
+            if torn:
+                # ultima linie e incompletă (crash) -> următoarea începe pe rând nou
+                self._fh.write("\n")
+        return self._fh
+
+    # === 2. Încărcare: snapshot + replay jurnal ===
+    def _read_snapshot(self):
+        try:
+            with open(self._snapshot_path(self._gen), "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            snapshot = {}
+        return {
+            "sessions": snapshot.get("sessions", []),
+            "leaderboard": snapshot.get("leaderboard", []),
+        }
+
+    def _read_tail(self):
+        records = []
+        try:
+            with open(self._journal_path(self._gen), "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        # linie scrisă pe jumătate la un crash -> ignorată
+                        continue
+        except FileNotFoundError:
+            pass
+        return records
+
+    def _apply(self, state, record):
+        kind = record.get("kind")
+        if kind == "session":
+            state["sessions"].append(record["data"])
+        elif kind == "leaderboard":
+            state["leaderboard"].append(record["data"])
+
+    def _load_state(self):
+        if self._state is None:
+            state = self._read_snapshot()
+            tail = self._read_tail()
+            for record in tail:
+                self._apply(state, record)
+            self._state = state
+            self._tail_count = len(tail)
+        return self._state
+
+    def _ensure_tail_count(self):
+        if self._tail_count is None:
+            try:
+                with open(self._journal_path(self._gen), "rb") as f:
+                    self._tail_count = f.read().count(b"\n")
+            except FileNotFoundError:
+                self._tail_count = 0
+
+    # === 3. Scriere ===
+    def _sync(self, force=False):
+        if self._fh is None or (not force and self._unsynced == 0):
+            return
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self._unsynced = 0
+
+    def _append(self, kind, data):
+        with self._lock:
+            self._ensure_tail_count()
+            fh = self._open_journal()
+            fh.write(json.dumps({"kind": kind, "data": data}, ensure_ascii=False) + "\n")
+            fh.flush()
+            self._unsynced += 1
+            if self.fsync == "always" or (self.fsync == "every_n" and self._unsynced >= self.fsync_every):
+                self._sync()
+
+            if self._state is not None:
+                self._apply(self._state, {"kind": kind, "data": data})
+            if self._agg is not None and kind == "session":
+                self._agg.add(data)
+            self._tail_count += 1
+            if self._tail_count >= self.snapshot_every:
+                self.compact()
+
+    def compact(self):
+        """Scrie snapshot-ul generației următoare și începe un jurnal nou."""
+        with self._lock:
+            state = self._load_state()
+            self._write_snapshot(state, self.load_summary())
+
+    def _write_json(self, path, data):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _write_snapshot(self, state, agg):
+        new_gen = self._gen + 1
+        # agregatul întâi: un snapshot fără agregat ar fi recalculat, invers nu
+        self._write_json(self._aggregate_path(new_gen), agg.to_dict())
+        self._write_json(self._snapshot_path(new_gen), state)
+
+        # snapshot-ul nou e durabil -> generația veche nu mai e necesară
+        self._sync()
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        old_gen, self._gen = self._gen, new_gen
+        self._tail_count = 0
+        self._agg = agg
+        for old in (self._snapshot_path(old_gen), self._journal_path(old_gen),
+                    self._aggregate_path(old_gen)):
+            try:
+                os.remove(old)
+            except FileNotFoundError:
+                pass
+
+    def close(self):
+        with self._lock:
+            self._sync(force=self._unsynced > 0)
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+    # === 4. Interfața backend-ului ===
+    def load_sessions(self):
+        with self._lock:
+            return list(self._load_state()["sessions"])
+
+    def add_session(self, result):
+        self._append("session", result)
+
+    def add_sessions(self, results):
+        with self._lock:
+            for result in results:
+                self._append("session", result)
+
+    def replace_sessions(self, sessions):
+        with self._lock:
+            sessions = list(sessions)
+            state = self._load_state()
+            self._write_snapshot({"sessions": sessions, "leaderboard": state["leaderboard"]},
+                                 StatsAggregate.from_sessions(sessions))
+            self._state = None
+
+    def load_summary(self):
+        """Agregatul din stats_aggregate.<gen>.json + sesiunile din jurnal (fără snapshot)."""
+        with self._lock:
+            if self._agg is None:
+                try:
+                    with open(self._aggregate_path(self._gen), "r", encoding="utf-8") as f:
+                        agg = StatsAggregate(json.load(f))
+                except (FileNotFoundError, json.JSONDecodeError):
+                    if os.path.exists(self._snapshot_path(self._gen)):
+                        return self.rebuild_summary()
+                    agg = StatsAggregate()
+                for record in self._read_tail():
+                    if record.get("kind") == "session":
+                        agg.add(record["data"])
+                self._agg = agg
+            return self._agg
+
+    def rebuild_summary(self):
+        with self._lock:
+            agg = StatsAggregate.from_sessions(self._load_state()["sessions"])
+            if os.path.exists(self._snapshot_path(self._gen)):
+                # agregatul generației curente nu include jurnalul -> se scrie doar partea din snapshot
+                self._write_json(self._aggregate_path(self._gen),
+                                 StatsAggregate.from_sessions(self._read_snapshot()["sessions"]).to_dict())
+            self._agg = agg
+            return agg
+
+    def load_leaderboard(self):
+        with self._lock:
+            return list(self._load_state()["leaderboard"])
+
+    def add_leaderboard_entry(self, entry):
+        self._append("leaderboard", entry)
+
+    def replace_leaderboard(self, entries):
+        with self._lock:
+            state = self._load_state()
+            self._write_snapshot({"sessions": state["sessions"], "leaderboard": list(entries)},
+                                 self.load_summary())
+            self._state = None
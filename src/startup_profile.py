@@ -0,0 +1,143 @@
+# startup_profile.py
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from data_loader import load_settings
+
+# ================================================================
+#  STARTUP PROFILE - cât durează pornirea la rece a ui_modern până la
+#  meniul principal desenat, și unde se duce timpul:
+#  - fiecare rulare e un proces nou (python -X importtime ui_modern.py),
+#    care construiește fereastra, forțează primul paint și raportează
+#  - defalcare: importuri (top module, cumulativ), construcția ferestrei,
+#    primul paint, total (de la lansarea procesului)
+#  - verificare de regresie: cod de ieșire 1 dacă mediana totalului
+#    depășește bugetul (--budget-ms sau "startup_budget_ms" din settings)
+#
+#  python src/ui_modern.py --profile-startup --runs 5 --budget-ms 1500
+# ================================================================
+
+CHILD_ENV = "FEA_STARTUP_PROFILE"
+MARKER = "STARTUP_PROFILE "
+DEFAULT_BUDGET_MS = 2000
+DEFAULT_TIMEOUT_S = 60
+UI_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ui_modern.py")
+
+
+# === 1. În procesul copil (apelat din ui_modern.__main__) ===
+def report_child(app, import_started, imported):
+    """Desenează meniul principal, trimite timpii procesului părinte și închide fereastra."""
+    constructed = time.perf_counter()
+    app.update()
+    painted = time.perf_counter()
+    phases = {
+        "ui_imports_ms": (imported - import_started) * 1000,
+        "window_ms": (constructed - imported) * 1000,
+        "first_paint_ms": (painted - constructed) * 1000,
+    }
+    print(MARKER + json.dumps(phases), flush=True)
+    app.destroy()
+
+
+# === 2. În procesul părinte ===
+def parse_importtime(text):
+    """Modulele de pe primul nivel din ieșirea -X importtime: {nume: ms cumulativ}."""
+    modules = {}
+    for line in text.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            _, cumulative, name = line[len("import time:"):].split("|")
+        except ValueError:
+            continue
+        if name.startswith("  "):   # importat de alt modul -> inclus în cumulativul părintelui
+            continue
+        modules[name.strip()] = int(cumulative) / 1000
+    return modules
+
+
+def run_once(timeout=DEFAULT_TIMEOUT_S):
+    """O pornire la rece. Întoarce (faze, module, eroare); copilul blocat e oprit după `timeout` s."""
+    env = dict(os.environ, **{CHILD_ENV: "1"})
+    with tempfile.TemporaryFile(mode="w+", encoding="utf-8", errors="replace") as err:
+        started = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, "-X", "importtime", UI_SCRIPT],
+                                stdout=subprocess.PIPE, stderr=err, text=True, env=env)
+        found = []
+
+        def read_stdout():
+            # pe un thread: timpul total e momentul în care apare marcajul, nu ieșirea procesului
+            for line in proc.stdout:
+                if line.startswith(MARKER) and not found:
+                    total_ms = (time.perf_counter() - started) * 1000
+                    found.append(dict(json.loads(line[len(MARKER):]), total_ms=total_ms))
+
+        reader = threading.Thread(target=read_stdout, daemon=True)
+        reader.start()
+        timed_out = False
+        try:
+            proc.wait(timeout)
+        except subprocess.TimeoutExpired:   # ex. o fereastră modală de eroare Tk
+            timed_out = True
+            proc.kill()
+            proc.wait()
+        reader.join()
+        err.seek(0)
+        stderr = err.read()
+    modules = parse_importtime(stderr)
+    if found:
+        return found[0], modules, None
+    if timed_out:
+        return None, modules, f"procesul nu s-a încheiat în {timeout:.0f} s și a fost oprit"
+    tail = [l for l in stderr.splitlines() if not l.startswith("import time:")][-1:]
+    return None, modules, " | ".join(tail) or f"cod de ieșire {proc.returncode}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profil de pornire ui_modern (importuri + primul paint).")
+    parser.add_argument("--runs", type=int, default=3, help="câte porniri la rece (se raportează mediana)")
+    parser.add_argument("--budget-ms", type=float,
+                        help=f"bugetul pornirii (implicit settings startup_budget_ms / {DEFAULT_BUDGET_MS})")
+    parser.add_argument("--top", type=int, default=12, help="câte module să afișeze")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_S,
+                        help="secunde per pornire; procesul blocat e oprit")
+    args = parser.parse_args(argv)
+    budget = args.budget_ms or float(load_settings().get("startup_budget_ms", DEFAULT_BUDGET_MS))
+
+    runs, module_runs = [], []
+    for _ in range(max(1, args.runs)):
+        phases, modules, error = run_once(args.timeout)
+        module_runs.append(modules)
+        if error:
+            print(f"[WARN] Fereastra nu a putut fi creată (display lipsă / blocată?): {error}")
+            break
+        runs.append(phases)
+
+    names = set().union(*module_runs)
+    medians = {name: statistics.median(m.get(name, 0.0) for m in module_runs) for name in names}
+    print(f"Importuri (cumulativ, mediana din {len(module_runs)} rulări):")
+    for name, ms in sorted(medians.items(), key=lambda kv: -kv[1])[:args.top]:
+        print(f"  {ms:9.1f} ms  {name}")
+    if not runs:
+        return 2
+
+    print(f"Faze (mediana din {len(runs)} rulări):")
+    for key in ("ui_imports_ms", "window_ms", "first_paint_ms", "total_ms"):
+        print(f"  {statistics.median(r[key] for r in runs):9.1f} ms  {key[:-3]}")
+    total = statistics.median(r["total_ms"] for r in runs)
+    if total > budget:
+        print(f"[WARN] Pornirea durează {total:.0f} ms, peste bugetul de {budget:.0f} ms")
+        return 1
+    print(f"[INFO] Pornire {total:.0f} ms (buget {budget:.0f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+# stats_aggregates.py
+import math
+
+# ================================================================
+#  STATS AGGREGATES - rezumatul statisticilor, actualizat incremental
+#  (count / sum / sum of squares / best / timp) per total, domeniu, mod.
+#  get_summary citește doar acest record, nu tot istoricul.
+# ================================================================
+
+
+def _empty_bucket():
+    return {"count": 0, "sum": 0.0, "sumsq": 0.0, "best": 0.0, "time_used": 0}
+
+
+def _add_to_bucket(bucket, percent, time_used):
+    bucket["count"] += 1
+    bucket["sum"] += percent
+    bucket["sumsq"] += percent * percent
+    bucket["best"] = max(bucket["best"], percent) if bucket["count"] > 1 else percent
+    bucket["time_used"] += time_used
+
+
+def _bucket_summary(bucket):
+    n = bucket["count"]
+    if not n:
+        return {"total_sessions": 0, "avg_score": 0, "best_score": 0, "std_score": 0, "total_time": 0}
+    avg = bucket["sum"] / n
+    var = max(bucket["sumsq"] / n - avg * avg, 0.0)
+    return {
+        "total_sessions": n,
+        "avg_score": round(avg, 2),
+        "best_score": bucket["best"],
+        "std_score": round(math.sqrt(var), 2),
+        "total_time": bucket["time_used"],
+    }
+
+
+class StatsAggregate:
+    def __init__(self, data=None):
+        data = data or {}
+        self.total = data.get("total") or _empty_bucket()
+        self.by_domain = data.get("by_domain") or {}
+        self.by_mode = data.get("by_mode") or {}
+
+    @classmethod
+    def from_sessions(cls, sessions):
+        """Recalculează agregatul din istoricul complet (calea de rebuild)."""
+        agg = cls()
+        for s in sessions:
+            agg.add(s)
+        return agg
+
+    def add(self, session):
+        percent = float(session.get("percent", 0) or 0)
+        time_used = session.get("time_used", 0) or 0
+        _add_to_bucket(self.total, percent, time_used)
+        domain = session.get("domain", "mix") or "mix"
+        mode = session.get("mode", "") or ""
+        _add_to_bucket(self.by_domain.setdefault(domain, _empty_bucket()), percent, time_used)
+        _add_to_bucket(self.by_mode.setdefault(mode, _empty_bucket()), percent, time_used)
+
+    def to_dict(self):
+        return {"total": self.total, "by_domain": self.by_domain, "by_mode": self.by_mode}
+
+    def summary(self):
+        result = _bucket_summary(self.total)
+        result["by_domain"] = {d: _bucket_summary(b) for d, b in sorted(self.by_domain.items())}
+        result["by_mode"] = {m: _bucket_summary(b) for m, b in sorted(self.by_mode.items())}
+        return result
@@ -1,42 +1,78 @@
 # stats_manager.py
-import json
-import os
 from datetime import datetime
 
-STATS_FILE = os.path.join("data", "stats.json")
+from leaderboard_index import get_leaderboard_index
+from metrics import inc, span, timed
+from stats_aggregates import StatsAggregate
+from storage import get_store
 
 
 def load_stats():
-    if not os.path.exists(STATS_FILE):
-        return []
-    try:
-        with open(STATS_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except json.JSONDecodeError:
-        return []
+    return get_store().load_sessions()
 
 
 def save_stats(data):
-    os.makedirs("data", exist_ok=True)
-    with open(STATS_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+    get_store().replace_sessions(data)
 
 
+@timed("add_session")
 def add_session(result):
-    stats = load_stats()
     result["date"] = datetime.now().strftime("%Y-%m-%d %H:%M")
-    stats.append(result)
-    save_stats(stats)
+    # indexul întâi: la prima rulare e reconstruit din istoric, care nu trebuie să conțină deja sesiunea
+    index = get_leaderboard_index()
+    get_store().add_session(result)
+    index.add(result)
+    inc("sessions_saved")
     print(f"[INFO] Sesiune salvată: {result}")
 
 
-def get_summary(stats):
-    if not stats:
-        return {"total_sessions": 0, "avg_score": 0, "best_score": 0}
-    avg = sum(s["percent"] for s in stats) / len(stats)
-    best = max(s["percent"] for s in stats)
-    return {"total_sessions": len(stats), "avg_score": round(avg, 2), "best_score": best}
+def add_sessions(results):
+    """
+    Salvează mai multe sesiuni deodată (ex. quiz_server sub încărcare):
+    backend-ul și indexul de clasament sunt scrise o singură dată pentru tot lotul.
+    """
+    if not results:
+        return
+    date = datetime.now().strftime("%Y-%m-%d %H:%M")
+    store = get_store()
+    index = get_leaderboard_index()
+    with span("add_sessions"):
+        for result in results:
+            result["date"] = date
+        store.add_sessions(results)
+        for result in results:
+            index.add(result, save=False)
+        index.save()
+    inc("sessions_saved", len(results))
+    print(f"[INFO] {len(results)} sesiuni salvate")
 
 
-def get_leaderboard(stats, top_n=5):
+def get_summary(stats=None):
+    """
+    Rezumatul statisticilor.
+    Fără argument citește doar agregatul persistat (O(1) față de istoric);
+    cu o listă de sesiuni îl calculează din ea, ca înainte.
+    """
+    if stats is None:
+        return get_store().load_summary().summary()
+    return StatsAggregate.from_sessions(stats).summary()
+
+
+def rebuild():
+    """Recalculează agregatul din istoricul complet și îl salvează."""
+    return get_store().rebuild_summary().summary()
+
+
+def get_leaderboard(stats=None, top_n=5, domain="*", mode="*"):
+    """
+    Cele mai bune `top_n` sesiuni.
+    Fără listă de sesiuni citește top-K din indexul incremental (fără sortare).
+    """
+    if stats is None:
+        return get_leaderboard_index().top(domain, mode, top_n)
     return sorted(stats, key=lambda s: s.get("percent", 0), reverse=True)[:top_n]
+
+
+def get_rank(percent, domain="*", mode="*"):
+    """(loc, total) al unui scor în clasamentul (domeniu, mod), în O(log n)."""
+    return get_leaderboard_index().rank(percent, domain, mode)
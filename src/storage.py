@@ -0,0 +1,137 @@
+# storage.py
+import json
+import os
+import threading
+
+from data_loader import get_data_dir, load_settings
+from safe_writer import GroupCommitFile, atomic_write_json, file_lock
+from stats_aggregates import StatsAggregate
+
+# ================================================================
+#  STORAGE - alegerea backend-ului pentru sesiuni + leaderboard
+#  data/settings.json -> "stats_backend": "sqlite" (implicit) | "journal" | "json"
+# ================================================================
+
+DEFAULT_BACKEND = "sqlite"
+
+
+class JsonStore:
+    """
+    Backend-ul istoric: fișiere JSON rescrise integral la fiecare salvare.
+    Păstrat pentru compatibilitate (ex. date pe un share de rețea): adăugările
+    trec prin safe_writer (lock între procese + group commit), deci mai multe
+    instanțe pe același director nu își pierd sesiunile una alteia.
+    """
+
+    def __init__(self, data_dir=None):
+        data_dir = data_dir or get_data_dir()
+        self.stats_path = os.path.join(data_dir, "stats.json")
+        self.leaderboard_path = os.path.join(data_dir, "leaderboard.json")
+        self.summary_path = os.path.join(data_dir, "stats_summary.json")
+        self.sessions_file = GroupCommitFile(self.stats_path, _extend, self._load,
+                                             on_commit=self._sessions_committed, indent=4)
+        self.leaderboard_file = GroupCommitFile(self.leaderboard_path, _extend, self._load, indent=4)
+
+    def _load(self, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return []
+        return data if isinstance(data, list) else []
+
+    def _save(self, path, data):
+        atomic_write_json(path, data, indent=4)
+
+    def load_sessions(self):
+        return self._load(self.stats_path)
+
+    def add_session(self, result):
+        self.sessions_file.submit(result)
+
+    def add_sessions(self, results):
+        self.sessions_file.submit_many(results)
+
+    def _sessions_committed(self, sessions, added):
+        # sub lock-ul lui stats.json -> agregatul nu e actualizat concurent
+        if os.path.exists(self.summary_path):
+            agg = self.load_summary()
+            for result in added:
+                agg.add(result)
+            self._save(self.summary_path, agg.to_dict())
+
+    def replace_sessions(self, sessions):
+        sessions = list(sessions)
+        with self.sessions_file.lock:
+            self.sessions_file.update(lambda _: sessions)
+            self._save(self.summary_path, StatsAggregate.from_sessions(sessions).to_dict())
+
+    def load_summary(self):
+        try:
+            with open(self.summary_path, "r", encoding="utf-8") as f:
+                return StatsAggregate(json.load(f))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return self.rebuild_summary()
+
+    def rebuild_summary(self):
+        with file_lock(self.stats_path):
+            agg = StatsAggregate.from_sessions(self.load_sessions())
+            self._save(self.summary_path, agg.to_dict())
+        return agg
+
+    def load_leaderboard(self):
+        return self._load(self.leaderboard_path)
+
+    def add_leaderboard_entry(self, entry):
+        self.leaderboard_file.submit(entry)
+
+    def replace_leaderboard(self, entries):
+        entries = list(entries)
+        self.leaderboard_file.update(lambda _: entries)
+
+    def close(self):
+        pass
+
+
+def _extend(items, added):
+    items.extend(added)
+    return items
+
+
+def create_store(backend=None, data_dir=None):
+    """Construiește backend-ul cerut (fără a-l reține global)."""
+    backend = (backend or load_settings().get("stats_backend", DEFAULT_BACKEND)).lower()
+    if backend == "json":
+        return JsonStore(data_dir)
+    if backend == "sqlite":
+        from storage_sqlite import SqliteStore, migrate_json
+
+        data_dir = data_dir or get_data_dir()
+        store = SqliteStore(os.path.join(data_dir, "fea_stats.db"))
+        migrate_json(store, data_dir)
+        return store
+    if backend == "journal":
+        from session_journal import JournalStore
+
+        settings = load_settings()
+        return JournalStore(
+            data_dir,
+            snapshot_every=settings.get("journal_snapshot_every", 1000),
+            fsync=settings.get("journal_fsync", "every_n"),
+            fsync_every=settings.get("journal_fsync_every", 100),
+        )
+    raise ValueError(f"Backend de stocare necunoscut: {backend}")
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Backend-ul de stocare al procesului (creat la primul apel)."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = create_store()
+    return _store
@@ -0,0 +1,285 @@
+# storage_sqlite.py
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+
+from data_loader import get_data_dir, load_settings
+from stats_aggregates import StatsAggregate
+
+# ================================================================
+#  STORAGE SQLITE - sesiuni + leaderboard într-o bază sqlite3 (WAL)
+#  Fiecare salvare = un singur INSERT, indiferent de mărimea istoricului.
+# ================================================================
+
+SESSION_COLUMNS = ("mode", "domain", "score", "total", "percent", "time_used",
+                   "correct", "incorrect", "date")
+LEADERBOARD_COLUMNS = ("name", "score", "mode", "domain", "date")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id        INTEGER PRIMARY KEY,
+    mode      TEXT,
+    domain    TEXT,
+    score     INTEGER,
+    total     INTEGER,
+    percent   REAL,
+    time_used INTEGER,
+    correct   INTEGER,
+    incorrect INTEGER,
+    date      TEXT,
+    extra     TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_domain  ON sessions(domain);
+CREATE INDEX IF NOT EXISTS idx_sessions_mode    ON sessions(mode);
+CREATE INDEX IF NOT EXISTS idx_sessions_percent ON sessions(percent);
+CREATE INDEX IF NOT EXISTS idx_sessions_date    ON sessions(date);
+
+CREATE TABLE IF NOT EXISTS leaderboard (
+    id     INTEGER PRIMARY KEY,
+    name   TEXT,
+    score  REAL,
+    mode   TEXT,
+    domain TEXT,
+    date   TEXT,
+    extra  TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_leaderboard_score ON leaderboard(score);
+CREATE INDEX IF NOT EXISTS idx_leaderboard_mode  ON leaderboard(mode);
+CREATE INDEX IF NOT EXISTS idx_leaderboard_date  ON leaderboard(date);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _insert_sql(table, columns):
+    return f"INSERT INTO {table} ({', '.join(columns)}, extra) VALUES ({', '.join('?' * (len(columns) + 1))})"
+
+
+INSERT_SESSION = _insert_sql("sessions", SESSION_COLUMNS)
+INSERT_LEADERBOARD = _insert_sql("leaderboard", LEADERBOARD_COLUMNS)
+SELECT_SESSIONS = f"SELECT {', '.join(SESSION_COLUMNS)}, extra FROM sessions ORDER BY id"
+SELECT_LEADERBOARD = f"SELECT {', '.join(LEADERBOARD_COLUMNS)}, extra FROM leaderboard ORDER BY id"
+IMPORT_TABLES = ("sessions", "leaderboard")
+
+
+def _to_row(record, columns):
+    extra = {k: v for k, v in record.items() if k not in columns}
+    return tuple(record.get(c) for c in columns) + (
+        json.dumps(extra, ensure_ascii=False) if extra else None,)
+
+
+def _from_row(row, columns):
+    record = {c: v for c, v in zip(columns, row) if v is not None}
+    if row[-1]:
+        record.update(json.loads(row[-1]))
+    return record
+
+
+class SqliteStore:
+    """
+    Backend de stocare pe sqlite3.
+    - o conexiune per thread (sqlite3 nu partajează conexiuni între thread-uri)
+    - WAL: cititorii nu blochează scrierea, commit-ul e sigur la crash
+    - INSERT-urile folosesc aceleași instrucțiuni SQL -> rămân în cache-ul de statement-uri
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(get_data_dir(), "fea_stats.db")
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+
+    # === 1. Conexiune ===
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with self._init_lock:
+                conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # === 2. Sesiuni ===
+    def load_sessions(self):
+        return [_from_row(r, SESSION_COLUMNS) for r in self._conn().execute(SELECT_SESSIONS)]
+
+    def add_session(self, result):
+        self.add_sessions([result])
+
+    def add_sessions(self, results):
+        results = list(results)
+        conn = self._conn()
+        with conn:
+            # BEGIN IMMEDIATE: agregatul e citit și rescris în aceeași tranzacție cu INSERT-urile
+            conn.execute("BEGIN IMMEDIATE")
+            agg = self._read_aggregate(conn)
+            conn.executemany(INSERT_SESSION, (_to_row(r, SESSION_COLUMNS) for r in results))
+            if agg is not None:
+                for result in results:
+                    agg.add(result)
+                self._write_aggregate(conn, agg)
+
+    def replace_sessions(self, sessions):
+        sessions = list(sessions)
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM sessions")
+            conn.executemany(INSERT_SESSION, (_to_row(s, SESSION_COLUMNS) for s in sessions))
+            self._write_aggregate(conn, StatsAggregate.from_sessions(sessions))
+
+    def count_sessions(self):
+        return self._conn().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    # === 3. Agregat statistici (rând în tabela meta) ===
+    def _read_aggregate(self, conn):
+        row = conn.execute("SELECT value FROM meta WHERE key = 'aggregate'").fetchone()
+        return None if row is None else StatsAggregate(json.loads(row[0]))
+
+    def _write_aggregate(self, conn, agg):
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('aggregate', ?)",
+                     (json.dumps(agg.to_dict(), ensure_ascii=False),))
+
+    def load_summary(self):
+        agg = self._read_aggregate(self._conn())
+        return agg if agg is not None else self.rebuild_summary()
+
+    def rebuild_summary(self):
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute("SELECT percent, domain, mode, time_used FROM sessions")
+            agg = StatsAggregate.from_sessions(
+                {"percent": p, "domain": d, "mode": m, "time_used": t} for p, d, m, t in rows)
+            self._write_aggregate(conn, agg)
+        return agg
+
+    # === 4. Leaderboard ===
+    def load_leaderboard(self):
+        return [_from_row(r, LEADERBOARD_COLUMNS) for r in self._conn().execute(SELECT_LEADERBOARD)]
+
+    def add_leaderboard_entry(self, entry):
+        conn = self._conn()
+        with conn:
+            conn.execute(INSERT_LEADERBOARD, _to_row(entry, LEADERBOARD_COLUMNS))
+
+    def replace_leaderboard(self, entries):
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM leaderboard")
+            conn.executemany(INSERT_LEADERBOARD, (_to_row(e, LEADERBOARD_COLUMNS) for e in entries))
+
+    # === 5. Meta ===
+    def get_meta(self, key, default=None):
+        row = self._conn().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return default if row is None else row[0]
+
+    def set_meta(self, key, value):
+        conn = self._conn()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+
+# === 6. Migrare one-shot din fișierele JSON ===
+def _read_json_list(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
+    return data if isinstance(data, list) else []
+
+
+def _max_ids(conn):
+    return {table: conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+            for table in IMPORT_TABLES}
+
+
+def _delete_imported(conn, import_ids):
+    """Șterge rândurile importate anterior (intervalele de id-uri din meta)."""
+    for table in IMPORT_TABLES:
+        first, last = import_ids.get(table, (1, 0))
+        conn.execute(f"DELETE FROM {table} WHERE id BETWEEN ? AND ?", (first, last))
+
+
+def migrate_json(store, data_dir=None, force=False):
+    """
+    Importă stats.json, results.json și leaderboard.json în baza sqlite.
+    Rulează o singură dată (marcaj în tabela meta), cu excepția force=True, care
+    înlocuiește rândurile importate data trecută (sesiunile adăugate între timp
+    de aplicație rămân). Fișierele JSON nu sunt șterse.
+    Returnează (sesiuni, intrări leaderboard) importate.
+    """
+    data_dir = data_dir or get_data_dir()
+    migrated = store.get_meta("json_migrated")
+    if migrated and not force:
+        return 0, 0
+
+    sessions = [s for s in (_read_json_list(os.path.join(data_dir, "stats.json"))
+                            + _read_json_list(os.path.join(data_dir, "results.json"))) if isinstance(s, dict)]
+    leaders = [e for e in _read_json_list(os.path.join(data_dir, "leaderboard.json")) if isinstance(e, dict)]
+    import_ids = store.get_meta("json_import_ids")
+
+    conn = store._conn()
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        if migrated and import_ids:
+            # fără intervale (bază migrată de o versiune mai veche) = nimic de înlocuit
+            _delete_imported(conn, json.loads(import_ids))
+        before = _max_ids(conn)
+        conn.executemany(INSERT_SESSION, (_to_row(s, SESSION_COLUMNS) for s in sessions))
+        conn.executemany(INSERT_LEADERBOARD, (_to_row(e, LEADERBOARD_COLUMNS) for e in leaders))
+        after = _max_ids(conn)
+        ids = {table: (before[table] + 1, after[table]) for table in IMPORT_TABLES}
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('json_import_ids', ?)", (json.dumps(ids),))
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('json_migrated', '1')")
+        conn.execute("DELETE FROM meta WHERE key = 'aggregate'")  # recalculat la prima citire
+
+    if sessions or leaders:
+        print(f"[INFO] Migrare JSON -> sqlite: {len(sessions)} sesiuni, {len(leaders)} intrări leaderboard.")
+    if migrated:
+        _rebuild_leaderboard_index(store, data_dir)
+    return len(sessions), len(leaders)
+
+
+def _rebuild_leaderboard_index(store, data_dir):
+    """Indexul de clasament persistat nu mai corespunde sesiunilor -> reconstruit (dacă există)."""
+    from leaderboard_index import LeaderboardIndex
+    from safe_writer import file_lock
+
+    path = os.path.join(data_dir, "leaderboard_index.json")
+    with file_lock(path):
+        if os.path.exists(path):
+            index = LeaderboardIndex(path, k=load_settings().get("leaderboard_top_k", 10))
+            index.rebuild(store.load_sessions())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Utilitare pentru baza sqlite de statistici.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    mig = sub.add_parser("migrate", help="importă stats.json / results.json / leaderboard.json")
+    mig.add_argument("--db", help="calea bazei (implicit data/fea_stats.db)")
+    mig.add_argument("--force", action="store_true",
+                     help="reimportă, înlocuind rândurile importate data trecută")
+    args = parser.parse_args(argv)
+
+    store = SqliteStore(args.db)
+    sessions, leaders = migrate_json(store, force=args.force)
+    print(f"[INFO] Importate: {sessions} sesiuni, {leaders} intrări leaderboard.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+# thumbnail_cache.py
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image
+
+from data_loader import get_data_dir
+
+# ================================================================
+#  THUMBNAIL CACHE - imagini pre-scalate pe disc (data/.thumbs)
+#  <hash sursă>_<w>x<h>.png pentru fiecare dimensiune de afișare.
+#  manifest.json: cale sursă -> (mtime, size, hash), ca să nu recitim
+#  fișierele mari (post-procesare solver, MB întregi) la fiecare afișare.
+#
+#  python src/thumbnail_cache.py warm --jobs 4
+# ================================================================
+
+DISPLAY_SIZES = ((500, 300), (800, 400))  # întrebare / Learn Mode
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".bmp")
+
+
+def cache_dir():
+    path = os.path.join(get_data_dir(), ".thumbs")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def source_hash(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def thumb_name(digest, size):
+    return f"{digest}_{size[0]}x{size[1]}.png"
+
+
+def render_thumbnail(src, dst, size):
+    """Decodează sursa o singură dată și scrie varianta redimensionată (scriere atomică)."""
+    with Image.open(src) as img:
+        img = img.convert("RGBA")
+        # reducing_gap: micșorare în pași (reduce() întâi) -> mult mai rapid pe surse mari
+        img.thumbnail(size, reducing_gap=2.0)
+        tmp = f"{dst}.{os.getpid()}.tmp"
+        img.save(tmp, "PNG")
+    os.replace(tmp, dst)
+
+
+class ThumbnailCache:
+    def __init__(self, directory=None):
+        self.directory = directory or cache_dir()
+        self.manifest_path = os.path.join(self.directory, "manifest.json")
+        self._lock = threading.Lock()
+        self._manifest = self._load_manifest()
+
+    # === 1. Manifest ===
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _save_manifest(self):
+        tmp = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._manifest, f)
+        os.replace(tmp, self.manifest_path)
+
+    def _digest(self, path):
+        """Hash-ul sursei; recalculat doar dacă mtime/size s-au schimbat."""
+        st = os.stat(path)
+        key = os.path.abspath(path)
+        entry = self._manifest.get(key)
+        if entry and entry["mtime"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            return entry["hash"]
+        digest = source_hash(path)
+        with self._lock:
+            self._manifest[key] = {"mtime": st.st_mtime_ns, "size": st.st_size, "hash": digest}
+            self._save_manifest()
+        return digest
+
+    # === 2. Acces ===
+    def get(self, path, size):
+        """
+        Calea fișierului pre-scalat pentru (sursă, dimensiune).
+        La miss îl generează acum. None dacă sursa lipsește.
+        """
+        try:
+            digest = self._digest(path)
+        except OSError:
+            return None
+        dst = os.path.join(self.directory, thumb_name(digest, size))
+        if not os.path.exists(dst):
+            render_thumbnail(path, dst, size)
+        return dst
+
+    # === 3. Warm-up în paralel ===
+    def warm(self, paths, sizes=DISPLAY_SIZES, jobs=None):
+        """Generează toate dimensiunile pentru `paths` pe mai multe procese."""
+        jobs_list = [(os.path.abspath(p), self.directory, tuple(map(tuple, sizes))) for p in paths]
+        if not jobs_list:
+            return 0
+        jobs = jobs or os.cpu_count() or 1
+        if jobs == 1:
+            results = list(map(_warm_one, jobs_list))
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                results = list(executor.map(_warm_one, jobs_list))
+        generated = 0
+        with self._lock:
+            for key, entry, count in results:
+                if entry is not None:
+                    self._manifest[key] = entry
+                generated += count
+            self._save_manifest()
+        return generated
+
+
+def _warm_one(job):
+    """Worker: hash + toate dimensiunile lipsă pentru o singură sursă."""
+    path, directory, sizes = job
+    try:
+        st = os.stat(path)
+        digest = source_hash(path)
+    except OSError:
+        return path, None, 0
+    count = 0
+    for size in sizes:
+        dst = os.path.join(directory, thumb_name(digest, size))
+        if not os.path.exists(dst):
+            try:
+                render_thumbnail(path, dst, size)
+                count += 1
+            except Exception as e:
+                print(f"[WARN] Nu pot genera thumbnail pentru {path}: {e}")
+    return path, {"mtime": st.st_mtime_ns, "size": st.st_size, "hash": digest}, count
+
+
+def find_images(root=None):
+    root = root or os.path.join(get_data_dir(), "images")
+    for dirpath, _, filenames in os.walk(root):
+        for name in sorted(filenames):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                yield os.path.join(dirpath, name)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_thumbnail_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ThumbnailCache()
+    return _cache
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cache de imagini pre-scalate pentru data/images.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    warm = sub.add_parser("warm", help="generează dimensiunile standard pentru toate imaginile")
+    warm.add_argument("--jobs", type=int, default=None, help="procese (implicit: nr. de nuclee)")
+    warm.add_argument("--root", help="folderul cu imagini (implicit data/images)")
+    args = parser.parse_args(argv)
+
+    paths = list(find_images(args.root))
+    generated = get_thumbnail_cache().warm(paths, jobs=args.jobs)
+    print(f"[INFO] {len(paths)} imagini verificate, {generated} thumbnail-uri generate în {cache_dir()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,15 +3,24 @@
 # - Learn Mode cu imagini (din data/docs/*.json + data/images/...)
 # - Imagini în întrebări (quiz) + în feedback-ul din Train Mode
 
+import time
+_IMPORT_STARTED = time.perf_counter()  # pentru --profile-startup
+
 import customtkinter as ctk
-import json
 import os
-from tkinter import messagebox
+import sys
+from datetime import datetime
+from tkinter import messagebox, simpledialog
 from tkinter import Frame, Canvas, Scrollbar
-from PIL import Image  # <--- nou
-from quiz_engine_modern import QuizManagerModern
-from stats_manager import add_session, load_stats, get_summary, get_leaderboard
-from pdf_exporter_modern import export_pdf_modern
+from doc_viewer import VirtualDocView
+from quiz_view import QuizView
+from data_loader import add_leaderboard_entry, get_random_questions, load_doc, load_settings
+from metrics import get_metrics, span, timed
+
+# Dependențele grele se importă la prima folosire, nu la pornire:
+# reportlab (pdf_exporter_modern) la export, image_cache / thumbnail_cache
+# la prima întrebare cu imagine, banca / stats / căutarea în ecranele lor.
+# python src/ui_modern.py --profile-startup [--budget-ms 1500] (vezi startup_profile.py)
 
 
 class QuizApp(ctk.CTk):
@@ -32,6 +41,7 @@ class QuizApp(ctk.CTk):
         # pentru imagini afișate în quiz / learn mode (ca să nu fie garbage collected)
         self.current_question_image = None
         self.current_learn_images = []
+        self.quiz_view = None
 
         self.grid_columnconfigure(1, weight=1)
         self.grid_rowconfigure(0, weight=1)
@@ -44,6 +54,7 @@ class QuizApp(ctk.CTk):
         self.create_main_menu()
 
     # ===================== HELPER IMAGINI =====================
+    @timed("load_ctk_image")
     def load_ctk_image(self, rel_path, size=(500, 300)):
         """
         Încarcă o imagine din folderul data/... și o întoarce ca CTkImage.
@@ -55,16 +66,60 @@ class QuizApp(ctk.CTk):
         if not os.path.exists(img_path):
             return None
 
+        from image_cache import get_image_cache
         try:
-            pil_img = Image.open(img_path)
-            pil_img = pil_img.convert("RGBA")
-            # redimensionare păstrând raportul
-            pil_img.thumbnail(size)
+            # decodare + redimensionare din cache-ul LRU (sau acum, la miss)
+            pil_img = get_image_cache().get(img_path, size)
+            if pil_img is None:
+                return None
             return ctk.CTkImage(light_image=pil_img, dark_image=pil_img, size=pil_img.size)
         except Exception as e:
             print(f"[WARN] Nu pot încărca imaginea {img_path}: {e}")
             return None
 
+    # ===================== EXPORT PDF ÎN FUNDAL =====================
+    def export_report(self, result, answers=None, on_done=None):
+        """
+        Generează PDF-ul pe worker-ul de fundal; UI-ul nu se blochează.
+        on_done(path) e apelat pe thread-ul Tk (prin after) când fișierul e gata.
+        """
+        from pdf_exporter_modern import export_pdf_async
+        future = export_pdf_async(result, answers)
+        self._poll_export(future, on_done or self._on_report_ready)
+        return future
+
+    def _poll_export(self, future, on_done):
+        if not future.done():
+            self.after(100, self._poll_export, future, on_done)
+            return
+        try:
+            path = future.result()
+        except Exception as e:
+            print("[EROARE PDF]", e)
+            path = None
+        on_done(path)
+
+    def _on_report_ready(self, path):
+        label = getattr(self, "status_label", None)
+        if label is None or not label.winfo_exists():
+            return
+        if path:
+            label.configure(text=f"📄 Raport PDF gata:\n{os.path.basename(path)}", text_color="#00ff99")
+        else:
+            label.configure(text="⚠️ Raportul PDF nu a putut fi generat.", text_color="#ff6666")
+
+    def prefetch_image(self, rel_path, size=(500, 300)):
+        """Decodează în fundal o imagine care va fi afișată curând."""
+        if rel_path:
+            from image_cache import get_image_cache
+            get_image_cache().prefetch(os.path.join("data", rel_path), size)
+
+    def prefetch_next_question_image(self):
+        qm = self.quiz_manager
+        nxt = qm.current_index + 1
+        if nxt < qm.total_questions():
+            self.prefetch_image(qm.question_at(nxt).get("image", ""), size=(500, 300))
+
     # ========== MENIU PRINCIPAL ==========
     def create_main_menu(self):
         for widget in self.left_frame.winfo_children():
@@ -109,6 +164,16 @@ class QuizApp(ctk.CTk):
             hover_color="#C30000"
         ).pack(side="bottom", pady=20)
 
+        # mesaje de stare (ex. raport PDF generat în fundal)
+        self.status_label = ctk.CTkLabel(
+            self.left_frame,
+            text="",
+            font=("Segoe UI", 12),
+            text_color="#cccccc",
+            wraplength=190
+        )
+        self.status_label.pack(side="bottom", pady=(0, 5))
+
         self.clear_right_frame()
         ctk.CTkLabel(
             self.right_frame,
@@ -122,7 +187,7 @@ class QuizApp(ctk.CTk):
     def show_quiz_setup(self, mode):
         setup = ctk.CTkToplevel(self)
         setup.title("Configurare Quiz")
-        setup.geometry("400x350")
+        setup.geometry("400x510")
         setup.grab_set()
 
         ctk.CTkLabel(setup, text="Domeniu:", font=("Segoe UI", 14, "bold")).pack(pady=10)
@@ -142,12 +207,31 @@ class QuizApp(ctk.CTk):
         time_var = ctk.StringVar(value="2")
         ctk.CTkEntry(setup, textvariable=time_var, width=100, justify="center").pack(pady=5)
 
+        ctk.CTkLabel(setup, text="Selecție întrebări:", font=("Segoe UI", 14, "bold")).pack(pady=10)
+        selections = {"Aleatorie": "uniform", "Adaptivă (repetare)": "adaptive",
+                      "Adaptivă (IRT, examen)": "irt"}
+        default_selection = load_settings().get("question_selection", "uniform")
+        selection_var = ctk.StringVar(value=next(
+            (label for label, key in selections.items() if key == default_selection), "Aleatorie"))
+        ctk.CTkComboBox(
+            setup,
+            variable=selection_var,
+            values=list(selections),
+            width=200
+        ).pack(pady=5)
+
+        ctk.CTkLabel(setup, text="Subiect (opțional):", font=("Segoe UI", 14, "bold")).pack(pady=10)
+        topic_var = ctk.StringVar(value="")
+        ctk.CTkEntry(setup, textvariable=topic_var, width=200, placeholder_text="ex. turbulență").pack(pady=5)
+
         def confirm():
             domain = domain_var.get()
             num = int(num_var.get()) if num_var.get().isdigit() else 10
             time_min = int(time_var.get()) if time_var.get().isdigit() else 2
+            selection = selections.get(selection_var.get(), "uniform")
+            topic = topic_var.get().strip() or None
             setup.destroy()
-            self.start_quiz(mode, domain, num, time_min)
+            self.start_quiz(mode, domain, num, time_min, selection, topic)
 
         ctk.CTkButton(
             setup,
@@ -157,11 +241,24 @@ class QuizApp(ctk.CTk):
         ).pack(pady=20)
 
     # ========== START QUIZ ==========
-    def start_quiz(self, mode, domain, num_questions, time_min):
-        with open(os.path.join("data", "fea_questions.json"), "r", encoding="utf-8") as f:
-            questions = json.load(f)
-
-        self.quiz_manager = QuizManagerModern(questions, domain, num_questions)
+    def start_quiz(self, mode, domain, num_questions, time_min, selection="uniform", topic=None):
+        from question_bank import get_question_bank
+        from question_stream import streaming_bank_path
+        from quiz_engine_modern import QuizManagerModern
+
+        if streaming_bank_path():
+            # bancă prea mare pentru memorie: eșantion citit în flux (selecție uniformă)
+            data = get_random_questions(domain, num_questions)
+        else:
+            data = get_question_bank()
+        self.quiz_manager = QuizManagerModern(
+            data, domain, num_questions,
+            selection=selection, user=load_settings().get("username", "Guest"), topic=topic
+        )
+        if topic and not self.quiz_manager.total_questions():
+            messagebox.showinfo("Subiect", f"Nu am găsit întrebări despre „{topic}”.")
+            self.reset_to_menu()
+            return
         self.mode = mode
         self.time_left = time_min * 60
         self.total_time = self.time_left
@@ -179,6 +276,14 @@ class QuizApp(ctk.CTk):
         self.clear_right_frame()
         self.create_timer()
         self.create_progress_bar()
+        # ecranul de întrebare se construiește o singură dată per sesiune
+        self.quiz_view = QuizView(
+            self.right_frame,
+            on_answer=self.handle_answer,
+            on_next=self.next_question,
+            on_finish=self.show_results
+        )
+        self.quiz_view.pack(fill="both", expand=True)
         self.show_question()
 
     # ========== TIMER ==========
@@ -229,7 +334,7 @@ class QuizApp(ctk.CTk):
 
     def update_progress(self):
         current = self.quiz_manager.current_index + 1
-        total = self.quiz_manager.total_questions()
+        total = self.quiz_manager.planned_questions()
         pct = (current / total) if total else 0
         self.progress_bar.set(pct)
         self.progress_label.configure(
@@ -244,40 +349,17 @@ class QuizApp(ctk.CTk):
             self.show_results()
             return
 
-        self.clear_right_frame(keep_progress=True, keep_timer=True)
-        self.update_progress()
+        with span("show_question"):
+            self.update_progress()
 
-        # întrebarea
-        ctk.CTkLabel(
-            self.right_frame,
-            text=q["question"],
-            wraplength=700,
-            font=("Segoe UI", 18, "bold"),
-            text_color="white"
-        ).pack(pady=(15, 10))
-
-        # imagine întrebare (dacă există în JSON field "image": "images/...png")
-        self.current_question_image = None
-        img_obj = self.load_ctk_image(q.get("image", ""), size=(500, 300))
-        if img_obj:
-            self.current_question_image = img_obj  # păstrăm referința
-            ctk.CTkLabel(
-                self.right_frame,
-                image=img_obj,
-                text=""
-            ).pack(pady=(5, 15))
+            # imagine întrebare (dacă există în JSON field "image": "images/...png")
+            self.current_question_image = self.load_ctk_image(q.get("image", ""), size=(500, 300))
+            self.quiz_view.show_question(q, self.current_question_image)
+            if get_metrics().enabled:
+                self.update_idletasks()  # include desenarea în durată, nu doar construcția widget-urilor
 
-        # opțiuni
-        for i, opt in enumerate(q["choices"]):
-            ctk.CTkButton(
-                self.right_frame,
-                text=opt,
-                font=("Segoe UI", 14),
-                fg_color="#1E5BA6",
-                hover_color="#297BE6",
-                width=600,
-                command=lambda idx=i: self.handle_answer(idx)
-            ).pack(pady=6)
+        # cât timp userul citește, imaginea următoarei întrebări se decodează în fundal
+        self.prefetch_next_question_image()
 
     # ========== RĂSPUNS ==========
     def handle_answer(self, idx):
@@ -288,58 +370,15 @@ class QuizApp(ctk.CTk):
             self.next_question()
             return
 
-        # TRAIN → feedback imediat
-        self.clear_right_frame(keep_progress=True, keep_timer=True)
-
-        msg = "✅ Corect!" if correct else "❌ Greșit!"
-        color = "#00ff99" if correct else "#ff4444"
-
-        ctk.CTkLabel(
-            self.right_frame,
-            text=msg,
-            text_color=color,
-            font=("Segoe UI", 22, "bold")
-        ).pack(pady=15)
-
-        ctk.CTkLabel(
-            self.right_frame,
-            text=f"Răspuns corect: {correct_text}",
-            text_color="white"
-        ).pack(pady=5)
-
-        ctk.CTkLabel(
-            self.right_frame,
-            text=f"Explicație: {explanation}",
-            text_color="#cccccc",
-            wraplength=700
-        ).pack(pady=10)
-
-        # reafișăm imaginea întrebării și la feedback, dacă există
-        current_q = self.quiz_manager.questions[self.quiz_manager.current_index]
-        self.current_question_image = None
-        img_obj = self.load_ctk_image(current_q.get("image", ""), size=(500, 300))
-        if img_obj:
-            self.current_question_image = img_obj
-            ctk.CTkLabel(
-                self.right_frame,
-                image=img_obj,
-                text=""
-            ).pack(pady=(10, 15))
-
-        if self.quiz_manager.current_index + 1 < self.quiz_manager.total_questions():
-            ctk.CTkButton(
-                self.right_frame,
-                text="Continuă ➜",
-                command=self.next_question,
-                fg_color="#1E5BA6"
-            ).pack(pady=15)
-        else:
-            ctk.CTkButton(
-                self.right_frame,
-                text="Finalizare ➜",
-                command=self.show_results,
-                fg_color="#1E5BA6"
-            ).pack(pady=15)
+        # TRAIN → feedback imediat (aceeași imagine, deja în cache)
+        is_last = self.quiz_manager.current_index + 1 >= self.quiz_manager.planned_questions()
+        self.quiz_view.show_feedback(
+            correct,
+            correct_text,
+            explanation,
+            image=self.current_question_image,
+            is_last=is_last
+        )
 
     def next_question(self):
         if self.quiz_manager.advance():
@@ -349,45 +388,60 @@ class QuizApp(ctk.CTk):
 
     # ========== FINAL QUIZ ==========
 
-   def show_results(self):
-    self.timer_running = False
-
-    # ==== Calcul rezultat și salvare sesiune ====
-    result = self.quiz_manager.get_result_data(self.mode, self.time_used)
-    self.last_result = result
-    add_session(result)
-
-    # ==== Leaderboard local (Exam Mode) ====
-    if self.mode == "exam":
-        name = simpledialog.askstring("Leaderboard", "Introdu numele tău pentru clasament:")
-        if not name:
-            name = "Anonim"
-
-        data = load_leaderboard()
-        new_entry = {
-            "name": name,
-            "score": round(result['percent'], 1),
-            "mode": "exam",
-            "date": datetime.now().strftime("%Y-%m-%d %H:%M")
-        }
-        data.append(new_entry)
-        save_leaderboard(data)
-        print(f"[INFO] Scor salvat în Leaderboard: {new_entry}")
-
-    # ==== Export PDF ====
-    export_pdf_modern(result)
-
-    # ==== Mesaj final ====
-    messagebox.showinfo(
-        "Rezultat final",
-        "Scor final: {}%\nRăspunsuri corecte: {} / {}".format(
-            result['percent'],
-            result['correct'],
-            result['total']
+    def show_results(self):
+        from answer_log import log_quiz
+        from stats_manager import add_session, get_rank
+
+        self.timer_running = False
+
+        # ==== Calcul rezultat ====
+        result = self.quiz_manager.get_result_data(self.mode, self.time_used)
+        self.last_result = result
+
+        # ==== Leaderboard local (Exam Mode) ====
+        if self.mode == "exam":
+            name = simpledialog.askstring("Leaderboard", "Introdu numele tău pentru clasament:")
+            if not name:
+                name = "Anonim"
+            result["name"] = name
+
+        # ==== Salvare sesiune (+ index clasament + jurnal de răspunsuri) ====
+        add_session(result)
+        log_quiz(self.quiz_manager, result.get("name") or load_settings().get("username", "Guest"))
+
+        rank_text = ""
+        if self.mode == "exam":
+            new_entry = {
+                "name": result["name"],
+                "score": round(result['percent'], 1),
+                "mode": "exam",
+                "domain": result['domain'],
+                "date": datetime.now().strftime("%Y-%m-%d %H:%M")
+            }
+            add_leaderboard_entry(new_entry)
+            print(f"[INFO] Scor salvat în Leaderboard: {new_entry}")
+
+            rank, total = get_rank(result['percent'], result['domain'], "exam")
+            rank_text = f"\nLoc în clasament ({result['domain']}, exam): {rank} din {total}"
+        if "ability" in result:
+            rank_text += f"\nAbilitate estimată (IRT): {result['ability']:+.2f} ± {result['ability_se']:.2f}"
+
+        # ==== Export PDF (în fundal) ====
+        answers = self.quiz_manager.user_answers if self.mode == "train" else None
+        self.export_report(result, answers)
+
+        # ==== Mesaj final ====
+        messagebox.showinfo(
+            "Rezultat final",
+            "Scor final: {}%\nRăspunsuri corecte: {} / {}{}".format(
+                result['percent'],
+                result['correct'],
+                result['total'],
+                rank_text
+            )
         )
-    )
 
-    self.create_main_menu()
+        self.create_main_menu()
 
     def show_train_finish(self):
         ctk.CTkLabel(
@@ -512,6 +566,23 @@ class QuizApp(ctk.CTk):
                 command=lambda k=key: self.open_doc(k)
             ).pack(pady=8, padx=20)
 
+        # căutare în teorie (index BM25, fără diacritice)
+        search_frame = ctk.CTkFrame(self.right_frame, fg_color="transparent")
+        search_frame.pack(pady=(15, 5))
+        query_var = ctk.StringVar(value="")
+        entry = ctk.CTkEntry(search_frame, textvariable=query_var, width=320,
+                             placeholder_text="Caută în teorie (ex. turbulență)")
+        entry.pack(side="left", padx=5)
+        results_frame = ctk.CTkFrame(self.right_frame, fg_color="transparent")
+
+        def run_search(_event=None):
+            self.show_search_results(results_frame, query_var.get())
+
+        entry.bind("<Return>", run_search)
+        ctk.CTkButton(search_frame, text="🔍 Caută", width=90, fg_color="#1E5BA6",
+                      command=run_search).pack(side="left", padx=5)
+        results_frame.pack(pady=5)
+
         ctk.CTkButton(
             self.right_frame,
             text="⬅ Înapoi la meniu principal",
@@ -519,20 +590,48 @@ class QuizApp(ctk.CTk):
             command=self.reset_to_menu
         ).pack(pady=25)
 
-    def open_doc(self, domain_key):
+    def show_search_results(self, frame, query, limit=8):
+        for widget in frame.winfo_children():
+            widget.destroy()
+        query = query.strip()
+        if not query:
+            return
+
+        from search_index import get_search_index
+        hits = get_search_index().search(query, kind="doc", limit=limit)
+        if not hits:
+            ctk.CTkLabel(frame, text="Niciun rezultat.", text_color="#cccccc").pack(pady=5)
+        for hit in hits:
+            domain_key, _, section = hit["key"].partition("#")
+            ctk.CTkButton(
+                frame,
+                text=f"[{domain_key.upper()}] {hit['label']}",
+                width=450,
+                anchor="w",
+                fg_color="#2a2a2a",
+                hover_color="#3a3a3a",
+                command=lambda k=domain_key, s=int(section): self.open_doc(k, s)
+            ).pack(pady=2)
+
+        ctk.CTkButton(
+            frame,
+            text=f"✏ Exersează întrebări despre „{query}”",
+            fg_color="#00aa66",
+            command=lambda: self.start_quiz("train", "mix", 10, 5, topic=query)
+        ).pack(pady=(8, 0))
+
+    def open_doc(self, domain_key, section=None):
         """
         Încarcă fișierul JSON cu teoria (data/docs/<domain>.json)
-        și îl afișează într-un frame derulabil.
+        și îl afișează într-o listă derulabilă virtualizată (doc_viewer.py).
         Fiecare secțiune poate avea text + imagine.
+        section = indexul secțiunii la care se derulează (ex. rezultat din căutare).
         """
-        path = os.path.join("data", "docs", f"{domain_key}.json")
-        if not os.path.exists(path):
+        data = load_doc(domain_key)
+        if data is None:
             messagebox.showwarning("Lipsă conținut", f"Nu există încă material pentru '{domain_key}'.")
             return
 
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
         title = data.get("title", domain_key.upper())
         sections = data.get("sections", [])
 
@@ -546,64 +645,19 @@ class QuizApp(ctk.CTk):
             text_color="#00ffff"
         ).pack(pady=(15, 10))
 
-        # container scrollabil pentru lecție
-        container = Frame(self.right_frame, bg="#202020")
-        canvas = Canvas(container, bg="#202020", highlightthickness=0)
-        scrollbar = Scrollbar(container, orient="vertical", command=canvas.yview)
-        scrollable_frame = Frame(canvas, bg="#202020")
-
-        def _on_configure(event):
-            canvas.configure(scrollregion=canvas.bbox("all"))
-
-        scrollable_frame.bind("<Configure>", _on_configure)
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-
-        container.pack(fill="both", expand=True, padx=5, pady=5)
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-
-        # resetăm cache-ul de imagini pentru lecție
+        # vizualizare virtualizată: doar secțiunile din jurul viewport-ului au widget-uri,
+        # imaginile se încarcă la apariție și se eliberează când ies din zonă
         self.current_learn_images = []
-
-        # umplem cu secțiuni
-        for sec in sections:
-            sub = sec.get("subtitle", "")
-            txt = sec.get("content", "")
-            img_rel = sec.get("image", "")
-
-            block = Frame(scrollable_frame, bg="#2a2a2a", padx=12, pady=10)
-            block.pack(fill="x", padx=5, pady=8)
-
-            if sub:
-                ctk.CTkLabel(
-                    block,
-                    text=sub,
-                    font=("Segoe UI", 15, "bold"),
-                    text_color="#00ffff",
-                    wraplength=650,
-                    justify="left"
-                ).pack(anchor="w")
-
-            if txt:
-                ctk.CTkLabel(
-                    block,
-                    text=txt,
-                    font=("Segoe UI", 13),
-                    text_color="#ffffff",
-                    wraplength=650,
-                    justify="left"
-                ).pack(anchor="w", pady=(4, 8))
-
-            # dacă secțiunea are imagine și ea există pe disc -> afișăm
-            img_obj = self.load_ctk_image(img_rel, size=(800, 400))
-            if img_obj:
-                self.current_learn_images.append(img_obj)  # păstrăm referința
-                ctk.CTkLabel(
-                    block,
-                    image=img_obj,
-                    text=""
-                ).pack(anchor="w", pady=(0, 8))
+        viewer = VirtualDocView(
+            self.right_frame,
+            sections,
+            load_image=lambda rel: self.load_ctk_image(rel, size=(800, 400)),
+            prefetch_image=lambda rel: self.prefetch_image(rel, size=(800, 400)),
+        )
+        viewer.pack(fill="both", expand=True, padx=5, pady=5)
+        if section is not None:
+            # după prima materializare (tot din after_idle), ca geometria să existe
+            viewer.after_idle(lambda: viewer.scroll_to(section))
 
         # butoane back jos
         ctk.CTkButton(
@@ -632,13 +686,24 @@ class QuizApp(ctk.CTk):
             ).pack(pady=20)
             return
 
-        pdf_path = export_pdf_modern(self.last_result)
-        if pdf_path:
-            messagebox.showinfo("Raport generat", f"Raportul PDF a fost salvat în:\n{pdf_path}")
+        ctk.CTkLabel(
+            self.right_frame,
+            text="⏳ Se generează raportul PDF...",
+            text_color="#ffffff",
+            font=("Segoe UI", 18, "bold")
+        ).pack(pady=20)
+
+        def on_done(pdf_path):
+            if pdf_path:
+                messagebox.showinfo("Raport generat", f"Raportul PDF a fost salvat în:\n{pdf_path}")
+            else:
+                messagebox.showwarning("Eroare", "Raportul PDF nu a putut fi generat.")
+
+        self.export_report(self.last_result, on_done=on_done)
 
     def show_stats(self):
-        stats = load_stats()
-        summary = get_summary(stats)
+        from stats_manager import get_summary
+        summary = get_summary()
 
         self.clear_right_frame()
         ctk.CTkLabel(
@@ -648,7 +713,7 @@ class QuizApp(ctk.CTk):
             text_color="#00ffff"
         ).pack(pady=20)
 
-        if not stats:
+        if not summary["total_sessions"]:
             ctk.CTkLabel(
                 self.right_frame,
                 text="Nu există date încă.",
@@ -661,6 +726,8 @@ class QuizApp(ctk.CTk):
             f"Total sesiuni: {summary['total_sessions']}\n"
             f"Media scorurilor: {summary['avg_score']}%\n"
             f"Cel mai bun scor: {summary['best_score']}%\n"
+            f"Abatere standard: {summary['std_score']}%\n"
+            f"Timp total: {summary['total_time'] // 60} min\n"
         )
 
         ctk.CTkLabel(
@@ -671,9 +738,18 @@ class QuizApp(ctk.CTk):
             text_color="#ffffff"
         ).pack(pady=20)
 
+        for domain, dsum in summary["by_domain"].items():
+            ctk.CTkLabel(
+                self.right_frame,
+                text=f"{domain.capitalize()}: {dsum['total_sessions']} sesiuni, "
+                     f"medie {dsum['avg_score']}%, maxim {dsum['best_score']}%",
+                font=("Segoe UI", 14),
+                text_color="#cccccc"
+            ).pack(pady=2)
+
     def show_leaderboard(self):
-        stats = load_stats()
-        leaders = get_leaderboard(stats)
+        from stats_manager import get_leaderboard
+        leaders = get_leaderboard()
 
         self.clear_right_frame()
         ctk.CTkLabel(
@@ -696,7 +772,7 @@ class QuizApp(ctk.CTk):
             color = "#FFD700" if i == 1 else "#00ffff" if i == 2 else "#ff9933"
             ctk.CTkLabel(
                 self.right_frame,
-                text=f"{i}. {s['domain'].capitalize()} - {s['percent']}% ({s['mode']}, {s['date']})",
+                text=f"{i}. {s.get('name', s['domain'].capitalize())} - {s['domain']} - {s['percent']}% ({s['mode']}, {s['date']})",
                 text_color=color,
                 font=("Segoe UI", 16, "bold")
             ).pack(pady=5)
@@ -705,6 +781,7 @@ class QuizApp(ctk.CTk):
     def reset_to_menu(self):
         self.timer_running = False
         self.quiz_manager = None
+        self.quiz_view = None
         self.current_question_image = None
         self.current_learn_images = []
         self.clear_right_frame()
@@ -727,5 +804,14 @@ class QuizApp(ctk.CTk):
 
 
 if __name__ == "__main__":
+    if "--profile-startup" in sys.argv[1:]:
+        from startup_profile import main
+        sys.exit(main([arg for arg in sys.argv[1:] if arg != "--profile-startup"]))
+
+    imported = time.perf_counter()
     app = QuizApp()
+    if os.environ.get("FEA_STARTUP_PROFILE"):
+        from startup_profile import report_child
+        report_child(app, _IMPORT_STARTED, imported)
+        sys.exit(0)
     app.mainloop()
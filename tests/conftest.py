@@ -0,0 +1,42 @@
+# conftest.py
+import json
+import os
+import sys
+
+import pytest
+
+# ================================================================
+#  Testele importă modulele din src/ direct, ca aplicația.
+#  Fiecare test primește un director data/ propriu (FEA_DATA_DIR) și
+#  singleton-urile procesului (store, index clasament) sunt resetate.
+# ================================================================
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, os.path.abspath(SRC_DIR))
+os.environ.setdefault("FEA_METRICS", "0")
+
+
+def _reset_singletons():
+    import leaderboard_index
+    import storage
+
+    if storage._store is not None:
+        storage._store.close()
+    storage._store = None
+    leaderboard_index._index = None
+
+
+@pytest.fixture
+def make_data_dir(tmp_path, monkeypatch):
+    """make_data_dir(backend) -> un director data/ gol, folosit de get_data_dir()."""
+    def make(backend="sqlite", **settings):
+        data_dir = tmp_path / f"data_{backend}"
+        data_dir.mkdir(exist_ok=True)
+        with open(data_dir / "settings.json", "w", encoding="utf-8") as f:
+            json.dump(dict(settings, stats_backend=backend), f)
+        monkeypatch.setenv("FEA_DATA_DIR", str(data_dir))
+        _reset_singletons()
+        return str(data_dir)
+
+    yield make
+    _reset_singletons()
@@ -0,0 +1,59 @@
+# test_answer_log.py
+import multiprocessing
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from answer_log import AnswerLog
+
+
+def _writer(directory, worker, sessions):
+    log = AnswerLog(directory)
+    for s in range(sessions):
+        events = [(f"q{worker}-{s}", 1, True, 100), ("shared", 0, False, 200)]
+        log.append_session(f"user{worker}", events)
+
+
+def _column(log, name, typecode):
+    values = array(typecode)
+    with open(log.path(name), "rb") as f:
+        values.frombytes(f.read())
+    return values
+
+
+def test_concurrent_processes_share_dictionaries(tmp_path):
+    directory = str(tmp_path / "answer_log")
+    AnswerLog(directory)  # un proces deschis înainte: trebuie să vadă scrierile celorlalte
+    procs, sessions = 4, 25
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(procs, mp_context=ctx) as pool:
+        for future in [pool.submit(_writer, directory, w, sessions) for w in range(procs)]:
+            future.result()
+
+    log = AnswerLog(directory)
+    assert log.count == procs * sessions * 2
+    assert log.next_session == procs * sessions
+    assert len(log.users.items) == len(set(log.users.items)) == procs
+    assert len(log.questions.items) == len(set(log.questions.items)) == procs * sessions + 1
+
+    session_col = _column(log, "session", "I")
+    users = [log.users.items[i] for i in _column(log, "user", "I")]
+    questions = [log.questions.items[i] for i in _column(log, "question", "I")]
+    for i in range(0, log.count, 2):
+        assert session_col[i] == session_col[i + 1]
+        worker = users[i][len("user"):]
+        assert users[i + 1] == users[i]
+        assert questions[i].startswith(f"q{worker}-")
+        assert questions[i + 1] == "shared"
+    assert sorted(set(session_col)) == list(range(procs * sessions))
+
+
+def test_append_after_other_writer(tmp_path):
+    directory = str(tmp_path / "answer_log")
+    first, second = AnswerLog(directory), AnswerLog(directory)
+    assert first.append_session("ana", [("q1", 0, True, 10)]) == 0
+    assert second.append_session("ion", [("q2", 0, True, 10), ("q1", 1, False, 10)]) == 1
+
+    log = AnswerLog(directory)
+    assert log.users.items == ["ana", "ion"]
+    assert log.questions.items == ["q1", "q2"]
+    assert list(_column(log, "question", "I")) == [0, 1, 0]
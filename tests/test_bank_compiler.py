@@ -0,0 +1,55 @@
+# test_bank_compiler.py
+import glob
+import json
+import os
+
+import pytest
+
+from bank_compiler import CompiledBank, compile_bank
+from question_bank import QuestionBank
+
+
+def _write_bank(path, texts):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([{"id": f"q{i}", "domain": "cfd", "question": t, "choices": ["a", "b"], "correct_index": 0}
+                   for i, t in enumerate(texts)], f, ensure_ascii=False)
+
+
+@pytest.fixture
+def bank_path(tmp_path):
+    (tmp_path / "docs").mkdir()
+    path = str(tmp_path / "fea_questions.json")
+    _write_bank(path, ["Ce este Reynolds?", "Ce este y+?"])
+    return path
+
+
+def test_recompile_while_artifact_is_open(bank_path, tmp_path):
+    docs = str(tmp_path / "docs")
+    artifact = compile_bank(bank_path, docs)
+    bank = QuestionBank(bank_path).refresh()
+    old = bank.questions
+    assert isinstance(old, CompiledBank) and len(old) == 2
+
+    _write_bank(bank_path, ["Ce este Reynolds?", "Ce este y+?", "Ce este CFL?"])
+    os.utime(bank_path, ns=(1, 1))
+    assert compile_bank(bank_path, docs) == artifact   # versiunea veche e încă mapată
+    bank.refresh()
+
+    assert len(bank.questions) == 3
+    assert old[1]["question"] == "Ce este y+?"         # citit din copia în memorie după close()
+    versions = glob.glob(str(tmp_path / "fea_questions.*.bin"))
+    assert versions == [bank.questions.path]
+    bank.questions.close()
+
+
+def test_up_to_date_artifact_is_not_rewritten(bank_path, tmp_path):
+    compile_bank(bank_path, str(tmp_path / "docs"))
+    before = glob.glob(str(tmp_path / "fea_questions.*.bin"))
+    compile_bank(bank_path, str(tmp_path / "docs"))
+    assert glob.glob(str(tmp_path / "fea_questions.*.bin")) == before
+
+
+def test_invalid_artifact_returns_none(tmp_path):
+    path = tmp_path / "fea_questions.bin"
+    path.write_bytes(b"XXXX" + b"\0" * 200)
+    assert CompiledBank.open(str(path)) is None
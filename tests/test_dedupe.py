@@ -0,0 +1,26 @@
+# test_dedupe.py
+import json
+
+import numpy as np
+
+import dedupe
+
+
+def _scan(tmp_path, questions):
+    bank = tmp_path / "bank.json"
+    bank.write_text(json.dumps(questions), encoding="utf-8")
+    cache_path = str(tmp_path / "cache.npz")
+    dedupe.scan(str(bank), cache_path=cache_path)
+    return dedupe.SignatureCache(cache_path)
+
+
+def test_cache_keeps_only_current_questions(tmp_path):
+    questions = [{"id": i, "domain": "cfd", "question": f"Întrebarea numărul {i} despre CFD"}
+                 for i in range(5)]
+    assert len(_scan(tmp_path, questions).keys) == 5
+
+    # întrebări șterse / modificate -> semnăturile lor vechi dispar din cache
+    questions = questions[:2] + [dict(questions[2], question="Text complet nou pentru întrebare")]
+    cache = _scan(tmp_path, questions)
+    expected = np.unique([dedupe.content_key(dedupe.shingle_text(q)) for q in questions])
+    assert np.array_equal(cache.keys, expected.astype(np.uint64))
@@ -0,0 +1,48 @@
+# test_metrics.py
+import json
+import os
+import subprocess
+import sys
+
+import metrics
+
+# ================================================================
+#  Fișierele per proces din data/metrics: .prom-ul dispare la ieșire,
+#  cele rămase de la procese oprite brusc sunt șterse la pornire.
+# ================================================================
+
+
+def _dead_pid():
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    return proc.pid
+
+
+def test_final_dump_keeps_json_and_removes_prom(tmp_path):
+    m = metrics.Metrics(str(tmp_path))
+    m.inc("sessions")
+    m.dump()
+    json_path, prom_path = m._paths()
+    assert os.path.exists(prom_path)
+
+    m._final_dump()
+    assert not os.path.exists(prom_path)
+    with open(json_path, encoding="utf-8") as f:
+        assert json.load(f)["counters"]["sessions"] == 1
+
+
+def test_prune_removes_files_of_exited_processes(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, "KEEP_JSON", 1)
+    dead = _dead_pid()
+    stale_prom = tmp_path / f"fea_quiz_worker_{dead}.prom"
+    stale_json = tmp_path / f"metrics_worker_{dead}.json"
+    for path in (stale_prom, stale_json):
+        path.write_text("{}", encoding="utf-8")
+    os.utime(stale_json, (1, 1))
+
+    m = metrics.Metrics(str(tmp_path))
+    m.dump()
+    m.prune()
+    assert not stale_prom.exists()
+    assert not stale_json.exists()
+    assert all(os.path.exists(p) for p in m._paths())
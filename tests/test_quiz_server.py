@@ -0,0 +1,65 @@
+# test_quiz_server.py
+import asyncio
+import json
+import os
+import shutil
+
+import pytest
+
+from quiz_server import HttpError, QuizServer
+
+BANK = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "fea_questions.json")
+
+
+@pytest.fixture
+def server(make_data_dir):
+    data_dir = make_data_dir("sqlite")
+    shutil.copy(BANK, data_dir)
+    server = QuizServer(max_sessions=2)
+    yield server
+    server._worker.shutdown(wait=True)
+    server._writer.shutdown(wait=True)
+
+
+def _create(server, body):
+    return asyncio.run(server.create(body))
+
+
+@pytest.mark.parametrize("body", [
+    {"time_min": "nan"}, {"time_min": "inf"}, {"time_min": 0}, {"time_min": -5}, {"time_min": 10 ** 6},
+    {"num_questions": -1}, {"domain": 5}, {"topic": ["a"]}, {"selection": {"x": 1}}, {"selection": "magic"},
+])
+def test_create_rejects_invalid_body(server, body):
+    with pytest.raises(HttpError) as err:
+        _create(server, body)
+    assert err.value.status == 400
+    assert not server._deadlines
+
+
+def test_concurrent_creates_respect_limit(server):
+    async def run():
+        return await asyncio.gather(*(server.create({"num_questions": 2}) for _ in range(4)),
+                                    return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert sum(isinstance(r, dict) for r in results) == 2
+    assert all(r.status == 503 for r in results if isinstance(r, HttpError))
+
+
+@pytest.mark.parametrize("length", ["abc", "-3"])
+def test_invalid_content_length_is_400(server, length):
+    async def run():
+        srv = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+        port = srv.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"POST /sessions HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode("latin-1"))
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), 5)   # conexiunea e închisă după răspuns
+        writer.close()
+        srv.close()
+        await srv.wait_closed()
+        return response
+
+    head, _, body = asyncio.run(run()).partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 400")
+    assert json.loads(body)["error"] == "Content-Length invalid"
@@ -0,0 +1,52 @@
+# test_safe_writer.py
+import json
+import os
+
+import pytest
+
+import safe_writer
+from safe_writer import GroupCommitFile
+
+
+def _load(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+
+
+def _extend(items, added):
+    return items + added
+
+
+def test_submit_many_is_one_rewrite(tmp_path):
+    target = GroupCommitFile(str(tmp_path / "items.json"), _extend, _load)
+    target.submit_many([{"i": i} for i in range(10)])
+    target.submit({"i": 10})
+
+    assert _load(target.path) == [{"i": i} for i in range(11)]
+    assert target.commits == 2
+    assert os.listdir(target.spool_dir) == []
+
+
+def test_interrupted_commit_is_not_applied_twice(tmp_path):
+    target = GroupCommitFile(str(tmp_path / "items.json"), _extend, _load)
+    path = target._spool([{"i": 1}])
+    name = os.path.basename(path)
+    # commit întrerupt după înlocuirea fișierului, înainte de ștergerea spool-ului
+    text = json.dumps([{"i": 1}])
+    safe_writer.atomic_write_text(target.path, text)
+    safe_writer.atomic_write_json(target.marker_path, {"records": [name],
+                                                       "sha1": safe_writer._sha1_file(target.path)})
+    target.submit({"i": 2})
+
+    assert _load(target.path) == [{"i": 1}, {"i": 2}]
+
+
+@pytest.mark.parametrize("batch", [1, 5])
+def test_concurrent_processes_exact_counts(tmp_path, batch):
+    report = safe_writer.stress(procs=4, records=20, data_dir=str(tmp_path), batch=batch)
+
+    assert report["sessions"] == report["expected"] == 80
+    assert safe_writer.mismatched_counts(report) == []
@@ -0,0 +1,45 @@
+# test_search_index.py
+import json
+import os
+
+from question_bank import QuestionBank
+from search_index import SearchIndex
+
+
+def _write(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+def _doc(text):
+    return {"title": "CFD", "sections": [{"subtitle": "Turbulență", "content": text}]}
+
+
+def test_changed_source_gets_new_segment_file(tmp_path):
+    bank_path = tmp_path / "fea_questions.json"
+    _write(bank_path, [{"id": "q1", "domain": "cfd", "question": "Ce este turbulența?",
+                        "choices": ["a", "b"], "correct_index": 0}])
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    _write(docs / "cfd.json", _doc("modelul k-epsilon"))
+
+    index = SearchIndex(str(tmp_path / "index"), str(docs), QuestionBank(str(bank_path))).refresh()
+    old = index.segments[os.path.abspath(docs / "cfd.json")]
+    assert index.search("epsilon", kind="doc")
+
+    _write(docs / "cfd.json", _doc("modelul spalart allmaras"))
+    os.utime(docs / "cfd.json", ns=(1, 1))  # semnătură diferită și pe sisteme cu mtime grosier
+    index.refresh()
+
+    new = index.segments[os.path.abspath(docs / "cfd.json")]
+    assert new.path != old.path
+    assert old._mm.closed                      # maparea veche e eliberată, nu suprascrisă
+    assert not os.path.exists(old.path)
+    assert not index.search("epsilon", kind="doc")
+    assert index.search("allmaras", kind="doc")[0]["key"] == "cfd#0"
+    segments = sorted(n for n in os.listdir(tmp_path / "index") if n.endswith(".seg"))
+    assert len(segments) == 2                  # unul pentru bancă, unul pentru document
+
+    # alt proces (alt SearchIndex) deschide segmentele din manifest, fără reconstruire
+    other = SearchIndex(str(tmp_path / "index"), str(docs), QuestionBank(str(bank_path))).refresh()
+    assert other.segments[os.path.abspath(docs / "cfd.json")].path == new.path
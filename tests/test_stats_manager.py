@@ -0,0 +1,42 @@
+# test_stats_manager.py
+import pytest
+
+import stats_manager
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "json", "journal"])
+def test_first_session_counted_once(make_data_dir, backend):
+    # fără leaderboard_index.json: indexul e reconstruit din istoric la primul add_session
+    make_data_dir(backend)
+    stats_manager.add_session({"mode": "exam", "domain": "cfd", "percent": 50, "time_used": 10})
+
+    assert stats_manager.get_summary()["total_sessions"] == 1
+    assert stats_manager.get_rank(50) == (1, 1)
+    assert len(stats_manager.get_leaderboard()) == 1
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "json"])
+def test_add_sessions_matches_store(make_data_dir, backend):
+    make_data_dir(backend)
+    stats_manager.add_session({"mode": "exam", "domain": "cfd", "percent": 90, "time_used": 1})
+    stats_manager.add_sessions([{"mode": "exam", "domain": "nvh", "percent": p, "time_used": 1}
+                                for p in (10, 20, 30)])
+
+    assert stats_manager.get_summary()["total_sessions"] == 4
+    assert len(stats_manager.load_stats()) == 4
+    assert stats_manager.get_rank(25) == (3, 4)
+
+
+def test_index_sees_entries_written_by_another_process(make_data_dir):
+    import leaderboard_index
+
+    make_data_dir("sqlite")
+    stats_manager.add_session({"mode": "exam", "domain": "cfd", "percent": 40, "time_used": 1})
+    index = leaderboard_index.get_leaderboard_index()
+
+    # alt proces (ex. quiz_server) are propria instanță și rescrie fișierul
+    other = leaderboard_index.LeaderboardIndex(index.path)
+    other.add({"mode": "exam", "domain": "cfd", "percent": 80, "time_used": 1})
+
+    assert index.rank(50) == (2, 2)
+    assert [e["percent"] for e in index.top()] == [80, 40]
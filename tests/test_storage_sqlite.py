@@ -0,0 +1,63 @@
+# test_storage_sqlite.py
+import json
+import os
+
+import stats_manager
+from storage import get_store
+from storage_sqlite import INSERT_SESSION, SESSION_COLUMNS, _to_row, migrate_json
+
+SESSIONS = [{"mode": "exam", "domain": "cfd", "percent": p, "time_used": 5, "date": "2024-01-01 10:00"}
+            for p in (40, 60, 80)]
+LEADERS = [{"name": "ana", "score": 80.0, "mode": "exam", "domain": "cfd", "date": "2024-01-01 10:00"}]
+
+
+def _write_json(data_dir, name, data):
+    with open(os.path.join(data_dir, name), "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+
+def _json_data_dir(make_data_dir):
+    data_dir = make_data_dir("sqlite")
+    _write_json(data_dir, "stats.json", SESSIONS)
+    _write_json(data_dir, "leaderboard.json", LEADERS)
+    return data_dir
+
+
+def test_force_replaces_imported_rows(make_data_dir):
+    data_dir = _json_data_dir(make_data_dir)
+    store = get_store()  # prima deschidere migrează
+    stats_manager.add_session({"mode": "exam", "domain": "nvh", "percent": 90, "time_used": 5})
+
+    for _ in range(2):
+        assert migrate_json(store, data_dir, force=True) == (3, 1)
+
+    assert len(store.load_sessions()) == 4
+    assert len(store.load_leaderboard()) == 1
+    assert stats_manager.get_summary()["total_sessions"] == 4
+
+    # stats.json s-a schimbat: indexul persistat e reconstruit din baza curentă
+    _write_json(data_dir, "stats.json", SESSIONS[:2])
+    assert migrate_json(store, data_dir, force=True) == (2, 1)
+    from leaderboard_index import LeaderboardIndex
+    assert LeaderboardIndex(os.path.join(data_dir, "leaderboard_index.json")).rank(0)[1] == 3
+    assert stats_manager.get_summary()["total_sessions"] == 3
+
+
+def test_force_after_migration_without_import_ids(make_data_dir):
+    data_dir = _json_data_dir(make_data_dir)
+    store = get_store()
+    # baza migrată de o versiune care nu reținea intervalele de id-uri
+    conn = store._conn()
+    with conn:
+        conn.execute("DELETE FROM meta WHERE key = 'json_import_ids'")
+        conn.execute(INSERT_SESSION, _to_row({"mode": "train", "domain": "nvh", "percent": 10}, SESSION_COLUMNS))
+
+    # fără intervale nu știm ce rânduri au venit din JSON -> nu se șterge nimic
+    migrate_json(store, data_dir, force=True)
+    assert sorted(s["percent"] for s in store.load_sessions()) == [10, 40, 40, 60, 60, 80, 80]
+    assert len(store.load_leaderboard()) == 2
+
+    # de acum intervalele există -> un nou --force înlocuiește doar ultimul import
+    migrate_json(store, data_dir, force=True)
+    assert len(store.load_sessions()) == 7
+    assert len(store.load_leaderboard()) == 2